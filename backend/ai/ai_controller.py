@@ -5,11 +5,27 @@ AI控制器 - 负责AI玩家的自动决策和游戏流程控制
 import asyncio
 import os
 import random
-from typing import Dict, List, Optional, Callable, Any, Awaitable
+import time
+from typing import Dict, List, Optional, Callable, Any, Awaitable, Collection, Set, Tuple
 from ..core.constants import GAME_PHASES, GAME_STATES, MAX_ASSASSINATION_DISCUSSION_ROUNDS
 from ..core.roles import ROLES
-from .ai_service import ai_service
+from ..core.prompt_context import collect_round_messages
+from ..core.round_summarizer import (
+    condense_speaker_stances,
+    merge_rolling_summary,
+    summarize_round_extractive,
+)
+from ..core.intent_matcher import detect_vote_intent
+from ..core.player_memory import build_round_memory_notes
+from .ai_service import AIService
+from .background_tasks import BackgroundTaskSupervisor
+from .heuristic_policy import HeuristicPolicy
+from .opening_book import OpeningBook, opening_book as default_opening_book, prefill_opening_book
+from .pacing import PacingClock
+from .prefetch_depth import AdaptivePrefetchDepth
+from .task_scope import TaskScope
 from ..core.log_manager import LogManager
+from ..core.snapshot import GameSnapshot
 
 try:
     from config import GAME_CONFIG
@@ -55,20 +71,37 @@ def _format_team_vote_sides(votes: List[Dict[str, Any]]) -> str:
 
 
 class AIController:
-    def __init__(self, game, websocket_notifier: Optional[Callable] = None):
+    def __init__(
+        self,
+        game,
+        websocket_notifier: Optional[Callable] = None,
+        ai_service: Optional[AIService] = None,
+        opening_book: Optional[OpeningBook] = None,
+        clock: Optional[PacingClock] = None,
+        log_manager: Optional[LogManager] = None,
+        verbose: bool = True,
+    ):
         self.game = game
+        # 关闭时不打印逐事件信息（无头批量模拟）；传入的 ai_service 自行设置
+        self.verbose = verbose
         self.websocket_notifier = websocket_notifier
         self.ai_players = [p for p in game.players if p.is_ai]
         self.is_running = False
         self.auto_delay = 0.1
         self.current_speaker = None
-        self.log_manager = LogManager()
-        # 更新AI服务的日志管理器
-        global ai_service
-        ai_service = ai_service.__class__(self.log_manager, player_count=len(self.game.players))
+        self.log_manager = log_manager or LogManager()
+        # 每局独立的 AI 服务实例（模型客户端在首次调用时才创建）
+        if ai_service is None:
+            ai_service = AIService(self.log_manager, player_count=len(self.game.players), verbose=verbose)
+        else:
+            ai_service.set_log_manager(self.log_manager)
+            ai_service.player_count = len(self.game.players)
+        self.ai_service = ai_service
 
         # 发言节奏控制：后端按估算的朗读时长自行推进，不再阻塞等待前端语音回调
         # 这样多个观众可以各自用本地 TTS 播放，互不影响，刷新/关闭页面也不会卡死后端
+        # 所有节奏等待经由可注入的时钟，time_scale=0 时不等待（无头模拟），可在对局中实时调整
+        self.clock = clock or PacingClock.from_config()
         self.base_speech_seconds = 0.8
         self.per_char_seconds = 0.18
         self.min_speech_seconds = 2.0
@@ -80,18 +113,133 @@ class AIController:
                 os.getenv('AVALON_SPEECH_PREFETCH_SIZE', '1'),
             )),
         )
+        # 按近期 LLM 发言延迟与队列中发言的朗读时长自适应选择预取深度；关闭时固定为 speech_prefetch_size，为 0 时不预取
+        self.speech_prefetch = AdaptivePrefetchDepth(
+            initial_depth=self.speech_prefetch_size,
+            min_depth=int(GAME_CONFIG.get(
+                'speech_prefetch_min',
+                os.getenv('AVALON_SPEECH_PREFETCH_MIN', '1'),
+            )),
+            max_depth=int(GAME_CONFIG.get(
+                'speech_prefetch_max',
+                os.getenv('AVALON_SPEECH_PREFETCH_MAX', '3'),
+            )),
+            enabled=str(GAME_CONFIG.get(
+                'speech_prefetch_adaptive',
+                os.getenv('AVALON_SPEECH_PREFETCH_ADAPTIVE', 'true'),
+            )).lower() == 'true',
+        )
+
+        # 草稿-修订讨论模式：阶段开始时并行生成全部座位的发言草稿，每位开口前按刚说过的发言做一次简短修订
+        self.draft_refine_discussion = str(GAME_CONFIG.get(
+            'draft_refine_discussion',
+            os.getenv('AVALON_DRAFT_REFINE_DISCUSSION', 'false'),
+        )).lower() == 'true'
+        self.draft_refine_stats = {
+            'drafts': 0, 'revision_calls': 0, 'revised': 0, 'kept': 0, 'stall_seconds': 0.0,
+        }
+
+        # 本局所有 AI 工作（主循环、发言预取、并行投票、后台压缩）的任务作用域，
+        # 停止/重置/游戏结束时统一取消，避免继续消耗模型配额
+        self.task_scope = TaskScope()
+        self._main_task: Optional[asyncio.Task] = None
+        # 轮次讨论压缩等后台作业：限制并发，游戏结束/重置时统一取消
+        self.background_task_concurrency = int(GAME_CONFIG.get(
+            'background_task_concurrency',
+            os.getenv('AVALON_BACKGROUND_TASK_CONCURRENCY', '2'),
+        ))
+        self.background_tasks = BackgroundTaskSupervisor(
+            max_concurrency=self.background_task_concurrency,
+            scope=self.task_scope,
+        )
+        # 本地抽取式摘要之后，是否再在后台用 LLM 生成摘要替换
+        self.llm_round_summary = str(GAME_CONFIG.get(
+            'llm_round_summary',
+            os.getenv('AVALON_LLM_ROUND_SUMMARY', 'true'),
+        )).lower() == 'true'
+        # 多级细节历史：上一轮压缩为各玩家立场，更早轮次合并为整局滚动摘要（后台生成）
+        self.history_lod = str(GAME_CONFIG.get(
+            'history_lod',
+            os.getenv('AVALON_HISTORY_LOD', 'true'),
+        )).lower() == 'true'
+        # 每轮结束后为各 AI 座位生成私有记忆，代替更早轮次的共享摘要
+        self.player_memory = str(GAME_CONFIG.get(
+            'player_memory',
+            os.getenv('AVALON_PLAYER_MEMORY', 'true'),
+        )).lower() == 'true'
+        # 下一次 prompt 需要的摘要仍在生成时，最多等待的秒数
+        self.summary_wait_timeout = float(GAME_CONFIG.get(
+            'summary_wait_timeout',
+            os.getenv('AVALON_SUMMARY_WAIT_TIMEOUT', '3.0'),
+        ))
+        # 基于角色后验的打分策略：置信度达到阈值的决策直接采用，跳过 LLM；> 1 即关闭
+        self.heuristic_policy = HeuristicPolicy(
+            self.game,
+            confidence_threshold=float(GAME_CONFIG.get(
+                'heuristic_confidence_threshold',
+                os.getenv('AVALON_HEURISTIC_CONFIDENCE_THRESHOLD', '0.9'),
+            )),
+        )
+        # 队伍投票优先采用该座位本次讨论发言中的明确表态，模糊时才调用 LLM
+        self.vote_intent = str(GAME_CONFIG.get(
+            'vote_intent',
+            os.getenv('AVALON_VOTE_INTENT', 'true'),
+        )).lower() == 'true'
+        self.vote_intent_stats = {'decisions': 0, 'intent_hits': 0, 'ambiguous': 0, 'no_speech': 0}
+        # 开局库：第一轮选队与讨论发言优先取用此前对局的输出（跨局共享），实时生成的输出写回库中
+        self.opening_book = opening_book or default_opening_book
+        self.opening_book_enabled = str(GAME_CONFIG.get(
+            'opening_book',
+            os.getenv('AVALON_OPENING_BOOK', 'true'),
+        )).lower() == 'true'
+        # 开局后在后台用离线对局补充开局库的局数（与本局共享模型配额），0 = 只从实时对局积累
+        self.opening_book_prefill = int(GAME_CONFIG.get(
+            'opening_book_prefill',
+            os.getenv('AVALON_OPENING_BOOK_PREFILL', '0'),
+        ))
+        # 队伍投票阶段的投机计算：发言结束即预判投票，讨论结束即并行发起 LLM 投票与改队决策
+        self.speculative_votes = str(GAME_CONFIG.get(
+            'speculative_votes',
+            os.getenv('AVALON_SPECULATIVE_VOTES', 'true'),
+        )).lower() == 'true'
+        self.speculation_stats = {
+            kind: {'speculated': 0, 'committed': 0, 'stale': 0} for kind in ('team_vote', 'team_revision')
+        }
+        self.team_vote_timing = {'phases': 0, 'total_seconds': 0.0, 'after_discussion_seconds': 0.0}
+        # 跨阶段流水线：投票/任务结果一出即预取下一任队长的选队决策，与结果停顿和开场白重叠
+        self.leader_prefetch = str(GAME_CONFIG.get(
+            'leader_prefetch',
+            os.getenv('AVALON_LEADER_PREFETCH', 'true'),
+        )).lower() == 'true'
+        self.leader_prefetch_stats = {'started': 0, 'used': 0, 'discarded': 0}
+        self._team_selection_prefetch: Optional[tuple] = None
+
+    def _log(self, message: str) -> None:
+        if self.verbose:
+            print(message)
+
     async def start_auto_play(self):
         """开始AI自动游戏"""
         if not self.ai_players:
-            print("没有AI玩家，退出自动游戏")
+            self._log("没有AI玩家，退出自动游戏")
             return
 
+        if self.task_scope.closed:
+            # 停止后重新启动：为本局开启新的任务作用域
+            self.task_scope = TaskScope()
+            self.background_tasks = BackgroundTaskSupervisor(
+                max_concurrency=self.background_task_concurrency,
+                scope=self.task_scope,
+            )
+        self._main_task = self.task_scope.adopt(asyncio.current_task())
+
         self.is_running = True
-        print(f"AI控制器启动，管理 {len(self.ai_players)} 个AI玩家，发言预取深度={self.speech_prefetch_size}")
+        self._log(f"AI控制器启动，管理 {len(self.ai_players)} 个AI玩家，发言预取深度={self.speech_prefetch_size}"
+              f"{'（自适应）' if self.speech_prefetch.enabled else ''}")
 
         # 检查游戏是否已经开始，如果没有则开始游戏
         if self.game.state == GAME_STATES['waiting']:
-            print("开始新游戏")
+            self._log("开始新游戏")
             game_start_result = self.game.start_game()
 
             for entry in self.game.get_chat_log():
@@ -102,7 +250,11 @@ class AIController:
                 self.log_manager.log_game_start_with_roles(
                     role_assignments=game_start_result['role_assignments']
                 )
-                print(f"游戏角色分配已记录到全局日志")
+                self._log(f"游戏角色分配已记录到全局日志")
+
+        # 角色已分配：为每个座位预编译整局不变的 prompt 片段
+        self.ai_service.start_game(self.game.players)
+        self._schedule_opening_book_prefill()
 
         # 记录游戏开始事件
         game_start_data = {
@@ -111,52 +263,72 @@ class AIController:
             "game_id": self.log_manager.get_game_id()
         }
         self.log_manager.log_global_event("game_start", game_start_data)
-        print(f"游戏日志将保存到: {self.log_manager.get_game_log_dir()}")
+        self._log(f"游戏日志将保存到: {self.log_manager.get_game_log_dir()}")
 
         loop_count = 0
-        while self.is_running and self.game.state == GAME_STATES['playing']:
-            loop_count += 1
-            print(f"\n=== AI循环 {loop_count} ===")
-            print(f"游戏状态: {self.game.state}")
-            print(f"游戏阶段: {self.game.phase}")
-
-            game_state_data = {
-                "state": self.game.state,
-                "phase": self.game.phase,
-                "round": self.game.current_round,
-                "mission": self.game.current_mission
-            }
-            self.log_manager.log_global_event("game_state", game_state_data)
-
-            await self.process_current_phase()
+        cancelled = False
+        try:
+            while self.is_running and self.game.state == GAME_STATES['playing']:
+                loop_count += 1
+                self._log(f"\n=== AI循环 {loop_count} ===")
+                self._log(f"游戏状态: {self.game.state}")
+                self._log(f"游戏阶段: {self.game.phase}")
+
+                game_state_data = {
+                    "state": self.game.state,
+                    "phase": self.game.phase,
+                    "round": self.game.current_round,
+                    "mission": self.game.current_mission
+                }
+                self.log_manager.log_global_event("game_state", game_state_data)
 
-            if self.game.state == GAME_STATES['finished']:
-                print("游戏结束！")
-                break
+                await self.process_current_phase()
 
-            if loop_count > 200:
-                print("达到最大循环次数，停止AI控制器")
-                break
+                if self.game.state == GAME_STATES['finished']:
+                    self._log("游戏结束！")
+                    break
 
-            await asyncio.sleep(self.auto_delay)
+                if loop_count > 200:
+                    self._log("达到最大循环次数，停止AI控制器")
+                    break
 
-        game_end_data = {
-            "loop_count": loop_count,
-            "state": self.game.state
-        }
-        self.log_manager.log_global_event("game_end", game_end_data)
-        print(f"AI控制器结束，总共执行了 {loop_count} 次循环")
-        print(f"游戏日志已保存到: {self.log_manager.get_game_log_dir()}")
+                await self.clock.sleep(self.auto_delay)
+        except asyncio.CancelledError:
+            cancelled = True
+            self._log("AI控制器主循环已取消")
+            raise
+        finally:
+            if self.game.state == GAME_STATES['finished'] or cancelled:
+                await self._cancel_ai_work()
+
+            game_end_data = {
+                "loop_count": loop_count,
+                "state": self.game.state,
+                "cancelled": cancelled,
+            }
+            self.log_manager.log_global_event("game_end", game_end_data)
+            self._log(f"AI控制器结束，总共执行了 {loop_count} 次循环")
+            self._log(f"游戏日志已保存到: {self.log_manager.get_game_log_dir()}")
 
     async def stop_auto_play(self):
-        """停止AI自动游戏"""
+        """停止AI自动游戏：取消主循环及所有进行中的 LLM 请求、预取、投票与压缩任务"""
         self.is_running = False
-        print("AI控制器已停止")
+        await self._cancel_ai_work()
+        self._log("AI控制器已停止")
+
+    async def _cancel_ai_work(self) -> None:
+        """关闭本局任务作用域并等待所有派生任务退出。"""
+        await self.background_tasks.cancel_all()
+        cancelled = await self.task_scope.cancel()
+        if cancelled:
+            self._log(f"已取消 {cancelled} 个进行中的 AI 任务")
 
     async def process_current_phase(self):
         """处理当前游戏阶段"""
         phase = self.game.phase
-        print(f"处理阶段: {phase}")
+        self._log(f"处理阶段: {phase}")
+
+        await self._await_pending_summaries()
 
         if phase == GAME_PHASES['team_selection']:
             await self.handle_team_selection()
@@ -167,8 +339,8 @@ class AIController:
         elif phase == GAME_PHASES['assassination']:
             await self.handle_assassination()
         else:
-            print(f"未知阶段: {phase}，等待...")
-            await asyncio.sleep(1)
+            self._log(f"未知阶段: {phase}，等待...")
+            await self.clock.sleep(1)
 
     async def handle_team_selection(self):
         """处理队伍选择阶段"""
@@ -181,26 +353,44 @@ class AIController:
         self.log_manager.log_global_event("team_selection_start", team_selection_data)
 
         if current_leader.is_ai:
-            print(f"AI队长 {current_leader.name} 开始选择队伍")
+            self._log(f"AI队长 {current_leader.name} 开始选择队伍")
+            prefetched = self._take_prefetched_team_selection()
 
             await self.ai_speak(current_leader, "我来选择这次任务的队伍成员...")
 
             mission_config = self.game.get_mission_config()
             if not mission_config:
-                print("无法获取任务配置")
+                self._log("无法获取任务配置")
                 return
 
             team_size = mission_config['team_size']
             available_players = self.game.get_available_players()
 
-            selected_team = await self._ai_select_team_with_llm(current_leader, available_players, team_size)
+            heuristic = self.heuristic_policy.select_team(current_leader, available_players, team_size)
+            if self.heuristic_policy.should_skip_llm('team_selection', heuristic):
+                self._log(f"队长 {current_leader.name} 按打分策略选队（{heuristic.reason}），跳过 LLM")
+                selected_team = heuristic.value
+            else:
+                selected_team = self._sample_opening_team(available_players, team_size)
+                if selected_team:
+                    self._log(f"队长 {current_leader.name} 采用开局库中的第一轮队伍，跳过 LLM")
+                elif prefetched is not None:
+                    self._log(f"队长 {current_leader.name} 采用结果公布时预取的选队决策")
+                    selected_team = await prefetched
+                    prefetched = None
+                else:
+                    selected_team = await self._ai_select_team_with_llm(current_leader, available_players, team_size)
+                    if selected_team and self._opening_book_applies():
+                        self.opening_book.record_team(self.game, selected_team)
+            if prefetched is not None:
+                prefetched.cancel()
 
             if not selected_team:
-                print(f"AI API失败，使用备用逻辑为 {current_leader.name}")
+                self._log(f"AI API失败，使用备用逻辑为 {current_leader.name}")
                 selected_team = self.ai_select_team(current_leader, available_players, team_size)
 
             if selected_team:
-                print(f"队长 {current_leader.name} 选择队伍: {selected_team}")
+                self._log(f"队长 {current_leader.name} 选择队伍: {selected_team}")
 
                 team_selected_data = {
                     "leader": current_leader.name,
@@ -220,11 +410,17 @@ class AIController:
                     )
                     await self.notify_frontend("team_selected", result)
                 else:
-                    print(f"队伍选择失败: {result['error']}")
+                    self._log(f"队伍选择失败: {result['error']}")
 
     async def handle_team_vote(self):
-        """处理队伍投票阶段：①依次发言讨论 ②队长二次确认/修改队伍 ③全员统一投票"""
-        print("处理队伍投票阶段")
+        """处理队伍投票阶段：①依次发言讨论 ②队长二次确认/修改队伍 ③全员统一投票
+
+        开启投机投票时，每位座位发言结束即预判其投票（发言表态/打分策略可直接决定的），
+        最后一位发言写入后立即并行发起其余座位的 LLM 投票与队长的改队决策；各结果标记其假设的
+        队伍与历史版本，到投票时仍然有效的直接提交，失效的重新计算。
+        """
+        self._log("处理队伍投票阶段")
+        phase_start = time.perf_counter()
 
         self.log_manager.log_global_event("team_vote_start", {
             "team": self.game.current_team,
@@ -235,23 +431,56 @@ class AIController:
         start = self.game.current_leader_index
 
         # 阶段1：从队长开始依次发言（仅讨论，不投票），支持预取后续玩家发言
-        print("队伍投票-阶段1：依次发言讨论")
+        self._log("队伍投票-阶段1：依次发言讨论")
         discussion_players = [
             self.game.players[(start + i) % n]
             for i in range(n)
             if self.game.players[(start + i) % n].is_ai
         ]
-        await self._run_prefetched_speeches(
-            discussion_players,
-            self._get_ai_team_vote_speech,
+        opening = self._opening_book_applies()
+        booked = self.opening_book.sample_speeches(self.game, discussion_players) if opening else []
+        booked_speeches = {p.name: speech for p, (speech, _) in zip(discussion_players, booked)}
+
+        async def fetch_discussion_speech(player):
+            speech = booked_speeches.get(player.name)
+            return speech if speech else await self._get_ai_team_vote_speech(player)
+
+        # 座位名 -> ((假设的队伍, 假设的历史版本；None 表示只依赖队伍), (投票, 来源) 或进行中的任务, 本地决策的统计结果)
+        speculative: Dict[str, Any] = {}
+        speculative_revision: List[Any] = []
+        spoken: Set[str] = set()
+
+        def on_spoken(index: int, player) -> None:
+            if not self.speculative_votes:
+                return
+            spoken.add(player.name)
+            self._speculate_local_vote(player, speculative)
+            if index == len(discussion_players) - 1:
+                self._speculate_after_discussion(speculative, speculative_revision, spoken)
+
+        await self._run_discussion(
+            discussion_players, fetch_discussion_speech, on_spoken=on_spoken, fixed=booked_speeches.keys(),
         )
+        if opening:
+            # 实时生成的发言接在所取用的发言链之后写回开局库
+            self.opening_book.record_speeches(
+                self.game,
+                [(p.name, self._get_team_vote_speech(p.name)) for p in discussion_players[len(booked):]],
+                parent=booked[-1][1] if booked else None,
+            )
+        if self.speculative_votes and not speculative_revision:
+            # 最后一位未发言（如 LLM 失败）时，讨论结束即发起
+            self._speculate_after_discussion(speculative, speculative_revision, spoken)
+        discussion_end = time.perf_counter()
 
         # 阶段2：队长根据讨论二次确认或修改队伍
-        print("队伍投票-阶段2：队长二次确认/修改队伍")
-        await self._leader_revise_team()
+        self._log("队伍投票-阶段2：队长二次确认/修改队伍")
+        kept_version = await self._leader_revise_team(speculative_revision[0] if speculative_revision else None)
+        # 维持原队伍时，队长的确认发言不含新信息，讨论结束时的版本仍视为有效
+        vote_version = kept_version if kept_version is not None else self.game.version
 
         # 阶段3：全员并行投票（官方规则：同时表决，不发言）
-        print("队伍投票-阶段3：全员并行投票")
+        self._log("队伍投票-阶段3：全员并行投票")
         total_players = len(self.game.players)
         voted_names = {v['player'] for v in self.game.team_votes}
         ai_pending = [
@@ -273,33 +502,52 @@ class AIController:
         })
 
         if not ai_pending:
+            self._discard_speculation(speculative)
             return
 
-        async def fetch_team_vote(player):
-            vote = await self._ai_decide_team_vote_with_llm(player)
-            if not vote:
-                print(f"AI API失败，使用发言解析/兜底逻辑为 {player.name}")
-                vote = self.ai_decide_team_vote(player)
-            return player, vote
+        # 全员基于同一份快照并行决策，不受先返回的投票写入影响
+        snapshot = self.game.snapshot()
+        team_key = tuple(self.game.current_team)
+        vote_stats = self.speculation_stats['team_vote']
 
-        tasks = [asyncio.create_task(fetch_team_vote(p)) for p in ai_pending]
+        async def fetch_team_vote(player):
+            entry = speculative.pop(player.name, None)
+            if entry is not None:
+                (team, version), result, outcome = entry
+                if team == team_key and version in (None, vote_version):
+                    vote_stats['committed'] += 1
+                    # 投机阶段的本地决策不写统计，采用时才计入
+                    self._record_team_vote_outcome(outcome)
+                    vote, source = await result if isinstance(result, asyncio.Task) else result
+                    return player, vote, source
+                vote_stats['stale'] += 1
+                if isinstance(result, asyncio.Task):
+                    result.cancel()
+            # 队伍被修改后，针对原队伍的讨论表态不会被取用（发言按发言时的队伍匹配）
+            decision = self._decide_team_vote_locally(player)
+            if decision:
+                return (player,) + decision
+            return (player,) + await self._decide_team_vote_with_llm(player, snapshot)
+
+        tasks = [self.task_scope.create_task(fetch_team_vote(p)) for p in ai_pending]
         final_result = None
 
         for task in asyncio.as_completed(tasks):
-            player, vote = await task
+            player, vote, source = await task
             if not vote:
                 continue
 
-            print(f"AI玩家 {player.name} 投票: {vote}")
+            self._log(f"AI玩家 {player.name} 投票: {vote}")
             self.log_manager.log_global_event("team_vote", {
                 "player": player.name,
                 "vote": vote,
-                "team": self.game.current_team
+                "team": self.game.current_team,
+                "source": source,
             })
 
             result = self.game.vote_team(player.name, vote)
             if 'error' in result:
-                print(f"投票失败: {result['error']}")
+                self._log(f"投票失败: {result['error']}")
                 continue
 
             await self.notify_frontend("team_vote_progress", {
@@ -310,48 +558,171 @@ class AIController:
             if result.get('status') in ['team_approved', 'team_rejected', 'evil_win']:
                 final_result = result
 
+        # 已投票的真人等未被取用的投机结果
+        self._discard_speculation(speculative)
+        self._record_team_vote_timing(phase_start, discussion_end)
+
         if final_result:
-            print(f"队伍投票完成，结果: {final_result.get('status')}")
+            self._log(f"队伍投票完成，结果: {final_result.get('status')}")
+            if final_result.get('status') == 'team_rejected':
+                self._prefetch_next_team_selection()
             await self._notify_team_vote_completed(final_result)
-            await asyncio.sleep(self.team_vote_result_pause)
+            await self.clock.sleep(self.team_vote_result_pause)
+
+    def _evaluate_team_vote_locally(self, player) -> Tuple[Optional[tuple], tuple]:
+        """不调用 LLM 的队伍投票：发言中的明确表态优先，其次置信度达标的打分策略。
+
+        不写统计，返回 ((投票, 来源) 或 None, 统计结果)；统计结果交给 _record_team_vote_outcome 计入。
+        """
+        intent_outcome = None
+        if self.vote_intent:
+            vote, intent_outcome = self._team_vote_intent(player.name)
+            if vote:
+                return (vote, 'intent'), (intent_outcome, None)
+        heuristic = self.heuristic_policy.team_vote(player)
+        if self.heuristic_policy.is_confident(heuristic):
+            return (heuristic.value, 'heuristic'), (intent_outcome, True)
+        return None, (intent_outcome, False)
+
+    def _record_team_vote_outcome(self, outcome: tuple) -> None:
+        """计入一次本地投票决策的表态识别与打分策略统计。"""
+        intent_outcome, heuristic_skipped = outcome
+        if intent_outcome:
+            self.vote_intent_stats['decisions'] += 1
+            self.vote_intent_stats[intent_outcome] += 1
+        if heuristic_skipped is not None:
+            self.heuristic_policy.record('team_vote', heuristic_skipped)
+
+    def _decide_team_vote_locally(self, player) -> Optional[tuple]:
+        """本地决定队伍投票并计入统计；返回 (投票, 来源)，无法决定时返回 None。"""
+        decision, outcome = self._evaluate_team_vote_locally(player)
+        self._record_team_vote_outcome(outcome)
+        if decision and decision[1] == 'intent':
+            self._log(f"AI玩家 {player.name} 按讨论发言中的表态投票，跳过 LLM")
+        elif decision:
+            self._log(f"AI玩家 {player.name} 按打分策略投票，跳过 LLM")
+        return decision
+
+    async def _decide_team_vote_with_llm(self, player, snapshot: Optional[GameSnapshot] = None) -> tuple:
+        vote = await self._ai_decide_team_vote_with_llm(player, snapshot)
+        if vote:
+            return vote, 'llm'
+        self._log(f"AI API失败，使用发言解析/兜底逻辑为 {player.name}")
+        return self.ai_decide_team_vote(player), 'fallback'
+
+    def _speculate_local_vote(self, player, speculative: Dict[str, Any]) -> None:
+        """座位发言结束即预判其投票；本地可决定的结果只依赖队伍（表态与后验在讨论中不变）。"""
+        if not player.is_ai or player.name in speculative:
+            return
+        decision, outcome = self._evaluate_team_vote_locally(player)
+        if decision:
+            speculative[player.name] = ((tuple(self.game.current_team), None), decision, outcome)
+            self.speculation_stats['team_vote']['speculated'] += 1
+
+    def _speculate_after_discussion(
+        self, speculative: Dict[str, Any], speculative_revision: List[Any], spoken: Set[str]
+    ) -> None:
+        """最后一位发言写入后：为其余 AI 座位发起 LLM 投票，并发起队长的改队决策。"""
+        voted_names = {v['player'] for v in self.game.team_votes}
+        tag = (tuple(self.game.current_team), self.game.version)
+        snapshot = self.game.snapshot()
+        for player in self.ai_players:
+            if player.name in speculative or player.name in voted_names:
+                continue
+            if player.name not in spoken:
+                # 未发言的座位此前没有预判过
+                self._speculate_local_vote(player, speculative)
+            if player.name not in speculative:
+                # 本地无法决定：记下本地决策的统计结果，LLM 结果被采用时一并计入
+                _, outcome = self._evaluate_team_vote_locally(player)
+                task = self.task_scope.create_task(self._decide_team_vote_with_llm(player, snapshot))
+                speculative[player.name] = (tag, task, outcome)
+                self.speculation_stats['team_vote']['speculated'] += 1
+
+        leader = self.game.players[self.game.current_leader_index]
+        if leader.is_ai and self.game.get_mission_config():
+            task = self.task_scope.create_task(self._decide_team_revision(leader, list(self.game.current_team)))
+            speculative_revision.append((tag, task))
+            self.speculation_stats['team_revision']['speculated'] += 1
+
+    @staticmethod
+    def _discard_speculation(speculative: Dict[str, Any]) -> None:
+        """取消未被采用的投机任务。"""
+        for _, result, _ in speculative.values():
+            if isinstance(result, asyncio.Task):
+                result.cancel()
+        speculative.clear()
+
+    def _record_team_vote_timing(self, phase_start: float, discussion_end: float) -> None:
+        now = time.perf_counter()
+        timing = self.team_vote_timing
+        timing['phases'] += 1
+        timing['total_seconds'] += now - phase_start
+        timing['after_discussion_seconds'] += now - discussion_end
+        self.log_manager.log_global_event("team_vote_timing", {
+            "mission_number": self.game.current_mission,
+            "phase_seconds": round(now - phase_start, 3),
+            "after_discussion_seconds": round(now - discussion_end, 3),
+            "speculative": self.speculative_votes,
+        })
+
+    async def _decide_team_revision(self, leader, original_team: List[str]) -> Optional[List[str]]:
+        """队长讨论后的改队决策（不含播报与写入）。"""
+        team_size = self.game.get_mission_config()['team_size']
+        available_players = self.game.get_available_players()
+        heuristic = self.heuristic_policy.keep_team(leader, original_team, team_size)
+        if self.heuristic_policy.should_skip_llm('team_revision', heuristic):
+            return heuristic.value
+        revised_team = await self._ai_revise_team_with_llm(leader, available_players, team_size, original_team)
+        return revised_team or self.ai_select_team(leader, available_players, team_size)
+
+    async def _leader_revise_team(self, speculative_revision: Optional[tuple] = None) -> Optional[int]:
+        """队长在讨论后二次确认或修改队伍成员。
 
-    async def _leader_revise_team(self):
-        """队长在讨论后二次确认或修改队伍成员"""
+        维持原队伍时返回确认发言之前的游戏版本（供投机投票校验），修改队伍或未处理时返回 None。
+        """
         current_leader = self.game.players[self.game.current_leader_index]
         if not current_leader.is_ai:
-            return
+            return None
 
         mission_config = self.game.get_mission_config()
         if not mission_config:
-            return
+            return None
 
-        team_size = mission_config['team_size']
-        available_players = self.game.get_available_players()
         original_team = list(self.game.current_team)
 
-        revised_team = await self._ai_revise_team_with_llm(
-            current_leader, available_players, team_size, original_team
-        )
-        if not revised_team:
-            revised_team = self.ai_select_team(current_leader, available_players, team_size)
+        revised_team = None
+        if speculative_revision is not None:
+            (team, version), task = speculative_revision
+            stats = self.speculation_stats['team_revision']
+            if team == tuple(original_team) and version == self.game.version:
+                stats['committed'] += 1
+                revised_team = await task
+            else:
+                stats['stale'] += 1
+                task.cancel()
+        if revised_team is None:
+            revised_team = await self._decide_team_revision(current_leader, original_team)
 
         # 维持原队伍
         if not revised_team or set(revised_team) == set(original_team):
+            kept_version = self.game.version
             await self.ai_speak(
                 current_leader,
                 f"听完大家的发言，我决定维持原队伍不变：{', '.join(original_team)}，现在开始投票。"
             )
-            return
+            return kept_version
 
         # 修改队伍
         result = self.game.revise_team(revised_team)
         if 'error' in result:
-            print(f"队伍修改失败: {result['error']}，维持原队伍")
+            self._log(f"队伍修改失败: {result['error']}，维持原队伍")
+            kept_version = self.game.version
             await self.ai_speak(
                 current_leader,
                 f"我维持原队伍：{', '.join(original_team)}，现在开始投票。"
             )
-            return
+            return kept_version
 
         self.log_manager.log_global_event("team_revised", {
             "leader": current_leader.name,
@@ -368,19 +739,20 @@ class AIController:
             'system',
         )
         await self.notify_frontend("team_selected", result)
+        return None
 
     async def handle_mission_vote(self):
         """处理任务投票阶段：好人固定 success，坏人并行 LLM 决策（秘密表决，不发言）"""
-        print("处理任务投票阶段")
+        self._log("处理任务投票阶段")
 
         total_team_members = len(self.game.current_team)
         voted_names = {v['player'] for v in self.game.mission_votes}
         voted_members = len(self.game.mission_votes)
 
-        print(f"任务投票进度: {voted_members}/{total_team_members}")
+        self._log(f"任务投票进度: {voted_members}/{total_team_members}")
 
         if voted_members >= total_team_members:
-            print("所有队伍成员已完成任务投票，等待游戏状态更新...")
+            self._log("所有队伍成员已完成任务投票，等待游戏状态更新...")
             return
 
         mission_vote_data = {
@@ -399,11 +771,13 @@ class AIController:
         if not ai_pending:
             return
 
+        snapshot = self.game.snapshot()
+
         async def fetch_mission_vote(player):
-            vote = await self._decide_mission_vote_for_player(player)
+            vote = await self._decide_mission_vote_for_player(player, snapshot)
             return player, vote
 
-        tasks = [asyncio.create_task(fetch_mission_vote(p)) for p in ai_pending]
+        tasks = [self.task_scope.create_task(fetch_mission_vote(p)) for p in ai_pending]
         final_result = None
 
         for task in asyncio.as_completed(tasks):
@@ -411,7 +785,7 @@ class AIController:
             if not vote:
                 continue
 
-            print(f"AI队伍成员 {player.name} 任务投票: {vote}")
+            self._log(f"AI队伍成员 {player.name} 任务投票: {vote}")
             self.log_manager.log_global_event("mission_vote", {
                 "player": player.name,
                 "vote": vote,
@@ -420,7 +794,7 @@ class AIController:
 
             result = self.game.vote_mission(player.name, vote)
             if 'error' in result:
-                print(f"任务投票失败: {result['error']}")
+                self._log(f"任务投票失败: {result['error']}")
                 continue
 
             await self.notify_frontend("mission_vote_recorded", result)
@@ -429,14 +803,18 @@ class AIController:
                 final_result = result
                 if result.get('status') in ('mission_completed', 'good_mission_win'):
                     self._schedule_round_discussion_compress()
+                    self._schedule_history_lod_update()
+                    self._schedule_player_memory_update()
+                if result.get('status') == 'mission_completed':
+                    self._prefetch_next_team_selection()
 
         if final_result:
-            print(f"任务投票完成，结果: {final_result.get('status')}")
+            self._log(f"任务投票完成，结果: {final_result.get('status')}")
             await self._publish_mission_vote_chat(final_result)
 
     async def handle_assassination(self):
         """处理刺杀阶段：坏人阵营多轮讨论后由刺客决定行刺或继续讨论。"""
-        print("处理刺杀阶段")
+        self._log("处理刺杀阶段")
 
         assassination_data = {
             "mission_results": self.game.mission_results,
@@ -446,7 +824,7 @@ class AIController:
 
         assassin = self.game.get_assassin()
         if not assassin:
-            print("未找到刺客，跳过刺杀阶段")
+            self._log("未找到刺客，跳过刺杀阶段")
             return
 
         good_players = [
@@ -454,11 +832,11 @@ class AIController:
             if p.role in ['merlin', 'percival', 'loyal_servant']
         ]
         if not good_players:
-            print("没有可刺杀的好人玩家")
+            self._log("没有可刺杀的好人玩家")
             return
 
         evil_players = self.game.get_evil_players_from_assassin()
-        print(
+        self._log(
             f"刺杀讨论开始，刺客 {assassin.name}，"
             f"坏人发言顺序: {[p.name for p in evil_players]}"
         )
@@ -475,7 +853,7 @@ class AIController:
         })
 
         for round_num in range(1, MAX_ASSASSINATION_DISCUSSION_ROUNDS + 1):
-            self.game.assassination_discussion_round = round_num
+            self.game.set_assassination_discussion_round(round_num)
 
             await self._publish_chat(
                 '系统',
@@ -488,7 +866,7 @@ class AIController:
                 "evil_players": [p.name for p in evil_players],
             })
 
-            await self._run_prefetched_speeches(
+            await self._run_discussion(
                 evil_players,
                 self._get_ai_assassination_discussion_speech,
             )
@@ -504,7 +882,7 @@ class AIController:
                 assassin, good_players, round_num
             )
             if decision == 'continue':
-                print(f"刺客 {assassin.name} 选择继续第 {round_num + 1} 轮讨论")
+                self._log(f"刺客 {assassin.name} 选择继续第 {round_num + 1} 轮讨论")
                 continue
 
             target = decision if decision in good_players else None
@@ -514,8 +892,87 @@ class AIController:
                 await self._execute_assassination(assassin, target)
             return
 
+    def _opening_book_applies(self) -> bool:
+        return self.opening_book_enabled and self.opening_book.applies(self.game)
+
+    def _sample_opening_team(self, available_players: List[str], team_size: int) -> Optional[List[str]]:
+        """第一轮从开局库取队伍；不在适用范围或未命中时返回 None。"""
+        if not self._opening_book_applies():
+            return None
+        team = self.opening_book.sample_team(self.game)
+        if not team or len(team) != team_size or not set(team) <= set(available_players):
+            return None
+        return sorted(team, key=_player_sort_key)
+
+    def _team_selection_key(self) -> tuple:
+        """选队决策依赖的对局状态：任务、队长、本任务已否决次数与已结算的投票/任务数。"""
+        return (
+            self.game.current_mission,
+            self.game.current_leader_index,
+            self.game.failed_team_votes,
+            len(self.game.team_vote_history),
+            len(self.game.mission_results),
+        )
+
+    def _prefetch_next_team_selection(self) -> None:
+        """结果已定（下一任队长与任务已知）时在后台发起其选队 LLM 调用。"""
+        self._discard_prefetched_team_selection()
+        if not self.leader_prefetch or self.game.phase != GAME_PHASES['team_selection']:
+            return
+        leader = self.game.players[self.game.current_leader_index]
+        mission_config = self.game.get_mission_config()
+        if not leader.is_ai or not mission_config:
+            return
+        team_size = mission_config['team_size']
+        available_players = self.game.get_available_players()
+        heuristic = self.heuristic_policy.select_team(leader, available_players, team_size)
+        if heuristic and heuristic.confidence >= self.heuristic_policy.confidence_threshold:
+            # 打分策略即可决定，不需要 LLM
+            return
+
+        async def select_team():
+            # 与正常流程一样先等待 prompt 需要的更早轮次摘要
+            await self._await_pending_summaries()
+            return await self._ai_select_team_with_llm(leader, available_players, team_size)
+
+        task = self.task_scope.create_task(select_team())
+        self._team_selection_prefetch = (self._team_selection_key(), task)
+        self.leader_prefetch_stats['started'] += 1
+
+    def _take_prefetched_team_selection(self) -> Optional[asyncio.Task]:
+        """取出仍有效的预取选队任务；对局状态已变化的预取作废。"""
+        prefetch, self._team_selection_prefetch = self._team_selection_prefetch, None
+        if prefetch is None:
+            return None
+        key, task = prefetch
+        if key != self._team_selection_key() or task.cancelled():
+            task.cancel()
+            self.leader_prefetch_stats['discarded'] += 1
+            return None
+        self.leader_prefetch_stats['used'] += 1
+        return task
+
+    def _discard_prefetched_team_selection(self) -> None:
+        if self._team_selection_prefetch is not None:
+            self._team_selection_prefetch[1].cancel()
+            self._team_selection_prefetch = None
+            self.leader_prefetch_stats['discarded'] += 1
+
+    def _schedule_opening_book_prefill(self) -> None:
+        """开局后在后台用离线对局补充开局库（供之后的对局取用）。"""
+        if not self.opening_book_enabled or self.opening_book_prefill <= 0:
+            return
+        player_count = len(self.game.players)
+
+        async def prefill():
+            client = await self.ai_service.ensure_model_client()
+            if client is not None:
+                await prefill_opening_book(self.opening_book, client, player_count, self.opening_book_prefill)
+
+        self.background_tasks.submit(('opening_book_prefill', player_count), prefill)
+
     def _schedule_round_discussion_compress(self) -> None:
-        """任务轮次结束后异步压缩刚结束轮次的讨论。"""
+        """任务轮次结束后立即生成本地抽取式摘要，再按配置在后台用 LLM 摘要替换。"""
         if not self.game.mission_results:
             return
 
@@ -523,20 +980,145 @@ class AIController:
         if not completed_mission:
             return
 
-        asyncio.create_task(
-            ai_service.compress_round_discussion(self.game, int(completed_mission))
+        mission_number = int(completed_mission)
+        round_messages = collect_round_messages(
+            self.game.messages_history, mission_number, index=self.game.message_index
+        )
+        if round_messages and mission_number not in self.game.round_discussion_summaries:
+            summary = summarize_round_extractive(
+                round_messages, mission_number, self.game.mission_results[-1]
+            )
+            self.game.set_round_discussion_summary(mission_number, summary, source='extractive')
+            self._log(f"第{mission_number}轮本地摘要已生成: {summary[:60]}...")
+
+        if not self.llm_round_summary:
+            return
+
+        async def compress_round():
+            await self.ai_service.compress_round_discussion(self.game, mission_number)
+            # 本地摘要已并入滚动摘要后才被 LLM 摘要替换：按新摘要重建滚动摘要
+            if (
+                self.history_lod
+                and self.game.round_discussion_summary_sources.get(mission_number) == 'llm'
+                and mission_number <= self.game.rolling_summary_through
+            ):
+                through = self.game.rolling_summary_through
+                self.background_tasks.submit(
+                    ('rolling_summary_rebuild', mission_number),
+                    lambda: self._refresh_rolling_summary(through, rebuild=True),
+                )
+
+        self.background_tasks.submit(('round_summary', mission_number), compress_round)
+
+    def _schedule_history_lod_update(self) -> None:
+        """任务轮次结束后在后台压缩本轮各玩家立场，并把更早一轮并入整局滚动摘要。"""
+        if not self.history_lod or not self.game.mission_results:
+            return
+
+        mission_number = int(self.game.mission_results[-1].get('mission') or 0)
+        if not mission_number:
+            return
+
+        round_messages = collect_round_messages(
+            self.game.messages_history, mission_number, index=self.game.message_index
+        )
+
+        async def condense_round():
+            lines = await asyncio.to_thread(condense_speaker_stances, round_messages)
+            if lines:
+                self.game.set_condensed_round(mission_number, lines)
+
+        self.background_tasks.submit(('condensed_round', mission_number), condense_round)
+
+        # 本轮结束后，上一轮起成为“更早轮次”，并入滚动摘要
+        if mission_number >= 2:
+            through = mission_number - 1
+
+            async def merge_when_ready():
+                # 优先使用 LLM 摘要：在并发槽位之外等待仍在生成（或排队）的摘要片刻，再提交合并作业
+                await self.background_tasks.wait_for([('round_summary', through)], self.summary_wait_timeout)
+                self.background_tasks.submit(
+                    ('rolling_summary', through),
+                    lambda: self._refresh_rolling_summary(through),
+                )
+
+            self.task_scope.create_task(merge_when_ready())
+
+    async def _refresh_rolling_summary(self, through_mission: int, rebuild: bool = False) -> None:
+        """把尚未并入的轮次摘要逐轮并入滚动摘要（增量：只处理新增轮次）；rebuild 时从第 1 轮重新合并。"""
+        current_through = self.game.rolling_summary_through
+        if rebuild:
+            # 重建时覆盖到当前已并入的全部轮次，不回退覆盖范围
+            through_mission = max(through_mission, current_through)
+        summary = '' if rebuild else self.game.rolling_summary
+        merged_through = 0 if rebuild else current_through
+        for mission_number in range(merged_through + 1, through_mission + 1):
+            round_summary = self.game.round_discussion_summaries.get(mission_number)
+            if not round_summary:
+                break
+            summary = merge_rolling_summary(summary, mission_number, round_summary)
+            merged_through = mission_number
+        if merged_through > current_through or (rebuild and merged_through == current_through > 0):
+            self.game.set_rolling_summary(summary, merged_through)
+
+    def _schedule_player_memory_update(self) -> None:
+        """任务轮次结束后在后台为所有 AI 座位批量生成本轮私有记忆（不阻塞主流程）。"""
+        if not self.player_memory or not self.game.mission_results:
+            return
+
+        mission_result = self.game.mission_results[-1]
+        mission_number = int(mission_result.get('mission') or 0)
+        if not mission_number:
+            return
+
+        round_messages = collect_round_messages(
+            self.game.messages_history, mission_number, index=self.game.message_index
         )
+        vote_records = [r for r in self.game.team_vote_history if r.get('mission') == mission_number]
+        player_names = [p.name for p in self.ai_players]
+
+        async def update_memories():
+            notes = await asyncio.to_thread(
+                build_round_memory_notes,
+                player_names,
+                mission_number,
+                round_messages,
+                mission_result,
+                vote_records,
+            )
+            self.game.record_player_memories(mission_number, notes)
+
+        self.background_tasks.submit(('player_memory', mission_number), update_memories)
+
+    async def _await_pending_summaries(self) -> None:
+        """当前 prompt 需要的更早轮次摘要仍在生成时，限时等待其完成。"""
+        prev_mission = max(1, self.game.current_mission - 1)
+        keys = [
+            ('round_summary', mission_number)
+            for mission_number in range(1, prev_mission)
+            if mission_number not in self.game.round_discussion_summaries
+        ]
+        if not keys:
+            return
+
+        done = await self.background_tasks.wait_for(keys, self.summary_wait_timeout)
+        if not done:
+            self._log(f"轮次摘要等待超时（{self.summary_wait_timeout}s），本次使用占位摘要")
 
     async def _resolve_assassination_target(self, assassin, good_players: List[str]) -> Optional[str]:
-        """综合 LLM 与备用逻辑确定刺杀目标。"""
+        """综合打分策略、LLM 与备用逻辑确定刺杀目标。"""
+        heuristic = self.heuristic_policy.assassination_target(assassin, good_players)
+        if self.heuristic_policy.should_skip_llm('assassination', heuristic):
+            self._log(f"刺客 {assassin.name} 按打分策略刺杀（{heuristic.reason}），跳过 LLM")
+            return heuristic.value
         target = await self._ai_select_assassination_target_with_llm(assassin, good_players)
         if not target:
-            print(f"AI API失败，使用备用逻辑为 {assassin.name}")
+            self._log(f"AI API失败，使用备用逻辑为 {assassin.name}")
             target = self.ai_select_assassination_target(assassin, good_players)
         return target
 
     async def _execute_assassination(self, assassin, target: str) -> None:
-        print(f"刺客 {assassin.name} 选择刺杀: {target}")
+        self._log(f"刺客 {assassin.name} 选择刺杀: {target}")
         await self.ai_speak(assassin, f"我要刺杀 {target}！")
         result = self.game.assassinate(target)
         await self._publish_assassination_result_chat(result)
@@ -552,6 +1134,33 @@ class AIController:
             return msg.get('content')
         return None
 
+    def _get_team_vote_speech(self, player_name: str) -> Optional[str]:
+        """获取玩家针对当前队伍（本任务本次组队、且发言时队伍与当前一致）的最近一条讨论发言。
+
+        队长讨论后改队时，针对原队伍的发言不再返回（其表态不能当作对新队伍的投票）。
+        """
+        mission = self.game.current_mission
+        attempt = self.game.failed_team_votes + 1
+        team = list(self.game.current_team)
+        for msg in reversed(self.game.messages_history):
+            if msg.get('mission') != mission or msg.get('attempt', attempt) != attempt:
+                break
+            if (
+                msg.get('player') == player_name
+                and msg.get('phase') == GAME_PHASES['team_vote']
+                and msg.get('team', team) == team
+            ):
+                return msg.get('content')
+        return None
+
+    def _team_vote_intent(self, player_name: str) -> Tuple[Optional[str], str]:
+        """该座位本次讨论中的明确投票表态（未发言或表态模糊时为 None），及对应的 vote_intent_stats 计数项。"""
+        speech = self._get_team_vote_speech(player_name)
+        if not speech:
+            return None, 'no_speech'
+        vote = detect_vote_intent(speech)
+        return vote, 'intent_hits' if vote else 'ambiguous'
+
     def _parse_vote_from_speech(self, speech: str, vote_type: str) -> Optional[str]:
         """从发言中解析投票决策，减少LLM调用。无法确定时返回None，走LLM兜底。"""
         if not speech:
@@ -559,12 +1168,7 @@ class AIController:
         speech_lower = speech.lower()
 
         if vote_type == "team":
-            approve_hit = any(kw in speech_lower for kw in ["赞同", "approve", "同意", "赞成", "支持"])
-            reject_hit = any(kw in speech_lower for kw in ["不赞成", "不赞同", "不支持", "反对", "reject", "不同意", "否决"])
-            if approve_hit and not reject_hit:
-                return "approve"
-            if reject_hit and not approve_hit:
-                return "reject"
+            return detect_vote_intent(speech)
 
         elif vote_type == "mission":
             success_hit = any(kw in speech_lower for kw in ["成功", "success", "赞成"])
@@ -579,45 +1183,56 @@ class AIController:
     # LLM API调用方法
     async def _ai_select_team_with_llm(self, leader, available_players: List[str], team_size: int) -> Optional[List[str]]:
         """使用LLM API选择队伍"""
-        game_context = self.game.get_game_state()
-        return await ai_service.get_ai_team_selection(leader.name, leader.role, game_context, available_players, team_size)
+        game_context = self.game.get_prompt_context()
+        return await self.ai_service.get_ai_team_selection(leader.name, leader.role, game_context, available_players, team_size)
 
     async def _ai_revise_team_with_llm(
         self, leader, available_players: List[str], team_size: int, current_team: List[str]
     ) -> Optional[List[str]]:
         """使用LLM API在讨论后确认或调整队伍"""
-        game_context = self.game.get_game_state()
-        return await ai_service.get_ai_team_selection(
+        game_context = self.game.get_prompt_context()
+        return await self.ai_service.get_ai_team_selection(
             leader.name, leader.role, game_context, available_players, team_size,
             current_team=current_team,
         )
 
-    async def _ai_decide_team_vote_with_llm(self, player) -> Optional[str]:
-        """使用LLM API决定队伍投票"""
-        game_context = self.game.get_game_state()
-        return await ai_service.get_ai_vote_decision(player.name, player.role, game_context, "team")
+    async def _ai_decide_team_vote_with_llm(
+        self, player, snapshot: Optional[GameSnapshot] = None
+    ) -> Optional[str]:
+        """使用LLM API决定队伍投票（传入快照时基于该快照决策）"""
+        game_context = (snapshot or self.game.snapshot()).project()
+        return await self.ai_service.get_ai_vote_decision(player.name, player.role, game_context, "team")
 
-    async def _decide_mission_vote_for_player(self, player) -> Optional[str]:
+    async def _decide_mission_vote_for_player(
+        self, player, snapshot: Optional[GameSnapshot] = None
+    ) -> Optional[str]:
         """任务投票：好人按规则固定 success，仅坏人调用 LLM。"""
         if ROLES.get(player.role, {}).get('team') == 'good':
-            print(f"AI好人 {player.name} 任务投票: success（规则固定）")
+            self._log(f"AI好人 {player.name} 任务投票: success（规则固定）")
             return 'success'
 
-        vote = await self._ai_decide_mission_vote_with_llm(player)
+        heuristic = self.heuristic_policy.mission_vote(player)
+        if self.heuristic_policy.should_skip_llm('mission_vote', heuristic):
+            self._log(f"AI坏人 {player.name} 按打分策略任务投票（{heuristic.reason}），跳过 LLM")
+            return heuristic.value
+
+        vote = await self._ai_decide_mission_vote_with_llm(player, snapshot)
         if not vote:
-            print(f"AI API失败，使用发言解析/兜底逻辑为 {player.name}")
+            self._log(f"AI API失败，使用发言解析/兜底逻辑为 {player.name}")
             vote = self.ai_decide_mission_vote(player)
         return vote
 
-    async def _ai_decide_mission_vote_with_llm(self, player) -> Optional[str]:
-        """使用LLM API决定任务投票"""
-        game_context = self.game.get_game_state()
-        return await ai_service.get_ai_vote_decision(player.name, player.role, game_context, "mission")
+    async def _ai_decide_mission_vote_with_llm(
+        self, player, snapshot: Optional[GameSnapshot] = None
+    ) -> Optional[str]:
+        """使用LLM API决定任务投票（传入快照时基于该快照决策）"""
+        game_context = (snapshot or self.game.snapshot()).project()
+        return await self.ai_service.get_ai_vote_decision(player.name, player.role, game_context, "mission")
 
     async def _ai_select_assassination_target_with_llm(self, assassin, good_players: List[str]) -> Optional[str]:
         """使用LLM API选择刺杀目标"""
-        game_context = self.game.get_game_state()
-        return await ai_service.get_ai_assassination_target(
+        game_context = self.game.get_prompt_context()
+        return await self.ai_service.get_ai_assassination_target(
             assassin.name, assassin.role, good_players, game_context
         )
 
@@ -625,8 +1240,8 @@ class AIController:
         self, assassin, good_players: List[str], discussion_round: int
     ) -> Optional[str]:
         """使用 LLM 决定继续讨论或立即行刺。"""
-        game_context = self.game.get_game_state()
-        return await ai_service.get_ai_assassination_decision(
+        game_context = self.game.get_prompt_context()
+        return await self.ai_service.get_ai_assassination_decision(
             assassin.name,
             assassin.role,
             good_players,
@@ -637,60 +1252,165 @@ class AIController:
 
     async def _get_ai_assassination_discussion_speech(self, player) -> Optional[str]:
         """获取刺杀阶段坏人阵营讨论发言。"""
-        game_context = self.game.get_game_state()
-        game_context['vote_context'] = 'assassination_discussion'
-        return await ai_service.get_ai_speech(player.name, player.role, game_context)
+        game_context = self.game.get_prompt_context(vote_context='assassination_discussion')
+        return await self._timed_ai_speech(player, game_context)
 
     async def _get_ai_team_vote_speech(self, player) -> Optional[str]:
         """获取AI队伍投票时的发言"""
-        game_context = self.game.get_game_state()
-        game_context['vote_context'] = "team_vote"
-        return await ai_service.get_ai_speech(player.name, player.role, game_context)
+        game_context = self.game.get_prompt_context(vote_context="team_vote")
+        return await self._timed_ai_speech(player, game_context)
 
     async def _get_ai_mission_vote_speech(self, player) -> Optional[str]:
         """获取AI任务投票时的发言"""
-        game_context = self.game.get_game_state()
-        game_context['vote_context'] = "mission_vote"
-        return await ai_service.get_ai_speech(player.name, player.role, game_context)
+        game_context = self.game.get_prompt_context(vote_context="mission_vote")
+        return await self._timed_ai_speech(player, game_context)
+
+    async def _timed_ai_speech(self, player, game_context: Dict[str, Any]) -> Optional[str]:
+        """调用 LLM 生成发言，并把耗时记入预取深度的延迟窗口（开局库等非 LLM 发言不计入）。"""
+        start = time.perf_counter()
+        speech = await self.ai_service.get_ai_speech(player.name, player.role, game_context)
+        if speech:
+            self.speech_prefetch.record_latency(time.perf_counter() - start)
+        return speech
+
+    def _speech_pacing_seconds(self, message: str) -> float:
+        """ai_speak 为这条发言实际等待的朗读时长（没有前端通知时不等待）。"""
+        return self.clock.scaled(self._estimate_speech_duration(message)) if self.websocket_notifier else 0.0
+
+    async def _run_discussion(
+        self,
+        players: List[Any],
+        fetch_speech: Callable[[Any], Awaitable[Optional[str]]],
+        on_spoken: Optional[Callable[[int, Any], None]] = None,
+        fixed: Collection[str] = (),
+    ) -> None:
+        """按配置的讨论模式依次发言；fixed 为发言不做修订的座位（如取自开局库的发言链）。"""
+        if self.draft_refine_discussion:
+            await self._run_draft_refine_speeches(players, fetch_speech, on_spoken=on_spoken, fixed=fixed)
+        else:
+            await self._run_prefetched_speeches(players, fetch_speech, on_spoken=on_spoken)
+
+    async def _run_draft_refine_speeches(
+        self,
+        players: List[Any],
+        fetch_draft: Callable[[Any], Awaitable[Optional[str]]],
+        on_spoken: Optional[Callable[[int, Any], None]] = None,
+        fixed: Collection[str] = (),
+    ) -> None:
+        """草稿-修订模式：阶段开始时从同一局面并行生成全部座位的发言草稿，每位开口前再修订一次。
+
+        上一位发言写入后立即发起下一位的修订，与其朗读时间重叠；关键路径上只剩一次完整发言延迟
+        加各次简短修订的延迟，且每位发言都能回应紧挨在前面的发言。
+        """
+        if not players:
+            return
+
+        mark = len(self.game.messages_history)
+        drafts = [self.task_scope.create_task(fetch_draft(player)) for player in players]
+        self.draft_refine_stats['drafts'] += len(players)
+        finals: Dict[int, asyncio.Task] = {}
+
+        def start_final(index: int) -> None:
+            if index < len(players) and index not in finals:
+                finals[index] = self.task_scope.create_task(
+                    self._refine_draft(players[index], drafts[index], mark, fixed)
+                )
+
+        def spoken_hook(index: int, player) -> Callable[[], None]:
+            def hook() -> None:
+                start_final(index + 1)
+                if on_spoken:
+                    on_spoken(index, player)
+            return hook
+
+        for index, player in enumerate(players):
+            start_final(index)
+            wait_start = time.perf_counter()
+            speech = await finals.pop(index)
+            self.draft_refine_stats['stall_seconds'] += time.perf_counter() - wait_start
+            if speech:
+                await self.ai_speak(player, speech, on_spoken=spoken_hook(index, player))
+
+    async def _refine_draft(self, player, draft_task: asyncio.Task, mark: int, fixed: Collection[str]) -> Optional[str]:
+        """等待草稿，并按草稿生成之后（messages_history[mark:]）其他玩家的发言修订；修订失败时沿用草稿。"""
+        draft = await draft_task
+        if not draft or player.name in fixed:
+            return draft
+        new_speeches = [
+            m for m in self.game.messages_history[mark:]
+            if m.get('player') != player.name and m.get('content')
+        ]
+        stats = self.draft_refine_stats
+        if not new_speeches:
+            stats['kept'] += 1
+            return draft
+        stats['revision_calls'] += 1
+        revised = await self.ai_service.get_ai_speech_revision(player.name, player.role, draft, new_speeches)
+        if revised and revised != draft:
+            stats['revised'] += 1
+            return revised
+        stats['kept'] += 1
+        return draft
 
     async def _run_prefetched_speeches(
         self,
         players: List[Any],
         fetch_speech: Callable[[Any], Awaitable[Optional[str]]],
+        on_spoken: Optional[Callable[[int, Any], None]] = None,
     ) -> None:
-        """按顺序播报发言，同时预取队列中后续玩家的 LLM 发言。"""
+        """按顺序播报发言，同时预取队列中后续玩家的 LLM 发言；on_spoken(序号, 玩家) 在发言写入后、朗读等待前调用。
+
+        预取深度每位发言前重新选择（见 AdaptivePrefetchDepth），并记录该深度与等待发言就绪的停顿时间。
+        """
         if not players:
             return
 
-        prefetch_size = self.speech_prefetch_size
-        if prefetch_size == 0:
-            for player in players:
-                speech = await fetch_speech(player)
-                if speech:
-                    await self.ai_speak(player, speech)
-            return
+        def spoken_hook(index: int, player) -> Optional[Callable[[], None]]:
+            return (lambda: on_spoken(index, player)) if on_spoken else None
 
         tasks: Dict[int, asyncio.Task] = {}
 
         def start_prefetch(index: int) -> None:
             if index < len(players) and index not in tasks:
-                tasks[index] = asyncio.create_task(fetch_speech(players[index]))
+                tasks[index] = self.task_scope.create_task(fetch_speech(players[index]))
+
+        def ready_durations(after: int) -> List[Optional[float]]:
+            """after 之后按顺序已预取完成的发言的朗读时长，遇到未完成的即停止。"""
+            durations: List[Optional[float]] = []
+            for index in range(after + 1, len(players)):
+                task = tasks.get(index)
+                if task is None or not task.done() or task.cancelled() or task.exception() is not None:
+                    break
+                durations.append(self._speech_pacing_seconds(task.result()) if task.result() else 0.0)
+            return durations
 
-        for index in range(min(prefetch_size, len(players))):
+        for index in range(min(self.speech_prefetch.choose(), len(players))):
             start_prefetch(index)
 
         for index, player in enumerate(players):
-            if index not in tasks:
-                start_prefetch(index)
+            start_prefetch(index)
+            wait_start = time.perf_counter()
             speech = await tasks.pop(index)
+            stall = time.perf_counter() - wait_start
             # 在 ai_speak 等待期间并行拉取后续玩家发言，而非等朗读结束后再预取
-            start_prefetch(index + prefetch_size)
+            depth = self.speech_prefetch.choose(ready_durations(index))
+            for ahead in range(index + 1, index + 1 + depth):
+                start_prefetch(ahead)
+            self.speech_prefetch.record_speech(depth, stall)
+            if self.log_manager:
+                self.log_manager.log_global_event("speech_prefetch", {
+                    "player": player.name,
+                    "depth": depth,
+                    "stall_seconds": round(stall, 3),
+                    "latency_estimate": self.speech_prefetch.get_stats()['latency_estimate'],
+                })
             if speech:
-                await self.ai_speak(player, speech)
+                self.speech_prefetch.record_duration(self._speech_pacing_seconds(speech))
+                await self.ai_speak(player, speech, on_spoken=spoken_hook(index, player))
 
-    async def ai_speak(self, player, message: str):
-        """AI玩家发言"""
-        print(f"[发言] {player.name}: {message}")
+    async def ai_speak(self, player, message: str, on_spoken: Optional[Callable[[], None]] = None):
+        """AI玩家发言；on_spoken 在发言写入历史之后、按朗读时长等待之前调用"""
+        self._log(f"[发言] {player.name}: {message}")
 
         self.current_speaker = player.name
 
@@ -707,6 +1427,9 @@ class AIController:
                 role=player.role
             )
 
+        if on_spoken:
+            on_spoken()
+
         if self.websocket_notifier:
             await self.websocket_notifier("player_speaking", {
                 "speaker": player.name,
@@ -717,8 +1440,8 @@ class AIController:
 
             # 按发言长度估算朗读时长进行节奏控制，不依赖任何前端的播放完成回调
             delay = self._estimate_speech_duration(message)
-            print(f"{player.name} 发言已广播，按估算时长 {delay:.1f}s 后继续")
-            await asyncio.sleep(delay)
+            self._log(f"{player.name} 发言已广播，按估算时长 {delay:.1f}s 后继续")
+            await self.clock.sleep(delay)
 
         self.current_speaker = None
 
@@ -731,7 +1454,10 @@ class AIController:
 
     # 备用逻辑方法（原有的简单AI逻辑）
     def ai_select_team(self, leader, available_players: List[str], team_size: int) -> List[str]:
-        """AI选择队伍的备用逻辑"""
+        """AI选择队伍的备用逻辑：优先按角色后验打分，不可用时随机"""
+        heuristic = self.heuristic_policy.select_team(leader, available_players, team_size)
+        if heuristic:
+            return heuristic.value
         if leader.role in ['morgana', 'assassin', 'minion', 'mordred', 'oberon']:
             return self.select_evil_team(leader, available_players, team_size)
         else:
@@ -763,11 +1489,12 @@ class AIController:
 
     def ai_decide_team_vote(self, player) -> str:
         """AI队伍投票决策备用逻辑：解析本队讨论发言，无法解析时默认赞成"""
-        speech = self._get_player_last_speech(player.name, GAME_PHASES['team_vote'])
+        speech = self._get_team_vote_speech(player.name)
         vote = self._parse_vote_from_speech(speech, "team")
         if vote:
             return vote
-        return "approve"
+        heuristic = self.heuristic_policy.team_vote(player)
+        return heuristic.value if heuristic else "approve"
 
     def ai_decide_mission_vote(self, player) -> str:
         """AI任务投票决策备用逻辑（仅坏人）：解析讨论发言，无法解析时投 fail"""
@@ -781,7 +1508,10 @@ class AIController:
         return "fail"
 
     def ai_select_assassination_target(self, assassin, good_players: List[str]) -> str:
-        """AI刺杀目标选择备用逻辑"""
+        """AI刺杀目标选择备用逻辑：优先选后验中最像梅林的好人"""
+        heuristic = self.heuristic_policy.assassination_target(assassin, good_players)
+        if heuristic:
+            return heuristic.value
         return random.choice(good_players) if good_players else None
 
     async def notify_frontend(self, event: str, data: Dict[str, Any]):
@@ -800,16 +1530,7 @@ class AIController:
         """写入战报并通过 WebSocket 推送"""
         meta: Dict[str, Any] = {}
         if player is not None:
-            for index, p in enumerate(self.game.players):
-                if p.name == player.name:
-                    role_info = ROLES.get(p.role or '', {})
-                    meta = {
-                        'seat': index + 1,
-                        'role': p.role,
-                        'role_name': role_info.get('name'),
-                        'is_ai': p.is_ai,
-                    }
-                    break
+            meta = self.game.get_player_chat_meta(player.name)
         elif sender != '系统':
             meta = self.game.get_player_chat_meta(sender)
             if role and 'role' not in meta:
@@ -891,13 +1612,13 @@ class AIController:
         """处理前端发送的语音开始播放通知（仅记录，节奏已由后端自行控制）"""
         player_name = data.get('player_name')
         if player_name:
-            print(f"语音开始播放: {player_name}")
+            self._log(f"语音开始播放: {player_name}")
 
     async def handle_voice_complete(self, data: Dict[str, Any]):
         """处理前端发送的语音播放完成通知（仅记录，后端不再依赖此回调推进）"""
         player_name = data.get('player_name')
         if player_name:
-            print(f"语音播放完成: {player_name}")
+            self._log(f"语音播放完成: {player_name}")
 
     def get_ai_status(self) -> Dict[str, Any]:
         """获取AI控制器状态"""
@@ -906,5 +1627,51 @@ class AIController:
             'ai_players_count': len(self.ai_players),
             'current_speaker': self.current_speaker,
             'auto_delay': self.auto_delay,
+            'pacing': self.clock.get_stats(),
             'speech_prefetch_size': self.speech_prefetch_size,
+            'speech_prefetch': self.speech_prefetch.get_stats(),
+            'draft_refine': {
+                'enabled': self.draft_refine_discussion,
+                **self.draft_refine_stats,
+                'stall_seconds': round(self.draft_refine_stats['stall_seconds'], 3),
+            },
+            'single_flight': self.ai_service.get_single_flight_stats(),
+            'background_tasks': self.background_tasks.get_stats(),
+            'pending_ai_tasks': self.task_scope.pending_count(),
+            'prompt_cache': self.game.prompt_cache.get_stats(),
+            'prompt_tokens': self.ai_service.get_prompt_token_stats(),
+            'heuristic_policy': self.heuristic_policy.get_stats(),
+            'opening_book': self.opening_book.get_stats(),
+            'speculation': {
+                'enabled': self.speculative_votes,
+                **{
+                    kind: {
+                        **counts,
+                        'hit_rate': round(counts['committed'] / counts['speculated'], 3) if counts['speculated'] else 0.0,
+                    }
+                    for kind, counts in self.speculation_stats.items()
+                },
+            },
+            'leader_prefetch': {
+                'enabled': self.leader_prefetch,
+                **self.leader_prefetch_stats,
+                'hit_rate': round(
+                    self.leader_prefetch_stats['used'] / self.leader_prefetch_stats['started'], 3
+                ) if self.leader_prefetch_stats['started'] else 0.0,
+            },
+            'team_vote_timing': {
+                'phases': self.team_vote_timing['phases'],
+                'avg_phase_seconds': round(
+                    self.team_vote_timing['total_seconds'] / self.team_vote_timing['phases'], 3
+                ) if self.team_vote_timing['phases'] else 0.0,
+                'avg_after_discussion_seconds': round(
+                    self.team_vote_timing['after_discussion_seconds'] / self.team_vote_timing['phases'], 3
+                ) if self.team_vote_timing['phases'] else 0.0,
+            },
+            'vote_intent': {
+                'enabled': self.vote_intent,
+                **self.vote_intent_stats,
+                'hit_rate': round(self.vote_intent_stats['intent_hits'] / self.vote_intent_stats['decisions'], 3)
+                if self.vote_intent_stats['decisions'] else 0.0,
+            },
         }
@@ -2,12 +2,15 @@ import asyncio
 import datetime
 import json
 import os
-from typing import Optional, Dict, Any, List, Callable, TYPE_CHECKING
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Callable, Mapping, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..core.game import AvalonGame
 from dotenv import load_dotenv
 from .model_client import ModelClientFactory, BaseModelClient, ModelCallResult, classify_api_error
+from .single_flight import SingleFlight, hash_request
 from ..core.roles import (
     ROLES,
     get_game_description,
@@ -17,32 +20,206 @@ from ..core.roles import (
 )
 from ..core.constants import VOTE_RULES
 from ..core.log_manager import LogManager
+from ..core.snapshot import to_jsonable
 from ..core.prompt_context import (
     format_dialogue_history_block,
+    format_evidence_quotes,
     collect_round_messages,
+    estimate_tokens,
 )
 
+try:
+    from config import GAME_CONFIG
+except ImportError:
+    GAME_CONFIG = {}
+
 # 加载环境变量
 load_dotenv()
 
 
+# 修订发言时表示“草稿无需修改”的回复
+SPEECH_KEEP_TOKENS = ('保持', '「保持」', '保持。')
+
+
+def _loggable_context(game_context: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """去掉仅进程内使用的运行时字段（以下划线开头，如消息索引），快照视图转为列表，用于写入请求日志。"""
+    if not game_context:
+        return game_context
+    return {k: to_jsonable(v) for k, v in game_context.items() if not str(k).startswith('_')}
+
+
+@dataclass(frozen=True)
+class SeatPromptSegments:
+    """某座位在一局中固定不变的 prompt 片段（角色分配后即确定）。"""
+    role: str
+    # 发言 system prompt：游戏说明 + 阵营说明（含发言要求）+ 角色信息
+    speech_system: str
+    # 投票/选队/刺杀决策上下文：游戏说明 + 阵营策略 + 角色信息
+    decision_context: str
+
+
 class AIService:
-    def __init__(self, log_manager: LogManager = None, player_count: int = 5):
+    """AI 决策服务。
+
+    构造时不创建模型客户端、不导入提供商 SDK：客户端在首次调用时于线程中创建
+    （ensure_model_client），导入 API 模块与 /health 不受 SDK 导入耗时影响。
+    """
+
+    def __init__(
+        self,
+        log_manager: LogManager = None,
+        player_count: int = 5,
+        model_client: Optional[BaseModelClient] = None,
+        verbose: bool = True,
+    ):
         self.ai_provider = os.getenv("AI_PROVIDER", "zhipu").lower()
         self.timeout = int(os.getenv("AI_RESPONSE_TIMEOUT", "30"))
         self.max_retries = int(os.getenv("AI_MAX_RETRIES", "0"))
         self.fallback_enabled = os.getenv("AI_FALLBACK_ENABLED", "true").lower() == "true"
         self.log_manager = log_manager
         self.player_count = player_count
+        # 关闭时不打印逐次调用信息（无头批量模拟）
+        self.verbose = verbose
+        # 进行中的相同请求（同 action + 同 messages，或同局同轮压缩）共享一次模型调用
+        self._single_flight = SingleFlight()
+        # 各动作对话历史块（含局势摘要）的 token 预算，未单独配置的动作使用 default；0 = 不限制
+        self.prompt_token_budgets: Dict[str, int] = dict(GAME_CONFIG.get(
+            'prompt_token_budgets',
+            {'default': int(os.getenv('AVALON_PROMPT_TOKEN_BUDGET', '3000'))},
+        ))
+        # 发言 prompt 中附带的更早轮次相关原话条数，0 = 不附带
+        self.evidence_quote_count = int(GAME_CONFIG.get(
+            'evidence_quotes',
+            os.getenv('AVALON_EVIDENCE_QUOTES', '3'),
+        ))
+        # 各动作 prompt token 估算统计：调用次数、累计、最大值
+        self._prompt_token_stats: Dict[str, Dict[str, int]] = {}
+
+        # 每个座位预编译的静态 prompt 片段，start_game 时生成，整局复用
+        self._seat_prompts: Mapping[str, SeatPromptSegments] = MappingProxyType({})
+        # 模型客户端延迟创建；可直接注入（如离线模拟、测试替身）
+        self._model_client: Optional[BaseModelClient] = model_client
+        self._model_client_initialized = model_client is not None
+        self._model_client_lock: Optional[asyncio.Lock] = None
+        if model_client is not None and self.log_manager:
+            self.log_manager.set_model(getattr(model_client, "model", None))
+
+    def start_game(self, players: List[Any]) -> None:
+        """角色分配完成后为每个座位预编译静态 prompt 片段（游戏说明、阵营说明、角色信息与视野）。"""
+        self.player_count = len(players)
+        player_dicts = [{'name': p.name, 'role': p.role} for p in players]
+        game_description = get_game_description(self.player_count)
+
+        compiled: Dict[str, SeatPromptSegments] = {}
+        for player in players:
+            if not player.role:
+                continue
+            role_description = get_role_description(player.role, player.name, player_dicts)
+            compiled[player.name] = SeatPromptSegments(
+                role=player.role,
+                speech_system=(
+                    f"{game_description}\n\n{get_team_description(player.role)}\n\n{role_description}"
+                ),
+                decision_context=(
+                    f"{game_description}\n\n{get_decision_guidance(player.role)}\n\n{role_description}"
+                ),
+            )
+        self._seat_prompts = MappingProxyType(compiled)
+
+    def _get_seat_prompts(
+        self,
+        role: str,
+        player_name: str,
+        players: List[Dict[str, Any]],
+    ) -> SeatPromptSegments:
+        """取预编译的座位片段；未预编译（或角色不符）时现场生成。"""
+        segments = self._seat_prompts.get(player_name)
+        if segments is not None and segments.role == role:
+            return segments
+
+        game_description = get_game_description(self.player_count)
+        role_description = get_role_description(role, player_name, players)
+        return SeatPromptSegments(
+            role=role,
+            speech_system=f"{game_description}\n\n{get_team_description(role)}\n\n{role_description}",
+            decision_context=f"{game_description}\n\n{get_decision_guidance(role)}\n\n{role_description}",
+        )
 
-        # 使用工厂创建模型客户端
+    def _history_budget(self, action: str) -> Optional[int]:
+        budget = self.prompt_token_budgets.get(action, self.prompt_token_budgets.get('default'))
+        return int(budget) if budget else None
+
+    def _record_prompt_tokens(self, request_log: Dict[str, Any], messages: List[Dict[str, str]]) -> int:
+        """估算本次请求的 prompt token 数，写入请求日志并按动作累计。"""
+        tokens = sum(estimate_tokens(m.get("content", "")) for m in messages)
+        request_log["prompt_tokens_estimate"] = tokens
+        stats = self._prompt_token_stats.setdefault(
+            request_log.get("action", "unknown"), {"calls": 0, "total": 0, "max": 0}
+        )
+        stats["calls"] += 1
+        stats["total"] += tokens
+        stats["max"] = max(stats["max"], tokens)
+        return tokens
+
+    def get_prompt_token_stats(self) -> Dict[str, Dict[str, int]]:
+        """各动作 prompt token 估算：调用次数、平均值与最大值。"""
+        return {
+            action: {
+                "calls": stats["calls"],
+                "avg": stats["total"] // stats["calls"] if stats["calls"] else 0,
+                "max": stats["max"],
+            }
+            for action, stats in self._prompt_token_stats.items()
+        }
+
+    def _log(self, message: str) -> None:
+        if self.verbose:
+            print(message)
+
+    def set_log_manager(self, log_manager: Optional[LogManager]) -> None:
+        """切换日志管理器（每局新建），已有客户端时同步模型名称。"""
+        self.log_manager = log_manager
+        if self.log_manager and self._model_client is not None:
+            self.log_manager.set_model(getattr(self._model_client, "model", None))
+
+    def _create_model_client(self) -> Optional[BaseModelClient]:
+        """使用工厂创建模型客户端（会导入提供商 SDK，较慢）；失败时返回 None。"""
         try:
-            self.model_client = ModelClientFactory.create_client(self.ai_provider)
-            if self.log_manager and self.model_client:
-                self.log_manager.set_model(self.model_client.model)
+            client = ModelClientFactory.create_client(self.ai_provider)
         except Exception as e:
-            print(f"初始化AI服务失败: {e}")
-            self.model_client = None
+            self._log(f"初始化AI服务失败: {e}")
+            client = None
+        self._model_client = client
+        self._model_client_initialized = True
+        if self.log_manager and client:
+            self.log_manager.set_model(client.model)
+        return client
+
+    @property
+    def model_client(self) -> Optional[BaseModelClient]:
+        """同步获取模型客户端（首次访问时在当前线程创建）；异步代码请用 ensure_model_client。"""
+        if not self._model_client_initialized:
+            self._create_model_client()
+        return self._model_client
+
+    @model_client.setter
+    def model_client(self, client: Optional[BaseModelClient]) -> None:
+        self._model_client = client
+        self._model_client_initialized = True
+        if self.log_manager and client:
+            self.log_manager.set_model(getattr(client, "model", None))
+
+    async def ensure_model_client(self) -> Optional[BaseModelClient]:
+        """异步获取模型客户端：首次调用时在线程中创建，不阻塞事件循环。"""
+        if self._model_client_initialized:
+            return self._model_client
+
+        if self._model_client_lock is None:
+            self._model_client_lock = asyncio.Lock()
+        async with self._model_client_lock:
+            if not self._model_client_initialized:
+                await asyncio.to_thread(self._create_model_client)
+        return self._model_client
 
     def _log_player_llm_call(
         self,
@@ -95,9 +272,25 @@ class AIService:
         messages: List[Dict[str, str]],
         finalize_response: Optional[Callable[[ModelCallResult, Dict[str, Any]], Dict[str, Any]]] = None,
     ) -> ModelCallResult:
+        """调用模型；与进行中的相同请求合并，只有首个调用者实际请求并写日志。"""
+        key = (request_log.get("action"), hash_request(messages))
+        return await self._single_flight.run(
+            key,
+            lambda: self._invoke_model(player_name, request_log, messages, finalize_response),
+        )
+
+    async def _invoke_model(
+        self,
+        player_name: str,
+        request_log: Dict[str, Any],
+        messages: List[Dict[str, str]],
+        finalize_response: Optional[Callable[[ModelCallResult, Dict[str, Any]], Dict[str, Any]]] = None,
+    ) -> ModelCallResult:
+        self._record_prompt_tokens(request_log, messages)
+        model_client = await self.ensure_model_client()
         request_at = datetime.datetime.now()
 
-        if not self.model_client:
+        if not model_client:
             response_at = datetime.datetime.now()
             response_log = {
                 "success": False,
@@ -110,7 +303,7 @@ class AIService:
             return ModelCallResult(success=False, error=response_log["error"])
 
         try:
-            result = await self.model_client.chat_completion(messages)
+            result = await model_client.chat_completion(messages)
             response_at = datetime.datetime.now()
             response_log = self._build_response_log(result)
             if finalize_response:
@@ -129,7 +322,7 @@ class AIService:
                 "error": error,
             }
             self._log_player_llm_call(player_name, request_log, response_log, request_at, response_at)
-            print(f"AI {player_name} 模型调用异常: {e}")
+            self._log(f"AI {player_name} 模型调用异常: {e}")
             return ModelCallResult(success=False, error=error)
 
     async def get_ai_speech(self, player_name: str, role: str, game_context: Dict[str, Any]) -> Optional[str]:
@@ -137,16 +330,9 @@ class AIService:
         try:
             prompt = self._build_speech_prompt(player_name, role, game_context)
 
-            # 根据当前玩家数量生成游戏说明
-            game_description = get_game_description(self.player_count)
-
-            # 生成角色信息和阵营说明
+            # 游戏说明、阵营说明与角色信息在开局时已按座位预编译
             players = game_context.get('players', [])
-            role_description = get_role_description(role, player_name, players)
-            team_description = get_team_description(role)
-
-            # 构建详细的system prompt
-            system_content = f"{game_description}\n\n{team_description}\n\n{role_description}"
+            system_content = self._get_seat_prompts(role, player_name, players).speech_system
 
             messages = [
                 {"role": "system", "content": system_content},
@@ -157,7 +343,7 @@ class AIService:
                 "action": "speech",
                 "player_name": player_name,
                 "role": role,
-                "game_context": game_context,
+                "game_context": _loggable_context(game_context),
                 "messages": messages
             }
 
@@ -170,11 +356,55 @@ class AIService:
                 player_name, request_log, messages, finalize_response=finalize_speech
             )
             if result.success and result.content:
-                print(f"AI {player_name} 获得发言: {result.content}")
+                self._log(f"AI {player_name} 获得发言: {result.content}")
                 return result.content
 
         except Exception as e:
-            print(f"AI {player_name} 发言获取失败: {e}")
+            self._log(f"AI {player_name} 发言获取失败: {e}")
+
+        return None
+
+    async def get_ai_speech_revision(
+        self,
+        player_name: str,
+        role: str,
+        draft: str,
+        new_speeches: List[Dict[str, Any]],
+    ) -> Optional[str]:
+        """草稿-修订模式：按草稿生成之后其他玩家的新发言修订草稿；无需修改时返回原草稿。
+
+        prompt 只含草稿与新发言（不重复对话历史），系统提示与正式发言相同的座位片段。
+        """
+        try:
+            messages = [
+                {"role": "system", "content": self._get_seat_prompts(role, player_name, []).speech_system},
+                {"role": "user", "content": self._build_speech_revision_prompt(draft, new_speeches)},
+            ]
+            request_log = {
+                "action": "speech_revision",
+                "player_name": player_name,
+                "role": role,
+                "draft": draft,
+                "messages": messages,
+            }
+
+            def finalize_revision(result: ModelCallResult, response_log: Dict[str, Any]) -> Dict[str, Any]:
+                if result.success and result.content:
+                    response_log["speech"] = result.content
+                return response_log
+
+            result = await self._call_model(
+                player_name, request_log, messages, finalize_response=finalize_revision
+            )
+            if result.success and result.content:
+                content = result.content.strip()
+                if content in SPEECH_KEEP_TOKENS:
+                    return draft
+                self._log(f"AI {player_name} 修订发言: {content}")
+                return content
+
+        except Exception as e:
+            self._log(f"AI {player_name} 发言修订失败: {e}")
 
         return None
 
@@ -223,7 +453,7 @@ class AIService:
                 "action": action,
                 "player_name": player_name,
                 "role": role,
-                "game_context": game_context,
+                "game_context": _loggable_context(game_context),
                 "available_players": available_players,
                 "team_size": team_size,
                 "messages": messages,
@@ -263,11 +493,11 @@ class AIService:
                     team = self._extract_player_names(content, available_players, team_size)
 
                 if team:
-                    print(f"AI {player_name} 选择队伍: {team}")
+                    self._log(f"AI {player_name} 选择队伍: {team}")
 
             return team
         except Exception as e:
-            print(f"AI {player_name} 队伍选择失败: {e}")
+            self._log(f"AI {player_name} 队伍选择失败: {e}")
             return None
 
     async def get_ai_vote_decision(self, player_name: str, role: str, game_context: Dict[str, Any],
@@ -295,7 +525,7 @@ class AIService:
                 "action": "vote_decision",
                 "player_name": player_name,
                 "role": role,
-                "game_context": game_context,
+                "game_context": _loggable_context(game_context),
                 "vote_type": vote_type,
                 "messages": messages
             }
@@ -342,13 +572,17 @@ class AIService:
                         vote = "fail"
                     elif "success" in content:
                         vote = "success"
-                print(f"AI {player_name} 投票决策: {result.content}")
+                self._log(f"AI {player_name} 投票决策: {result.content}")
 
             return vote
         except Exception as e:
-            print(f"AI {player_name} 投票决策失败: {e}")
+            self._log(f"AI {player_name} 投票决策失败: {e}")
             return None
 
+    def get_single_flight_stats(self) -> Dict[str, int]:
+        """返回单飞去重统计：总调用数、被合并的调用数、进行中的请求数。"""
+        return self._single_flight.get_stats()
+
     # 以下是辅助方法
     def _build_role_decision_context(
         self,
@@ -357,21 +591,38 @@ class AIService:
         players: List[Dict[str, Any]],
     ) -> str:
         """拼装游戏背景、阵营策略与角色信息（与发言阶段一致，供投票/刺杀决策使用）。"""
-        game_description = get_game_description(self.player_count)
-        decision_guidance = get_decision_guidance(role)
-        role_description = get_role_description(role, player_name, players)
-        return f"{game_description}\n\n{decision_guidance}\n\n{role_description}"
+        return self._get_seat_prompts(role, player_name, players).decision_context
 
     async def compress_round_discussion(
         self,
         game: "AvalonGame",
         mission_number: int,
     ) -> None:
-        """任务轮次结束后异步压缩该轮对话，写入 game.round_discussion_summaries。"""
-        if mission_number in game.round_discussion_summaries:
+        """任务轮次结束后异步压缩该轮对话，写入 game.round_discussion_summaries。
+
+        同一局同一轮的重复触发（重叠调度、重试）共享同一次压缩调用；
+        已有本地抽取式摘要时，LLM 摘要生成后将其替换。
+        """
+        if game.round_discussion_summary_sources.get(mission_number) == 'llm':
             return
 
-        round_messages = collect_round_messages(game.messages_history, mission_number)
+        key = ("round_discussion_compress", id(game), mission_number)
+        await self._single_flight.run(
+            key,
+            lambda: self._compress_round_discussion(game, mission_number),
+        )
+
+    async def _compress_round_discussion(
+        self,
+        game: "AvalonGame",
+        mission_number: int,
+    ) -> None:
+        if game.round_discussion_summary_sources.get(mission_number) == 'llm':
+            return
+
+        round_messages = collect_round_messages(
+            game.messages_history, mission_number, index=game.message_index
+        )
         if not round_messages:
             return
 
@@ -418,9 +669,11 @@ class AIService:
             "message_count": len(round_messages),
             "messages": messages,
         }
+        self._record_prompt_tokens(request_log, messages)
+        model_client = await self.ensure_model_client()
         request_at = datetime.datetime.now()
 
-        if not self.model_client:
+        if not model_client:
             response_at = datetime.datetime.now()
             self._log_system_llm_call(
                 request_log,
@@ -431,17 +684,17 @@ class AIService:
             return
 
         try:
-            result = await self.model_client.chat_completion(messages)
+            result = await model_client.chat_completion(messages)
             response_at = datetime.datetime.now()
             response_log = self._build_response_log(result)
 
             if result.success and result.content:
                 summary = result.content.strip()
-                game.round_discussion_summaries[mission_number] = summary
+                game.set_round_discussion_summary(mission_number, summary, source='llm')
                 response_log["summary"] = summary
-                print(f"第{mission_number}轮讨论摘要已生成: {summary[:60]}...")
+                self._log(f"第{mission_number}轮讨论摘要已生成: {summary[:60]}...")
             else:
-                print(f"第{mission_number}轮讨论摘要生成失败")
+                self._log(f"第{mission_number}轮讨论摘要生成失败")
 
             self._log_system_llm_call(request_log, response_log, request_at, response_at)
         except Exception as e:
@@ -457,7 +710,7 @@ class AIService:
                 request_at,
                 response_at,
             )
-            print(f"第{mission_number}轮讨论摘要异常: {e}")
+            self._log(f"第{mission_number}轮讨论摘要异常: {e}")
 
     def _build_speech_prompt(self, player_name: str, role: str, game_context: Dict[str, Any]) -> str:
         phase = game_context.get('phase', '未知')
@@ -466,7 +719,11 @@ class AIService:
         vote_context = game_context.get('vote_context', '')
 
         history_info = format_dialogue_history_block(
-            game_context, label="对话历史", player_name=player_name
+            game_context, label="对话历史", player_name=player_name,
+            max_tokens=self._history_budget("speech"),
+        )
+        history_info += format_evidence_quotes(
+            game_context, player_name=player_name, top_k=self.evidence_quote_count
         )
 
         context_info = ""
@@ -494,6 +751,19 @@ class AIService:
 """
         return prompt
 
+    def _build_speech_revision_prompt(self, draft: str, new_speeches: List[Dict[str, Any]]) -> str:
+        lines = '\n'.join(f"{m['player']}说: {m['content']}" for m in new_speeches)
+        return f"""【修订发言】
+你在本轮讨论开始时准备了发言草稿：
+{draft}
+
+此后其他玩家刚刚发言：
+{lines}
+
+轮到你发言了。若新发言不改变你的观点、也无需回应，只返回「保持」；
+否则在草稿基础上简短修改（回应上面的发言，篇幅不超过草稿），只返回修改后的完整发言。
+"""
+
     def _build_team_selection_prompt(self, player_name: str, role: str, game_context: Dict[str, Any],
                                    available_players: List[str], team_size: int) -> str:
         mission_results = game_context.get('mission_results', [])
@@ -514,7 +784,8 @@ class AIService:
             mission_info = "\n\n任务历史:\n" + '\n'.join(mission_lines)
 
         history_info = format_dialogue_history_block(
-            game_context, label="对话历史", player_name=player_name
+            game_context, label="对话历史", player_name=player_name,
+            max_tokens=self._history_budget("team_selection"),
         )
 
         # 根据角色阵营生成策略建议
@@ -566,6 +837,7 @@ class AIService:
             game_context,
             label="讨论发言（含你对当前队伍的提议及众人意见）",
             player_name=player_name,
+            max_tokens=self._history_budget("team_revision"),
         )
 
         if role_info['team'] == 'good':
@@ -596,7 +868,8 @@ class AIService:
         role_info = ROLES.get(role, {'name': role, 'team': 'unknown'})
 
         history_info = format_dialogue_history_block(
-            game_context, label="对话历史", player_name=player_name
+            game_context, label="对话历史", player_name=player_name,
+            max_tokens=self._history_budget("vote_decision"),
         )
 
         mission_summary = ""
@@ -667,7 +940,9 @@ class AIService:
         game_context: Optional[Dict[str, Any]] = None,
     ) -> str:
         ctx = game_context or {}
-        history_info = format_dialogue_history_block(ctx, label="对话历史")
+        history_info = format_dialogue_history_block(
+            ctx, label="对话历史", max_tokens=self._history_budget("assassination")
+        )
 
         return f"""【刺杀阶段】
 可刺杀的好人玩家：{good_players}
@@ -686,7 +961,8 @@ class AIService:
         max_rounds: int,
     ) -> str:
         discussion_info = format_dialogue_history_block(
-            game_context, label="对话历史", player_name=assassin_name
+            game_context, label="对话历史", player_name=assassin_name,
+            max_tokens=self._history_budget("assassination_decision"),
         )
 
         remaining_rounds = max_rounds - discussion_round
@@ -746,7 +1022,7 @@ class AIService:
                 "role": role,
                 "discussion_round": discussion_round,
                 "good_players": good_players,
-                "game_context": game_context,
+                "game_context": _loggable_context(game_context),
                 "messages": messages,
             }
 
@@ -789,7 +1065,7 @@ class AIService:
                 return result.content.strip()
 
         except Exception as e:
-            print(f"AI {assassin_name} 刺杀决策失败: {e}")
+            self._log(f"AI {assassin_name} 刺杀决策失败: {e}")
 
         return None
 
@@ -817,7 +1093,7 @@ class AIService:
                 "player_name": assassin_name,
                 "role": role,
                 "good_players": good_players,
-                "game_context": game_context,
+                "game_context": _loggable_context(game_context),
                 "messages": messages,
             }
 
@@ -841,13 +1117,13 @@ class AIService:
                 return result.content.strip()
 
         except Exception as e:
-            print(f"AI {assassin_name} 刺杀目标选择失败: {e}")
+            self._log(f"AI {assassin_name} 刺杀目标选择失败: {e}")
 
         return None
 
 
-# 全局AI服务实例（延迟初始化LogManager）
+# 全局AI服务实例（延迟初始化LogManager与模型客户端，导入本模块不会创建客户端或导入 SDK）
 ai_service = AIService(log_manager=None)
 
-# 注意：实际使用时，应在游戏开始时创建新的LogManager实例并传递给AIService
+# 注意：每局游戏由 AIController 创建独立的 AIService 并传入该局的 LogManager
 # 这样可以避免在启动后端时就创建空的日志目录
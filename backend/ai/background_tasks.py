@@ -0,0 +1,133 @@
+"""
+后台任务监管：跟踪单局内的后台作业（如轮次讨论压缩），限制并发、支持限时等待与统一取消。
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Iterable, Optional
+
+from .task_scope import TaskScope
+
+
+class BackgroundTaskSupervisor:
+    """单局后台任务监管器。
+
+    - submit：按 key 提交作业，同 key 作业未结束时直接复用，不重复提交；
+    - 并发上限由信号量控制，超出的作业排队等待；
+    - wait_for：在限定时间内等待指定作业完成（用于 prompt 需要的摘要仍在生成时）；
+    - cancel_all：游戏结束或重置时取消全部作业，之后不再接受新作业。
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 2,
+        latency_window: int = 50,
+        scope: Optional[TaskScope] = None,
+    ):
+        self.max_concurrency = max(1, int(max_concurrency))
+        # 作业任务登记到所属局的作用域，作用域取消时一并取消
+        self._scope = scope
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self._closed = False
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        # 每个作业从提交到结束的耗时，以及排队耗时（秒）
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+        self._queue_waits: Deque[float] = deque(maxlen=latency_window)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def submit(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Optional[asyncio.Task]:
+        """提交后台作业；已关闭时返回 None。"""
+        if self._closed or (self._scope is not None and self._scope.closed):
+            return None
+
+        existing = self._tasks.get(key)
+        if existing is not None and not existing.done():
+            return existing
+
+        if self._scope is not None:
+            task = self._scope.create_task(self._run(key, factory))
+        else:
+            task = asyncio.create_task(self._run(key, factory))
+        self._tasks[key] = task
+        return task
+
+    async def _run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        submitted_at = time.perf_counter()
+        self.queued += 1
+        started = False
+        try:
+            async with self._semaphore:
+                self.queued -= 1
+                started = True
+                self.running += 1
+                self._queue_waits.append(time.perf_counter() - submitted_at)
+                try:
+                    result = await factory()
+                finally:
+                    self.running -= 1
+            self.completed += 1
+            return result
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        except Exception as e:
+            self.failed += 1
+            print(f"后台任务 {key} 异常: {e}")
+            return None
+        finally:
+            if not started:
+                self.queued -= 1
+            self._latencies.append(time.perf_counter() - submitted_at)
+
+    def is_pending(self, key: Hashable) -> bool:
+        task = self._tasks.get(key)
+        return task is not None and not task.done()
+
+    async def wait_for(self, keys: Iterable[Hashable], timeout: float) -> bool:
+        """限时等待指定作业完成；全部完成（或无待完成作业）返回 True，超时返回 False。"""
+        pending = [
+            self._tasks[key] for key in keys
+            if key in self._tasks and not self._tasks[key].done()
+        ]
+        if not pending:
+            return True
+        if timeout <= 0:
+            return False
+
+        _, still_pending = await asyncio.wait(pending, timeout=timeout)
+        return not still_pending
+
+    async def cancel_all(self) -> None:
+        """取消所有未完成作业并等待其退出，此后拒绝新提交。"""
+        self._closed = True
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回队列长度、运行数与耗时统计（毫秒）。"""
+        latencies = list(self._latencies)
+        queue_waits = list(self._queue_waits)
+        return {
+            'max_concurrency': self.max_concurrency,
+            'queued': self.queued,
+            'running': self.running,
+            'completed': self.completed,
+            'failed': self.failed,
+            'cancelled': self.cancelled,
+            'avg_latency_ms': int(sum(latencies) / len(latencies) * 1000) if latencies else 0,
+            'max_latency_ms': int(max(latencies) * 1000) if latencies else 0,
+            'avg_queue_wait_ms': int(sum(queue_waits) / len(queue_waits) * 1000) if queue_waits else 0,
+            'closed': self._closed,
+        }
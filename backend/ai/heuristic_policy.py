@@ -0,0 +1,209 @@
+"""
+不调用 LLM 的打分策略：基于角色后验（RoleBeliefEngine）为选队、队伍投票、坏人任务票与刺杀
+给出决策与置信度。置信度达到阈值时控制器直接采用，跳过该次 LLM 调用；
+否则仍走 LLM，本策略的结果只作为 LLM 失败时的兜底。
+
+置信度的含义是“该决策正确的概率”（按后验估计）；需要伪装的决策（坏人选队/投票、梅林选队）
+置信度设有上限，始终交给 LLM。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.constants import EVIL_ROLES, GAME_RULES
+
+try:
+    import numpy as np
+except ImportError:  # 未安装 numpy 时只提供统计接口，所有决策置信度为 0
+    np = None
+
+# 同队多名坏人时出失败票的优先级（与 TEAM_GUIDANCE 的控票规则一致），奥伯伦看不到同伴，总是自行决定
+FAIL_PRIORITY = ('assassin', 'minion', 'morgana', 'mordred')
+
+# 需要伪装的决策的置信度上限
+DISGUISE_CONFIDENCE_CAP = 0.6
+
+PHASES = ('team_selection', 'team_revision', 'team_vote', 'mission_vote', 'assassination')
+
+
+@dataclass(frozen=True)
+class HeuristicDecision:
+    value: Any
+    confidence: float
+    reason: str
+
+
+@lru_cache(maxsize=None)
+def _candidate_teams(player_count: int, team_size: int) -> Tuple[Tuple[Tuple[int, ...], ...], Any]:
+    """全部 C(n, k) 个队伍：座位元组与 (T, n) 布尔矩阵。"""
+    seats = tuple(combinations(range(player_count), team_size))
+    matrix = np.zeros((len(seats), player_count), dtype=bool)
+    for i, team in enumerate(seats):
+        matrix[i, list(team)] = True
+    matrix.setflags(write=False)
+    return seats, matrix
+
+
+class HeuristicPolicy:
+    """按后验打分的决策，附带置信度；并统计各阶段跳过 LLM 的比例。"""
+
+    def __init__(self, game, confidence_threshold: float = 0.9):
+        self.game = game
+        self.confidence_threshold = confidence_threshold
+        self.stats: Dict[str, Dict[str, int]] = {phase: {'decisions': 0, 'skipped': 0} for phase in PHASES}
+
+    @property
+    def _beliefs(self):
+        return getattr(self.game, 'role_beliefs', None) if np is not None else None
+
+    def is_confident(self, decision: Optional[HeuristicDecision]) -> bool:
+        """置信度是否达到阈值（不计入统计）。"""
+        return decision is not None and decision.confidence >= self.confidence_threshold
+
+    def record(self, phase: str, skipped: bool) -> None:
+        """记录一次决策机会及是否跳过了 LLM。"""
+        stats = self.stats[phase]
+        stats['decisions'] += 1
+        if skipped:
+            stats['skipped'] += 1
+
+    def should_skip_llm(self, phase: str, decision: Optional[HeuristicDecision]) -> bool:
+        """记录一次决策机会；置信度达到阈值时返回 True（调用方直接采用 decision.value）。"""
+        skipped = self.is_confident(decision)
+        self.record(phase, skipped)
+        return skipped
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'confidence_threshold': self.confidence_threshold,
+            'phases': {
+                phase: {
+                    **counts,
+                    'skip_rate': round(counts['skipped'] / counts['decisions'], 3) if counts['decisions'] else 0.0,
+                }
+                for phase, counts in self.stats.items()
+            },
+        }
+
+    # ---- 选队 ----
+
+    def select_team(self, leader, available_players: List[str], team_size: int) -> Optional[HeuristicDecision]:
+        """在包含队长本人的候选队伍中选含坏人概率最低的一支（坏人队长选恰好带一名坏人的队伍）。"""
+        beliefs = self._beliefs
+        if beliefs is None or leader.name not in beliefs.seat_by_name:
+            return None
+        names = beliefs.player_names
+        seats, matrix = _candidate_teams(len(names), team_size)
+        leader_seat = beliefs.seat_by_name[leader.name]
+        available = np.isin(np.array(names), available_players)
+        candidates = matrix[:, leader_seat] & ~(matrix & ~available).any(axis=1)
+        if not candidates.any():
+            return None
+        index = np.flatnonzero(candidates)
+        evil_prob = beliefs.team_evil_probabilities(matrix[index], viewer=leader.name)
+
+        if leader.role in EVIL_ROLES:
+            # 坏人队长：只带自己一名坏人，其余选其视角下最像好人的座位
+            probs = beliefs.evil_probabilities(leader.name)
+            others = np.array([sum(probs[names[s]] for s in seats[i] if s != leader_seat) for i in index])
+            best = int(np.argmin(others))
+            confidence = min(1.0 - others[best], DISGUISE_CONFIDENCE_CAP)
+            reason = '只带自己一名坏人上车'
+        else:
+            best = int(np.argmin(evil_prob))
+            confidence = 1.0 - float(evil_prob[best])
+            if leader.role == 'merlin':
+                # 梅林选出完全干净的队伍容易暴露身份
+                confidence = min(confidence, DISGUISE_CONFIDENCE_CAP)
+            reason = f'该队伍不含坏人的概率 {1.0 - float(evil_prob[best]):.0%}'
+        team = sorted((names[s] for s in seats[index[best]]), key=lambda n: int(n) if n.isdigit() else n)
+        return HeuristicDecision(team, float(confidence), reason)
+
+    def keep_team(self, leader, current_team: List[str], team_size: int) -> Optional[HeuristicDecision]:
+        """队长二次确认：原队伍与最优队伍含坏人概率相当时维持原队伍。"""
+        best = self.select_team(leader, self.game.get_available_players(), team_size)
+        beliefs = self._beliefs
+        if best is None or beliefs is None:
+            return None
+        current = self._team_evil_probability(current_team, leader.name)
+        best_prob = self._team_evil_probability(best.value, leader.name)
+        if current <= best_prob + 0.02:
+            return HeuristicDecision(list(current_team), best.confidence, '原队伍已是最优之一')
+        return best
+
+    def _team_evil_probability(self, team: List[str], viewer: str) -> float:
+        beliefs = self._beliefs
+        row = np.isin(np.array(beliefs.player_names), team)[None, :]
+        return float(beliefs.team_evil_probabilities(row, viewer=viewer)[0])
+
+    # ---- 队伍投票 ----
+
+    def team_vote(self, player) -> Optional[HeuristicDecision]:
+        beliefs = self._beliefs
+        team = list(self.game.current_team)
+        if beliefs is None or not team or player.name not in beliefs.seat_by_name:
+            return None
+        last_attempt = self.game.failed_team_votes >= GAME_RULES['team_vote_limit'] - 1
+
+        if player.role in EVIL_ROLES:
+            if last_attempt:
+                return HeuristicDecision('approve', DISGUISE_CONFIDENCE_CAP, '第五次组队，随大流赞成')
+            has_evil = self._team_evil_probability(team, player.name)
+            vote = 'approve' if has_evil >= 0.5 else 'reject'
+            confidence = min(max(has_evil, 1 - has_evil), DISGUISE_CONFIDENCE_CAP)
+            return HeuristicDecision(vote, confidence, '坏人倾向让同伴上车')
+
+        if last_attempt:
+            # 第五次组队被否决即坏人获胜，好人必须赞成
+            return HeuristicDecision('approve', 1.0, '第五次组队，否决即输')
+        has_evil = self._team_evil_probability(team, player.name)
+        vote, confidence = ('reject', has_evil) if has_evil >= 0.5 else ('approve', 1.0 - has_evil)
+        if player.role == 'merlin':
+            # 梅林按视野投票容易暴露身份
+            confidence = min(confidence, DISGUISE_CONFIDENCE_CAP)
+        return HeuristicDecision(vote, confidence, f'队伍含坏人的概率 {has_evil:.0%}')
+
+    # ---- 坏人任务票 ----
+
+    def mission_vote(self, player) -> Optional[HeuristicDecision]:
+        """坏人任务票：再失败一次即获胜时必投失败；同队有更高优先级同伴时投成功。"""
+        if player.role not in EVIL_ROLES:
+            return HeuristicDecision('success', 1.0, '好人只能投成功')
+        if player.role == 'oberon':
+            return HeuristicDecision('fail', 0.7, '奥伯伦看不到同伴，自行破坏')
+
+        # 坏人（奥伯伦除外）能看到同伴，这里直接按真实角色判断同队的可见同伴
+        teammates = [
+            p.role for p in self.game.players
+            if p.name in self.game.current_team and p.name != player.name and p.role in FAIL_PRIORITY
+        ]
+        fails_needed = self.game.get_mission_config().get('fails_needed', 1)
+        evil_wins = sum(1 for r in self.game.mission_results if not r.get('success'))
+        if evil_wins >= GAME_RULES['fail_threshold'] - 1 and (fails_needed == 1 or teammates):
+            return HeuristicDecision('fail', 1.0, '再失败一次坏人即获胜')
+
+        rank = FAIL_PRIORITY.index(player.role)
+        if fails_needed == 1 and any(FAIL_PRIORITY.index(role) < rank for role in teammates):
+            return HeuristicDecision('success', 0.95, '由优先级更高的同伴出失败票')
+        if fails_needed > 1 and not teammates:
+            return HeuristicDecision('success', 0.9, '容错轮一张失败票不足以破坏任务')
+        return HeuristicDecision('fail', 0.8, '本队由我负责出失败票')
+
+    # ---- 刺杀 ----
+
+    def assassination_target(self, assassin, good_players: List[str]) -> Optional[HeuristicDecision]:
+        beliefs = self._beliefs
+        if beliefs is None or not good_players:
+            return None
+        marginals = beliefs.role_marginals(assassin.name)
+        merlin = {name: marginals.get(name, {}).get('merlin', 0.0) for name in good_players}
+        total = sum(merlin.values())
+        if total <= 0:
+            return None
+        target = max(good_players, key=lambda name: merlin[name])
+        confidence = merlin[target] / total
+        return HeuristicDecision(target, confidence, f'是梅林的概率 {confidence:.0%}')
@@ -0,0 +1,282 @@
+"""
+开局库：复用此前对局生成的第一轮输出（队长选队、第一次组队的讨论发言），开局即可取用，
+省去观众在 /game/start 之后等待的首轮 LLM 延迟。
+
+第一轮几乎不依赖局势，只取决于人数、角色、相对队长的座位与开局视野，因此条目按
+(人数, 角色, 相对座位, 视野内座位的相对位置) 归类；座位号一律折算为相对队长的偏移量存储，
+取用时换算回本局座位。
+
+- 发言还依赖队伍与前面的发言：发言条目额外按队伍偏移归类，并记录上一位发言条目（父条目），
+  一局只沿同一条发言链连续取用，链上取不到的位置起转为实时生成；
+- 新鲜度：条目超过 max_age 秒或被取用 max_uses 次后淘汰；
+- 多样性：每个键最多保留 pool_size 条（文本去重，满时淘汰最旧的），取用时在使用次数最少的条目中随机选；
+- 记录队伍与发言两类查询的命中率。
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..core.roles import get_visible_roles
+
+try:
+    from config import GAME_CONFIG
+except ImportError:
+    GAME_CONFIG = {}
+
+# 发言中的座位提及（“3号”），换算为相对队长的占位符
+_SEAT_MENTION = re.compile(r'(?<!\d)(\d{1,2})(?=\s*号)')
+# 与座位无关的数字（“第1轮”“2个人”“3票”）
+_COUNT_MENTION = re.compile(r'\d+\s*(?:轮|个|人|票|次|名|%)')
+_PLACEHOLDER = re.compile(r'\{\d+\}')
+
+KINDS = ('team', 'speech')
+
+
+@dataclass
+class BookEntry:
+    entry_id: int
+    value: Any
+    created: float
+    uses: int = 0
+
+
+class OpeningBook:
+    """跨对局共享的第一轮输出池。"""
+
+    def __init__(
+        self,
+        max_age: float = 86400.0,
+        max_uses: int = 3,
+        pool_size: int = 8,
+        rng: Optional[random.Random] = None,
+        clock=time.monotonic,
+    ):
+        self.max_age = max_age
+        self.max_uses = max_uses
+        self.pool_size = pool_size
+        self._rng = rng or random.Random()
+        self._clock = clock
+        self._pools: Dict[Tuple, List[BookEntry]] = {}
+        self._ids = itertools.count(1)
+        self.stats: Dict[str, Dict[str, int]] = {kind: {'lookups': 0, 'hits': 0, 'recorded': 0} for kind in KINDS}
+
+    @classmethod
+    def from_config(cls) -> 'OpeningBook':
+        return cls(
+            max_age=float(GAME_CONFIG.get(
+                'opening_book_max_age',
+                os.getenv('AVALON_OPENING_BOOK_MAX_AGE', '86400'),
+            )),
+            max_uses=int(GAME_CONFIG.get(
+                'opening_book_max_uses',
+                os.getenv('AVALON_OPENING_BOOK_MAX_USES', '3'),
+            )),
+            pool_size=int(GAME_CONFIG.get(
+                'opening_book_pool_size',
+                os.getenv('AVALON_OPENING_BOOK_POOL_SIZE', '8'),
+            )),
+        )
+
+    # ---- 适用范围与键 ----
+
+    @staticmethod
+    def applies(game) -> bool:
+        """仅第一轮第一次组队、且全员 AI 的对局（真人发言不在库的前提之内）。"""
+        return (
+            game.current_mission == 1
+            and game.failed_team_votes == 0
+            and all(p.is_ai for p in game.players)
+        )
+
+    @staticmethod
+    def _offset(game, seat: int) -> int:
+        return (seat - game.current_leader_index) % len(game.players)
+
+    def _seat_key(self, game, seat: int) -> Tuple:
+        """(人数, 角色, 相对座位, 视野内座位的相对位置)。"""
+        players = game.players
+        visible = get_visible_roles(players[seat].role)
+        vision = tuple(sorted(
+            self._offset(game, i) for i, p in enumerate(players) if i != seat and p.role in visible
+        ))
+        return len(players), players[seat].role, self._offset(game, seat), vision
+
+    def _team_offsets(self, game, team: Sequence[str]) -> Optional[Tuple[int, ...]]:
+        seats = [game.seat_by_name.get(name) for name in team]
+        if any(seat is None for seat in seats):
+            return None
+        return tuple(sorted(self._offset(game, seat) for seat in seats))
+
+    def _names(self, game) -> List[str]:
+        """按相对队长的偏移排列的本局玩家名。"""
+        n = len(game.players)
+        return [game.players[(game.current_leader_index + k) % n].name for k in range(n)]
+
+    # ---- 发言模板 ----
+
+    def _to_template(self, game, text: str) -> Optional[str]:
+        """把座位提及换成相对占位符；含无法归属的数字时不入库。"""
+        def replace(match):
+            seat = game.seat_by_name.get(match.group(1))
+            if seat is None:
+                raise ValueError(match.group(1))
+            return '{%d}' % self._offset(game, seat)
+
+        try:
+            template = _SEAT_MENTION.sub(replace, text.replace('{', '{{').replace('}', '}}'))
+        except ValueError:
+            return None
+        rest = _COUNT_MENTION.sub('', _PLACEHOLDER.sub('', template))
+        return None if re.search(r'\d', rest) else template
+
+    # ---- 池 ----
+
+    def _take(self, key: Tuple) -> Optional[BookEntry]:
+        """在使用次数最少的新鲜条目中随机取一条；达到使用上限的条目随即淘汰。"""
+        pool = self._pools.get(key)
+        if not pool:
+            return None
+        now = self._clock()
+        pool[:] = [e for e in pool if now - e.created <= self.max_age]
+        if not pool:
+            del self._pools[key]
+            return None
+        fewest = min(e.uses for e in pool)
+        entry = self._rng.choice([e for e in pool if e.uses == fewest])
+        entry.uses += 1
+        if entry.uses >= self.max_uses:
+            pool.remove(entry)
+        return entry
+
+    def _put(self, key: Tuple, value: Any) -> BookEntry:
+        pool = self._pools.setdefault(key, [])
+        for entry in pool:
+            if entry.value == value:
+                return entry
+        entry = BookEntry(next(self._ids), value, self._clock())
+        pool.append(entry)
+        if len(pool) > self.pool_size:
+            pool.remove(min(pool, key=lambda e: e.created))
+        return entry
+
+    # ---- 选队 ----
+
+    def sample_team(self, game) -> Optional[List[str]]:
+        """为本局队长取一支库中的第一轮队伍（本局座位名）；未命中返回 None。"""
+        stats = self.stats['team']
+        stats['lookups'] += 1
+        entry = self._take(('team',) + self._seat_key(game, game.current_leader_index))
+        if entry is None:
+            return None
+        stats['hits'] += 1
+        names = self._names(game)
+        return [names[offset] for offset in entry.value]
+
+    def record_team(self, game, team: Sequence[str]) -> None:
+        offsets = self._team_offsets(game, team)
+        if offsets is None:
+            return
+        self._put(('team',) + self._seat_key(game, game.current_leader_index), offsets)
+        self.stats['team']['recorded'] += 1
+
+    # ---- 讨论发言 ----
+
+    def _speech_key(self, game, seat: int, team: Tuple[int, ...], parent: Optional[int]) -> Tuple:
+        return ('speech',) + self._seat_key(game, seat) + (team, parent)
+
+    def sample_speeches(self, game, speakers: Sequence[Any]) -> List[Tuple[str, int]]:
+        """沿一条发言链为按顺序发言的前若干位取用发言：返回 [(发言, 条目编号)]，长度即命中的前缀长度。"""
+        team = self._team_offsets(game, game.current_team)
+        if team is None:
+            return []
+        names = self._names(game)
+        stats = self.stats['speech']
+        plan: List[Tuple[str, int]] = []
+        parent = None
+        for player in speakers:
+            stats['lookups'] += 1
+            entry = self._take(self._speech_key(game, game.seat_by_name[player.name], team, parent))
+            if entry is None:
+                break
+            stats['hits'] += 1
+            plan.append((entry.value.format(*names), entry.entry_id))
+            parent = entry.entry_id
+        return plan
+
+    def record_speeches(
+        self,
+        game,
+        speeches: Sequence[Tuple[str, Optional[str]]],
+        parent: Optional[int] = None,
+    ) -> None:
+        """记录按顺序的 (玩家名, 发言)，接在 parent 条目之后；某位无法入库时其后的发言也不再记录。"""
+        team = self._team_offsets(game, game.current_team)
+        if team is None:
+            return
+        for name, text in speeches:
+            template = self._to_template(game, text) if text else None
+            if template is None:
+                return
+            entry = self._put(self._speech_key(game, game.seat_by_name[name], team, parent), template)
+            self.stats['speech']['recorded'] += 1
+            parent = entry.entry_id
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'entries': sum(len(pool) for pool in self._pools.values()),
+            **{
+                kind: {
+                    **counts,
+                    'hit_rate': round(counts['hits'] / counts['lookups'], 3) if counts['lookups'] else 0.0,
+                }
+                for kind, counts in self.stats.items()
+            },
+        }
+
+
+async def prefill_opening_book(book: OpeningBook, model_client, player_count: int, games: int) -> int:
+    """用随机发牌的离线对局生成第一轮选队与讨论发言写入开局库，返回完成的对局数。"""
+    from ..core.game import AvalonGame
+    from ..models.player import AIPlayer
+    from .ai_service import AIService
+
+    done = 0
+    for _ in range(games):
+        game = AvalonGame([AIPlayer(str(i)) for i in range(1, player_count + 1)])
+        game.start_game()
+        # 独立的 AIService：座位 prompt 按这局离线对局的角色与视野预编译
+        service = AIService(player_count=player_count, model_client=model_client)
+        service.start_game(game.players)
+
+        leader = game.players[game.current_leader_index]
+        team = await service.get_ai_team_selection(
+            leader.name, leader.role, game.get_prompt_context(),
+            game.get_available_players(), game.get_mission_config()['team_size'],
+        )
+        if not team or 'error' in game.select_team(team):
+            continue
+        book.record_team(game, team)
+
+        speeches = []
+        for k in range(player_count):
+            player = game.players[(game.current_leader_index + k) % player_count]
+            context = game.get_prompt_context(vote_context='team_vote')
+            speech = await service.get_ai_speech(player.name, player.role, context)
+            if not speech:
+                break
+            game.record_message(player.name, speech)
+            speeches.append((player.name, speech))
+        book.record_speeches(game, speeches)
+        done += 1
+    return done
+
+
+# 进程内共享的开局库（各局 AIController 默认使用）
+opening_book = OpeningBook.from_config()
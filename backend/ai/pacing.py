@@ -0,0 +1,78 @@
+"""
+AIController 的节奏时钟：朗读等待、投票结果停顿、主循环间隔等“为观众放慢”的等待统一经由此处。
+
+time_scale 为等待时长的缩放系数：1 = 实时，0 = 不等待（无头模拟/测试），介于其间按比例缩短；
+可在对局进行中修改，正在进行的等待按新系数重新计算剩余时长。
+virtual_seconds 累计按原始时长计的节奏时间，便于对比模拟对局与实时对局的时长。
+"""
+
+import asyncio
+import os
+from typing import Any, Dict
+
+try:
+    from config import GAME_CONFIG
+except ImportError:
+    GAME_CONFIG = {}
+
+
+class PacingClock:
+    """可注入、可实时调速的节奏时钟。"""
+
+    def __init__(self, time_scale: float = 1.0):
+        self._time_scale = self._validate(time_scale)
+        self._changed = asyncio.Event()
+        self.virtual_seconds = 0.0
+        self.waited_seconds = 0.0
+
+    @classmethod
+    def from_config(cls) -> 'PacingClock':
+        return cls(time_scale=float(GAME_CONFIG.get(
+            'pacing_time_scale',
+            os.getenv('AVALON_PACING_TIME_SCALE', '1.0'),
+        )))
+
+    @staticmethod
+    def _validate(time_scale: float) -> float:
+        time_scale = float(time_scale)
+        if time_scale < 0:
+            raise ValueError("time_scale 不能为负数")
+        return time_scale
+
+    @property
+    def time_scale(self) -> float:
+        return self._time_scale
+
+    def set_time_scale(self, time_scale: float) -> None:
+        """修改缩放系数，并唤醒正在等待的协程按新系数继续。"""
+        self._time_scale = self._validate(time_scale)
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def scaled(self, seconds: float) -> float:
+        """按当前系数折算的实际等待秒数。"""
+        return max(0.0, seconds) * self._time_scale
+
+    async def sleep(self, seconds: float) -> None:
+        """等待 seconds 秒的节奏时间（实际等待 seconds × time_scale）。"""
+        remaining = max(0.0, seconds)
+        self.virtual_seconds += remaining
+        loop = asyncio.get_running_loop()
+        while remaining > 0 and self._time_scale > 0:
+            scale, changed = self._time_scale, self._changed
+            start = loop.time()
+            try:
+                await asyncio.wait_for(changed.wait(), remaining * scale)
+            except asyncio.TimeoutError:
+                self.waited_seconds += loop.time() - start
+                return
+            elapsed = loop.time() - start
+            self.waited_seconds += elapsed
+            remaining -= elapsed / scale
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'time_scale': self._time_scale,
+            'virtual_seconds': round(self.virtual_seconds, 3),
+            'waited_seconds': round(self.waited_seconds, 3),
+        }
@@ -0,0 +1,123 @@
+"""
+讨论发言的自适应预取深度：按近期 LLM 发言延迟与队列中发言的朗读时长，决定提前拉取几位后续玩家的发言。
+
+第 i 位开始朗读时，第 i+k 位的发言要在前面 k 段朗读结束时就绪；若等到第 i+1 位开口时再发起，
+它会在 (第 i 段朗读时长 + 延迟) 后就绪。因此只有当延迟超过第 i+1 … i+k-1 段的朗读总时长时，
+第 i+k 位才需要现在就发起：
+
+    深度 = 1 + #{m ≥ 1 : 后续 m 段朗读总时长 < 延迟估计}
+
+延迟估计取滚动窗口内的高分位数（偏保守，少停顿）；已预取完成的发言用其实际朗读时长，
+其余按近期平均朗读时长估算。深度限制在 [min_depth, max_depth]：过深的预取在上下文变化后作废，浪费配额。
+配置的初始深度为 0 时关闭预取，不受自适应与 min_depth 影响。
+"""
+
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Sequence
+
+
+class RollingWindow:
+    """固定容量的滚动样本窗口，支持均值与分位数。"""
+
+    def __init__(self, size: int = 32):
+        self._samples: Deque[float] = deque(maxlen=max(1, size))
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, value: float) -> None:
+        self._samples.append(value)
+
+    def mean(self) -> Optional[float]:
+        if not self._samples:
+            return None
+        return sum(self._samples) / len(self._samples)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """最近邻秩分位数；窗口为空时返回 None。"""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[rank]
+
+
+class AdaptivePrefetchDepth:
+    """根据延迟分布与朗读时长选择发言预取深度，并统计各深度的采用次数与停顿时间。"""
+
+    def __init__(
+        self,
+        initial_depth: int = 1,
+        min_depth: int = 1,
+        max_depth: int = 3,
+        enabled: bool = True,
+        window: int = 32,
+        quantile: float = 0.75,
+    ):
+        self.min_depth = max(0, min_depth)
+        self.max_depth = max(self.min_depth, max_depth)
+        self.initial_depth = initial_depth
+        self.enabled = enabled
+        self.quantile = quantile
+        self.latencies = RollingWindow(window)
+        self.durations = RollingWindow(window)
+        self.stats: Dict[str, Any] = {'speeches': 0, 'stalls': 0, 'stall_seconds': 0.0, 'depths': {}}
+
+    def _clamp(self, depth: int) -> int:
+        return min(self.max_depth, max(self.min_depth, depth))
+
+    def record_latency(self, seconds: float) -> None:
+        self.latencies.add(seconds)
+
+    def record_duration(self, seconds: float) -> None:
+        self.durations.add(seconds)
+
+    def latency_estimate(self) -> Optional[float]:
+        return self.latencies.quantile(self.quantile)
+
+    def choose(self, upcoming: Sequence[Optional[float]] = ()) -> int:
+        """upcoming：当前发言之后按顺序已知的朗读时长（None 表示尚未生成，按平均值估算）。
+
+        initial_depth 为 0 表示关闭预取（逐位生成），此时不做自适应。
+        """
+        if not self.enabled or self.initial_depth <= 0:
+            return max(0, self.initial_depth)
+        latency = self.latency_estimate()
+        mean_duration = self.durations.mean()
+        if latency is None or mean_duration is None:
+            # 还没有延迟或朗读时长样本：沿用配置的固定深度
+            return self._clamp(self.initial_depth)
+        depth, covered = 1, 0.0
+        while depth < self.max_depth:
+            known = upcoming[depth - 1] if depth - 1 < len(upcoming) else None
+            covered += mean_duration if known is None else known
+            if covered >= latency:
+                break
+            depth += 1
+        return self._clamp(depth)
+
+    def record_speech(self, depth: int, stall_seconds: float) -> None:
+        stats = self.stats
+        stats['speeches'] += 1
+        stats['stall_seconds'] += stall_seconds
+        if stall_seconds > 0.01:
+            stats['stalls'] += 1
+        stats['depths'][depth] = stats['depths'].get(depth, 0) + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        latency = self.latency_estimate()
+        mean_duration = self.durations.mean()
+        speeches = self.stats['speeches']
+        return {
+            'enabled': self.enabled,
+            'min_depth': self.min_depth,
+            'max_depth': self.max_depth,
+            'latency_estimate': round(latency, 3) if latency is not None else None,
+            'mean_speech_seconds': round(mean_duration, 3) if mean_duration is not None else None,
+            'speeches': speeches,
+            'stalls': self.stats['stalls'],
+            'stall_seconds': round(self.stats['stall_seconds'], 3),
+            'mean_stall_seconds': round(self.stats['stall_seconds'] / speeches, 3) if speeches else 0.0,
+            'depths': dict(sorted(self.stats['depths'].items())),
+        }
@@ -0,0 +1,72 @@
+"""
+单飞（single-flight）去重：同一 key 的并发请求共享同一个进行中的 Future，避免重复调用模型。
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar('T')
+
+
+def hash_request(payload: Any) -> str:
+    """对请求内容（如 messages 列表）计算稳定摘要，用作单飞 key 的一部分。"""
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class SingleFlight:
+    """按 key 合并并发中的相同请求。
+
+    - 首个调用者创建真正执行的任务，后续同 key 调用者直接等待同一任务；
+    - 任务完成后立即移除 key，之后的新请求会重新执行（不做结果缓存）；
+    - 单个等待者被取消不会影响其他等待者；所有等待者都取消时才取消底层任务，并立即移除 key。
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        # 等待者计数按任务对象记录：key 被新任务复用时，旧任务等待者的退出不会影响新任务
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def is_inflight(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """执行 factory()，若同 key 请求已在进行中则共享其结果。"""
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            self._waiters[task] = 0
+            task.add_done_callback(lambda done, k=key: self._forget(k, done))
+        else:
+            self.shared += 1
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and self._waiters.get(task, 0) <= 1:
+                # 立即移除 key：取消到 _forget 回调之间到达的同 key 请求应新建任务，而不是拿到将被取消的任务
+                self._forget(key, task)
+                task.cancel()
+            raise
+        finally:
+            if task in self._waiters:
+                self._waiters[task] -= 1
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        self._waiters.pop(task, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'calls': self.calls,
+            'shared': self.shared,
+            'inflight': len(self._inflight),
+        }
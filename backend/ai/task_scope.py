@@ -0,0 +1,57 @@
+"""
+单局 AI 工作的结构化并发作用域：统一登记该局派生的所有任务，停止/重置/结束时一并取消。
+"""
+
+import asyncio
+from typing import Any, Coroutine, Optional, Set
+
+
+class TaskScope:
+    """类似 asyncio.TaskGroup 的任务作用域，但由外部（AIController）显式关闭。
+
+    - create_task：在作用域内派生任务（发言预取、并行投票、后台压缩等）；
+    - adopt：登记外部创建的任务（如自动游戏主循环）；
+    - cancel：关闭作用域并取消全部未完成任务，等待其退出；关闭后再派生任务会直接取消。
+    """
+
+    def __init__(self):
+        self._tasks: Set[asyncio.Task] = set()
+        self._closed = False
+        self.cancelled_count = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def create_task(self, coro: Coroutine[Any, Any, Any], name: Optional[str] = None) -> asyncio.Task:
+        """在作用域内创建任务；作用域已关闭时关闭协程并抛出 CancelledError。"""
+        if self._closed:
+            coro.close()
+            raise asyncio.CancelledError("任务作用域已关闭")
+        task = asyncio.create_task(coro, name=name)
+        self.adopt(task)
+        return task
+
+    def adopt(self, task: asyncio.Task) -> asyncio.Task:
+        """登记外部创建的任务，使其随作用域一起取消。"""
+        if self._closed:
+            task.cancel()
+            return task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def pending_count(self) -> int:
+        return sum(1 for task in self._tasks if not task.done())
+
+    async def cancel(self) -> int:
+        """关闭作用域，取消除当前任务外的所有未完成任务并等待退出，返回取消数量。"""
+        self._closed = True
+        current = asyncio.current_task()
+        tasks = [task for task in self._tasks if not task.done() and task is not current]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self.cancelled_count += len(tasks)
+        return len(tasks)
@@ -10,6 +10,8 @@ import os
 from ..core.game import AvalonGame
 from ..models.player import AIPlayer
 from ..ai.ai_controller import AIController
+from ..ai.ai_service import AIService, ai_service
+from ..ai.pacing import PacingClock
 from config import FRONTEND_CONFIG
 
 app = FastAPI(title="Avalon Alone API", version="1.0.0")
@@ -23,6 +25,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def warm_up_model_client():
+    """服务就绪后在后台线程预热模型客户端（导入提供商 SDK），不阻塞 /health 等请求；各局共享该客户端"""
+    asyncio.create_task(ai_service.ensure_model_client())
+
 # 全局游戏实例
 game_instance = None
 ai_controller = None
@@ -36,6 +43,8 @@ class PlayerConfig(BaseModel):
 
 class GameConfig(BaseModel):
     players: List[PlayerConfig]
+    # 节奏等待的缩放系数（1 = 实时，0 = 不等待），缺省使用 AVALON_PACING_TIME_SCALE
+    time_scale: Optional[float] = None
 
 # 挂载静态文件目录
 frontend_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "frontend")
@@ -70,6 +79,12 @@ async def start_game(config: GameConfig):
 
     if len(config.players) < 5 or len(config.players) > 10:
         raise HTTPException(status_code=400, detail="玩家数量必须在5-10人之间")
+    if config.time_scale is not None and config.time_scale < 0:
+        raise HTTPException(status_code=400, detail="time_scale 不能为负数")
+
+    # 旧对局的 AI 工作全部取消，避免继续为已不存在的对局消耗模型配额
+    if ai_controller:
+        await ai_controller.stop_auto_play()
 
     # 创建 AI 玩家列表
     players = [
@@ -80,7 +95,15 @@ async def start_game(config: GameConfig):
     game_instance = AvalonGame(players)
 
     # 创建AI控制器，传递WebSocket通知函数
-    ai_controller = AIController(game_instance, notify_all_connections)
+    clock = PacingClock(config.time_scale) if config.time_scale is not None else None
+    # 每局独立的 AIService（座位 prompt、统计），共享启动时预热的模型客户端
+    model_client = await ai_service.ensure_model_client()
+    ai_controller = AIController(
+        game_instance,
+        notify_all_connections,
+        ai_service=AIService(model_client=model_client),
+        clock=clock,
+    )
 
     # 开始游戏
     result = game_instance.start_game()
@@ -150,9 +173,9 @@ async def reset_game():
     """重置游戏"""
     global game_instance, ai_controller
 
-    # 停止AI控制器
+    # 停止AI控制器：取消主循环、进行中的 LLM 请求、预取/投票任务与后台压缩
     if ai_controller:
-        ai_controller.stop_auto_play()
+        await ai_controller.stop_auto_play()
         ai_controller = None
 
     game_instance = None
@@ -179,11 +202,22 @@ async def control_ai(action: str):
         asyncio.create_task(ai_controller.start_auto_play())
         return {"status": "ai_started"}
     elif action == "stop" and ai_controller:
-        ai_controller.stop_auto_play()
+        await ai_controller.stop_auto_play()
         return {"status": "ai_stopped"}
     else:
         raise HTTPException(status_code=400, detail="无效的AI控制操作")
 
+@app.post("/game/pacing")
+async def set_pacing(time_scale: float):
+    """实时调整当前对局的节奏缩放系数（1 = 实时，0 = 不等待）"""
+    if not ai_controller:
+        raise HTTPException(status_code=404, detail="游戏未开始")
+    if time_scale < 0:
+        raise HTTPException(status_code=400, detail="time_scale 不能为负数")
+
+    ai_controller.clock.set_time_scale(time_scale)
+    return ai_controller.clock.get_stats()
+
 # WebSocket连接管理
 async def notify_all_connections(event: str, data: Dict[str, Any]):
     """通知所有WebSocket连接"""
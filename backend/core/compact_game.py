@@ -0,0 +1,469 @@
+"""
+紧凑规则内核：供离线大批量模拟使用，与 AvalonGame 规则一致。
+
+- 座位用整数下标，队伍、投票用位掩码，玩家名 → 座位有索引；
+- 所有类使用 __slots__，任务/投票记录为元组；
+- 按座位的快速接口（*_seat / *_mask）只返回状态字符串；
+- 按玩家名的接口（select_team / vote_team / vote_mission / assassinate / get_game_state 等）
+  作为兼容层，返回与 AvalonGame 相同结构的字典。
+
+不包含战报、对话历史与 prompt 相关状态。
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .constants import (
+    EVIL_ROLES,
+    GAME_PHASES,
+    GAME_STATES,
+    MAX_ASSASSINATION_DISCUSSION_ROUNDS,
+    MISSION_CONFIGS,
+    ROLE_ASSIGNMENT,
+)
+
+_PHASE_TEAM_SELECTION = GAME_PHASES['team_selection']
+_PHASE_TEAM_VOTE = GAME_PHASES['team_vote']
+_PHASE_MISSION_VOTE = GAME_PHASES['mission_vote']
+_PHASE_ASSASSINATION = GAME_PHASES['assassination']
+
+
+def seats_of(mask: int) -> List[int]:
+    """位掩码 → 座位下标列表（升序）。"""
+    seats = []
+    seat = 0
+    while mask:
+        if mask & 1:
+            seats.append(seat)
+        mask >>= 1
+        seat += 1
+    return seats
+
+
+class CompactMissionResult:
+    """一次任务结果：队伍（提名顺序）与掩码、成败与票数（任务票按投票顺序记录座位与是否失败票）。"""
+
+    __slots__ = ('mission', 'team', 'team_mask', 'success', 'fail_count', 'success_count', 'votes')
+
+    def __init__(self, mission: int, team: Tuple[int, ...], team_mask: int, success: bool,
+                 fail_count: int, success_count: int, votes: Tuple[Tuple[int, bool], ...]):
+        self.mission = mission
+        self.team = team
+        self.team_mask = team_mask
+        self.success = success
+        self.fail_count = fail_count
+        self.success_count = success_count
+        self.votes = votes
+
+
+class CompactTeamVote:
+    """一次已完成的队伍投票（voters 为投票顺序，赞成座位见 approve_mask）。"""
+
+    __slots__ = ('mission', 'attempt', 'team', 'voters', 'approve_mask', 'approved')
+
+    def __init__(self, mission: int, attempt: int, team: Tuple[int, ...],
+                 voters: Tuple[int, ...], approve_mask: int, approved: bool):
+        self.mission = mission
+        self.attempt = attempt
+        self.team = team
+        self.voters = voters
+        self.approve_mask = approve_mask
+        self.approved = approved
+
+
+class CompactGame:
+    """紧凑版阿瓦隆规则内核（规则与 AvalonGame 一致）。"""
+
+    __slots__ = (
+        'names', 'seat_by_name', 'roles', 'evil_mask', 'n',
+        'mission_sizes', 'fails_needed',
+        'state', 'phase', 'current_round', 'current_mission', 'leader',
+        'team_mask', 'team_order', 'failed_team_votes', 'winner',
+        'team_vote_order', 'team_approve_mask',
+        'mission_vote_order', 'mission_fail_count',
+        'mission_results', 'team_vote_history', 'good_wins', 'evil_wins',
+        'assassination_discussion_round',
+    )
+
+    def __init__(self, player_names: Sequence[str], roles: Optional[Sequence[str]] = None):
+        self.n = len(player_names)
+        if self.n not in MISSION_CONFIGS:
+            raise ValueError(f"不支持的玩家数量: {self.n}")
+        self.names: Tuple[str, ...] = tuple(player_names)
+        self.seat_by_name: Dict[str, int] = {name: seat for seat, name in enumerate(self.names)}
+        config = MISSION_CONFIGS[self.n]
+        self.mission_sizes: Tuple[int, ...] = tuple(config['missions'])
+        self.fails_needed: Tuple[int, ...] = tuple(config['fails_needed'])
+
+        self.roles: Tuple[Optional[str], ...] = tuple(roles) if roles else (None,) * self.n
+        self.evil_mask = self._build_evil_mask()
+        self.state = GAME_STATES['waiting']
+        self.phase = GAME_PHASES['init']
+        self.current_round = 1
+        self.current_mission = 1
+        self.leader = 0
+        self.team_mask = 0
+        # 队伍成员按提名顺序（兼容层输出 current_team 时保持原顺序）
+        self.team_order: Tuple[int, ...] = ()
+        self.failed_team_votes = 0
+        self.winner: Optional[str] = None
+        self.team_vote_order: List[int] = []
+        self.team_approve_mask = 0
+        self.mission_vote_order: List[Tuple[int, bool]] = []
+        self.mission_fail_count = 0
+        self.mission_results: List[CompactMissionResult] = []
+        self.team_vote_history: List[CompactTeamVote] = []
+        self.good_wins = 0
+        self.evil_wins = 0
+        self.assassination_discussion_round = 0
+
+    def _build_evil_mask(self) -> int:
+        mask = 0
+        for seat, role in enumerate(self.roles):
+            if role in EVIL_ROLES:
+                mask |= 1 << seat
+        return mask
+
+    # ---- 按座位的快速接口 ----
+
+    def start(self, rng: Optional[random.Random] = None) -> None:
+        """开始游戏：未指定角色时按 ROLE_ASSIGNMENT 随机分配。"""
+        if self.roles[0] is None:
+            roles = list(ROLE_ASSIGNMENT[self.n])
+            (rng or random).shuffle(roles)
+            self.roles = tuple(roles)
+            self.evil_mask = self._build_evil_mask()
+        self.state = GAME_STATES['playing']
+        self.phase = _PHASE_TEAM_SELECTION
+        self.leader = 0
+
+    def team_size(self) -> int:
+        return self.mission_sizes[self.current_mission - 1]
+
+    def select_team_seats(self, seats: Sequence[int]) -> Optional[str]:
+        """选择队伍；返回错误信息或 None。"""
+        if self.phase != _PHASE_TEAM_SELECTION:
+            return '当前不是选择队伍阶段'
+        error = self._set_team(seats)
+        if error:
+            return error
+        self.phase = _PHASE_TEAM_VOTE
+        return None
+
+    def revise_team_seats(self, seats: Sequence[int]) -> Optional[str]:
+        if self.phase != _PHASE_TEAM_VOTE:
+            return '当前不是队伍投票阶段'
+        return self._set_team(seats)
+
+    def _set_team(self, seats: Sequence[int]) -> Optional[str]:
+        if len(seats) != self.team_size():
+            return f'需要选择 {self.team_size()} 名玩家'
+        mask = 0
+        for seat in seats:
+            if not 0 <= seat < self.n:
+                return '选择的玩家不存在'
+            mask |= 1 << seat
+        self.team_mask = mask
+        self.team_order = tuple(seats)
+        return None
+
+    def vote_team_seat(self, seat: int, approve: bool) -> str:
+        """队伍投票；返回状态：vote_recorded / team_approved / team_rejected / evil_win / error。"""
+        if self.phase != _PHASE_TEAM_VOTE:
+            return 'error'
+        bit = 1 << seat
+        self.team_vote_order.append(seat)
+        if approve:
+            self.team_approve_mask |= bit
+        if len(self.team_vote_order) < self.n:
+            return 'vote_recorded'
+
+        approve_count = bin(self.team_approve_mask).count('1')
+        approved = approve_count > self.n / 2
+        attempt = 1
+        for record in self.team_vote_history:
+            if record.mission == self.current_mission:
+                attempt += 1
+        self.team_vote_history.append(CompactTeamVote(
+            self.current_mission, attempt, self.team_order,
+            tuple(self.team_vote_order), self.team_approve_mask, approved,
+        ))
+        if approved:
+            self.phase = _PHASE_MISSION_VOTE
+            return 'team_approved'
+
+        self.failed_team_votes += 1
+        self.leader = (self.leader + 1) % self.n
+        if self.failed_team_votes >= 5:
+            self.end_game('evil')
+            return 'evil_win'
+        self._reset_team_votes()
+        self.phase = _PHASE_TEAM_SELECTION
+        return 'team_rejected'
+
+    def vote_mission_seat(self, seat: int, fail: bool) -> str:
+        """任务投票；返回状态：vote_recorded / mission_completed / good_mission_win / evil_win / error。"""
+        if self.phase != _PHASE_MISSION_VOTE or not self.team_mask >> seat & 1:
+            return 'error'
+        self.mission_vote_order.append((seat, fail))
+        if fail:
+            self.mission_fail_count += 1
+        if len(self.mission_vote_order) < len(self.team_order):
+            return 'vote_recorded'
+
+        fail_count = self.mission_fail_count
+        success_count = len(self.mission_vote_order) - fail_count
+        success = fail_count < self.fails_needed[self.current_mission - 1]
+        self.mission_results.append(CompactMissionResult(
+            self.current_mission, self.team_order, self.team_mask, success, fail_count, success_count,
+            tuple(self.mission_vote_order),
+        ))
+        if success:
+            self.good_wins += 1
+        else:
+            self.evil_wins += 1
+
+        if self.good_wins >= 3:
+            self.phase = _PHASE_ASSASSINATION
+            return 'good_mission_win'
+        if self.evil_wins >= 3:
+            self.end_game('evil')
+            return 'evil_win'
+        self.next_round()
+        return 'mission_completed'
+
+    def assassinate_seat(self, seat: int) -> str:
+        """刺杀；返回 evil_win / good_win / error。"""
+        if self.phase != _PHASE_ASSASSINATION or not 0 <= seat < self.n:
+            return 'error'
+        if self.roles[seat] == 'merlin':
+            self.end_game('evil')
+            return 'evil_win'
+        self.end_game('good')
+        return 'good_win'
+
+    def _reset_team_votes(self) -> None:
+        self.team_vote_order = []
+        self.team_approve_mask = 0
+
+    def next_round(self) -> None:
+        self.current_round += 1
+        self.current_mission += 1
+        self.leader = (self.leader + 1) % self.n
+        self.team_mask = 0
+        self.team_order = ()
+        self._reset_team_votes()
+        self.mission_vote_order = []
+        self.mission_fail_count = 0
+        self.failed_team_votes = 0
+        self.phase = _PHASE_TEAM_SELECTION
+
+    def end_game(self, winner: str) -> None:
+        self.state = GAME_STATES['finished']
+        self.phase = GAME_PHASES['game_end']
+        self.winner = winner
+
+    def seat_of(self, name: str) -> Optional[int]:
+        return self.seat_by_name.get(name)
+
+    # ---- 兼容层：与 AvalonGame 相同的按玩家名接口与字典输出 ----
+
+    def _team_names(self) -> List[str]:
+        return [self.names[seat] for seat in self.team_order]
+
+    def _team_vote_dicts(self) -> List[Dict[str, str]]:
+        approve = self.team_approve_mask
+        return [
+            {'player': self.names[seat], 'vote': 'approve' if approve >> seat & 1 else 'reject'}
+            for seat in self.team_vote_order
+        ]
+
+    def start_game(self, rng: Optional[random.Random] = None) -> Dict[str, Any]:
+        self.start(rng)
+        return {
+            'status': 'started',
+            'role_assignments': dict(zip(self.names, self.roles)),
+            'current_leader': self.names[self.leader],
+        }
+
+    def select_team(self, selected_players: List[str]) -> Dict[str, Any]:
+        if self.phase != _PHASE_TEAM_SELECTION:
+            return {'error': '当前不是选择队伍阶段'}
+        seats = [self.seat_by_name.get(name, -1) for name in selected_players]
+        error = self.select_team_seats(seats)
+        if error:
+            return {'error': error}
+        return {'status': 'team_selected', 'team': self._team_names(), 'next_phase': 'team_vote'}
+
+    def revise_team(self, selected_players: List[str]) -> Dict[str, Any]:
+        seats = [self.seat_by_name.get(name, -1) for name in selected_players]
+        error = self.revise_team_seats(seats)
+        if error:
+            return {'error': error}
+        return {'status': 'team_selected', 'team': self._team_names(), 'next_phase': 'team_vote'}
+
+    def vote_team(self, player_name: str, vote: str) -> Dict[str, Any]:
+        if self.phase != _PHASE_TEAM_VOTE:
+            return {'error': '当前不是队伍投票阶段'}
+        if vote not in ('approve', 'reject'):
+            return {'error': '投票必须是 approve 或 reject'}
+        seat = self.seat_by_name.get(player_name)
+        if seat is None:
+            return {'error': '玩家不存在'}
+
+        status = self.vote_team_seat(seat, vote == 'approve')
+        if status == 'vote_recorded':
+            voted = len(self.team_vote_order)
+            return {
+                'status': 'vote_recorded',
+                'voted_count': voted,
+                'total_players': self.n,
+                'remaining_votes': self.n - voted,
+            }
+
+        record = self.team_vote_history[-1]
+        votes = [
+            {'player': self.names[s], 'vote': 'approve' if record.approve_mask >> s & 1 else 'reject'}
+            for s in record.voters
+        ]
+        approve_count = bin(record.approve_mask).count('1')
+        reject_count = len(votes) - approve_count
+        if status == 'team_approved':
+            return {
+                'status': 'team_approved',
+                'approve_count': approve_count,
+                'reject_count': reject_count,
+                'votes': votes,
+                'next_phase': 'mission_vote',
+                'team': self._team_names(),
+                'mission_number': self.current_mission,
+            }
+        if status == 'evil_win':
+            return {
+                'status': 'evil_win',
+                'reason': '队伍被拒绝5次',
+                'approve_count': approve_count,
+                'reject_count': reject_count,
+                'votes': votes,
+            }
+        return {
+            'status': 'team_rejected',
+            'approve_count': approve_count,
+            'reject_count': reject_count,
+            'votes': votes,
+            'failed_votes': self.failed_team_votes,
+            'next_leader': self.names[self.leader],
+            'next_phase': 'team_selection',
+        }
+
+    def vote_mission(self, player_name: str, vote: str) -> Dict[str, Any]:
+        if self.phase != _PHASE_MISSION_VOTE:
+            return {'error': '当前不是任务投票阶段'}
+        if vote not in ('success', 'fail'):
+            return {'error': '投票必须是 success 或 fail'}
+        seat = self.seat_by_name.get(player_name)
+        if seat is None or not self.team_mask >> seat & 1:
+            return {'error': '只有队伍中的玩家才能投票'}
+
+        completed_mission = self.current_mission
+        status = self.vote_mission_seat(seat, vote == 'fail')
+        if status == 'vote_recorded':
+            return {
+                'status': 'vote_recorded',
+                'remaining_votes': len(self.team_order) - len(self.mission_vote_order),
+            }
+
+        result = self.mission_results[-1]
+        payload = {
+            'status': status,
+            'mission_number': completed_mission,
+            'mission_result': result.success,
+            'success_count': result.success_count,
+            'fail_count': result.fail_count,
+            'good_wins': self.good_wins,
+            'evil_wins': self.evil_wins,
+        }
+        if status == 'good_mission_win':
+            payload['next_phase'] = 'assassination'
+        elif status == 'evil_win':
+            payload['reason'] = '坏人获得3次任务成功'
+        else:
+            payload['next_round'] = self.current_round
+            payload['next_mission'] = self.current_mission
+        return payload
+
+    def assassinate(self, target_name: str) -> Dict[str, Any]:
+        if self.phase != _PHASE_ASSASSINATION:
+            return {'error': '当前不是刺杀阶段'}
+        seat = self.seat_by_name.get(target_name)
+        if seat is None:
+            return {'error': '目标玩家不存在'}
+        if self.assassinate_seat(seat) == 'evil_win':
+            return {'status': 'evil_win', 'target': target_name, 'reason': '刺客成功刺杀梅林'}
+        return {'status': 'good_win', 'target': target_name, 'reason': '刺客刺杀失败，好人获胜'}
+
+    def get_mission_config(self) -> Dict[str, Any]:
+        if self.current_mission <= len(self.mission_sizes):
+            return {
+                'mission_number': self.current_mission,
+                'team_size': self.mission_sizes[self.current_mission - 1],
+                'fails_needed': self.fails_needed[self.current_mission - 1],
+            }
+        return {}
+
+    def get_available_players(self) -> List[str]:
+        return list(self.names)
+
+    def get_mission_players(self) -> List[str]:
+        return self._team_names()
+
+    def get_game_state(self) -> Dict[str, Any]:
+        """与 AvalonGame.get_game_state 相同结构（不含对话历史与轮次摘要内容）。"""
+        names = self.names
+        mission_results = []
+        for r in self.mission_results:
+            mission_results.append({
+                'mission': r.mission,
+                'team': [names[s] for s in r.team],
+                'votes': [
+                    {'player': names[s], 'vote': 'fail' if failed else 'success'} for s, failed in r.votes
+                ],
+                'success': r.success,
+                'fail_count': r.fail_count,
+                'success_count': r.success_count,
+            })
+        team_vote_history = [
+            {
+                'mission': r.mission,
+                'attempt': r.attempt,
+                'team': [names[s] for s in r.team],
+                'approve': [names[s] for s in r.voters if r.approve_mask >> s & 1],
+                'reject': [names[s] for s in r.voters if not r.approve_mask >> s & 1],
+                'approved': r.approved,
+            }
+            for r in self.team_vote_history
+        ]
+        return {
+            'state': self.state,
+            'phase': self.phase,
+            'current_round': self.current_round,
+            'current_mission': self.current_mission,
+            'mission_results': mission_results,
+            'current_leader': names[self.leader] if names else None,
+            'current_team': self._team_names(),
+            'team_votes': self._team_vote_dicts(),
+            'team_vote_history': team_vote_history,
+            'mission_votes': [
+                {'player': names[s], 'vote': 'fail' if failed else 'success'}
+                for s, failed in self.mission_vote_order
+            ],
+            'failed_team_votes': self.failed_team_votes,
+            'players': [{'name': name, 'role': role, 'is_ai': True} for name, role in zip(names, self.roles)],
+            'winner': self.winner,
+            'messages_history': [],
+            'round_discussion_summaries': {},
+            'assassination_discussion_round': self.assassination_discussion_round,
+            'max_assassination_discussion_rounds': MAX_ASSASSINATION_DISCUSSION_ROUNDS,
+        }
@@ -5,12 +5,28 @@ from .constants import (
     EVIL_ROLES, MAX_ASSASSINATION_DISCUSSION_ROUNDS,
 )
 from ..models.player import Player
+from .message_index import MessageIndex
+from .quote_index import QuoteIndex
+from .prompt_context import PromptContextCache
+from .snapshot import FrozenDict, FrozenList, FrozenLog, FrozenMessageIndex, GameSnapshot, freeze
 from .roles import ROLES, assign_roles
 
+try:
+    from .role_beliefs import RoleBeliefEngine
+except ImportError:  # 未安装 numpy 时不维护角色后验
+    RoleBeliefEngine = None
+
+
+def _freeze_mission_result(result: Dict[str, Any]) -> FrozenDict:
+    """任务结果的只读副本（不含各队员的秘密任务票）。"""
+    return freeze({k: v for k, v in result.items() if k != 'votes'})
+
 
 class AvalonGame:
     def __init__(self, players: List[Player]):
         self.players = players
+        # 玩家名 -> 座位下标（玩家列表开局后不变）
+        self.seat_by_name: Dict[str, int] = {p.name: i for i, p in enumerate(players)}
         self.current_round = 1
         self.current_mission = 1
         self.mission_results = []
@@ -24,10 +40,32 @@ class AvalonGame:
         self.failed_team_votes = 0
         self.game_history = []
         self.messages_history = []
+        # messages_history 的增量索引（按轮次/阶段），供组装 prompt 对话历史
+        self.message_index = MessageIndex()
+        # 历史发言按句的检索索引，供 prompt 引用相关原话
+        self.quote_index = QuoteIndex()
         self.chat_log: List[Dict[str, Any]] = []
         self._chat_log_id = 0
         self.round_discussion_summaries: Dict[int, str] = {}
+        # 各轮摘要来源：extractive（本地抽取式）或 llm
+        self.round_discussion_summary_sources: Dict[int, str] = {}
+        # 多级细节历史：上一轮的各玩家立场压缩，以及更早轮次合并的整局滚动摘要
+        self.condensed_rounds: Dict[int, List[str]] = {}
+        self.rolling_summary = ''
+        self.rolling_summary_through = 0
         self.assassination_discussion_round = 0
+        # 状态版本号：任何影响 prompt 的变更都会递增，用于按版本缓存各座位共享的 prompt 片段
+        self.version = 0
+        self.prompt_cache = PromptContextCache()
+        # 按版本缓存的只读快照；只增的记录各冻结一次，供各版本快照共享
+        self._snapshot: Optional[GameSnapshot] = None
+        self._frozen_players: Optional[FrozenList] = None
+        self._frozen_mission_results = FrozenLog(_freeze_mission_result)
+        self._frozen_team_vote_history = FrozenLog()
+        # 已写入 AI 座位私有记忆的任务轮次（按写入顺序，每轮每个 AI 座位一条）
+        self.player_memory_missions: List[int] = []
+        # 基于公开任务结果与投票记录的角色后验（开局后创建）
+        self.role_beliefs = None
 
         # 根据玩家数量设置任务配置
         player_count = len(players)
@@ -44,11 +82,15 @@ class AvalonGame:
         self.state = GAME_STATES['playing']
         self.phase = GAME_PHASES['role_assignment']
         role_assignments = assign_roles(self.players)
+        self._frozen_players = None
+        if RoleBeliefEngine is not None:
+            self.role_beliefs = RoleBeliefEngine.from_players(self.players)
 
         self.phase = GAME_PHASES['team_selection']
         self.current_leader_index = 0
 
         self.append_chat_log('系统', '游戏开始！角色已分配完成', 'system')
+        self._bump_version()
 
         return {
             'status': 'started',
@@ -62,17 +104,17 @@ class AvalonGame:
             return {'error': '当前不是选择队伍阶段'}
 
         # 验证选择的玩家
-        available_players = [p.name for p in self.players]
         mission_size = self.mission_config['missions'][self.current_mission - 1]
 
         if len(selected_players) != mission_size:
             return {'error': f'需要选择 {mission_size} 名玩家'}
 
-        if not all(player in available_players for player in selected_players):
+        if not all(player in self.seat_by_name for player in selected_players):
             return {'error': '选择的玩家不存在'}
 
         self.current_team = selected_players
         self.phase = GAME_PHASES['team_vote']
+        self._bump_version()
 
         return {
             'status': 'team_selected',
@@ -85,16 +127,16 @@ class AvalonGame:
         if self.phase != GAME_PHASES['team_vote']:
             return {'error': '当前不是队伍投票阶段'}
 
-        available_players = [p.name for p in self.players]
         mission_size = self.mission_config['missions'][self.current_mission - 1]
 
         if len(selected_players) != mission_size:
             return {'error': f'需要选择 {mission_size} 名玩家'}
 
-        if not all(player in available_players for player in selected_players):
+        if not all(player in self.seat_by_name for player in selected_players):
             return {'error': '选择的玩家不存在'}
 
         self.current_team = selected_players
+        self._bump_version()
 
         return {
             'status': 'team_selected',
@@ -116,6 +158,8 @@ class AvalonGame:
             'reject': reject,
             'approved': approved,
         })
+        if self.role_beliefs is not None:
+            self.role_beliefs.observe_team_vote(self.current_team, approve)
 
     def vote_team(self, player_name: str, vote: str) -> Dict[str, Any]:
         """队伍投票"""
@@ -130,6 +174,7 @@ class AvalonGame:
             'player': player_name,
             'vote': vote
         })
+        self._bump_version()
 
         # 检查是否所有玩家都投票了
         if len(self.team_votes) == len(self.players):
@@ -204,6 +249,7 @@ class AvalonGame:
             'player': player_name,
             'vote': vote
         })
+        self._bump_version()
 
         # 检查是否所有队伍成员都投票了
         if len(self.mission_votes) == len(self.current_team):
@@ -222,9 +268,11 @@ class AvalonGame:
                 'fail_count': fail_count,
                 'success_count': success_count
             })
+            if self.role_beliefs is not None:
+                self.role_beliefs.observe_mission(self.current_team, fail_count)
 
             # 将任务结果记录到消息历史，供AI玩家参考
-            self.messages_history.append({
+            self._append_message({
                 'player': 'system',
                 'content': f"第{self.current_mission}轮任务{'成功' if mission_success else '失败'}（{success_count}票成功，{fail_count}票失败）",
                 'phase': self.phase,
@@ -303,13 +351,71 @@ class AvalonGame:
 
     def record_message(self, player_name: str, content: str):
         """记录玩家发言（供 AI 上下文使用，与战报 chat_log 分离）"""
-        self.messages_history.append({
+        self._append_message({
             'player': player_name,
             'content': content,
             'phase': self.phase,
             'mission': self.current_mission,
+            # 同一任务的第几次组队，以及发言时的队伍（队长讨论后改队，发言不再对应新队伍）
+            'attempt': self.failed_team_votes + 1,
+            'team': list(self.current_team),
         })
 
+    def _append_message(self, msg: Dict[str, Any]) -> None:
+        """追加到 messages_history 并同步更新增量索引。"""
+        self.messages_history.append(msg)
+        mission = self.message_index.add(msg)
+        self.quote_index.add(msg, mission)
+        self._bump_version()
+
+    def _bump_version(self) -> None:
+        """游戏状态变更后递增版本号，使按版本缓存的 prompt 片段失效。"""
+        self.version += 1
+
+    def set_round_discussion_summary(self, mission_number: int, summary: str, source: str) -> None:
+        """写入某轮讨论摘要并记录来源（LLM 摘要可替换本地抽取式摘要）。"""
+        self.round_discussion_summaries[mission_number] = summary
+        self.round_discussion_summary_sources[mission_number] = source
+        self._bump_version()
+
+    def set_condensed_round(self, mission_number: int, lines: List[str]) -> None:
+        """写入某轮各玩家立场压缩（该轮成为“上一轮”时代替完整发言）。"""
+        self.condensed_rounds[mission_number] = list(lines)
+        self._bump_version()
+
+    def set_rolling_summary(self, summary: str, through_mission: int) -> None:
+        """更新整局滚动摘要及其覆盖到的轮次。"""
+        self.rolling_summary = summary
+        self.rolling_summary_through = through_mission
+        self._bump_version()
+
+    def record_player_memories(self, mission_number: int, notes: Dict[str, str]) -> None:
+        """把一轮的私有记忆写入各 AI 座位的 knowledge_base（一轮一批）。"""
+        if mission_number in self.player_memory_missions:
+            return
+        for player in self.players:
+            note = notes.get(player.name)
+            if note and hasattr(player, 'add_knowledge'):
+                player.add_knowledge(note)
+        self.player_memory_missions.append(mission_number)
+        self._bump_version()
+
+    def _frozen_player_memories(self) -> FrozenDict:
+        """各座位记忆与轮次对应：knowledge_base 保留的是最近写入的若干轮。"""
+        memories = {}
+        for player in self.players:
+            knowledge = getattr(player, 'knowledge_base', None)
+            if not knowledge or not self.player_memory_missions:
+                continue
+            missions = self.player_memory_missions[-len(knowledge):]
+            memories[player.name] = FrozenList(zip(missions, knowledge[-len(missions):]))
+        return FrozenDict(memories)
+
+    def set_assassination_discussion_round(self, round_num: int) -> None:
+        """设置刺杀阶段坏人阵营当前讨论轮次。"""
+        self.assassination_discussion_round = round_num
+        self._bump_version()
+
     def append_chat_log(
         self,
         sender: str,
@@ -343,16 +449,28 @@ class AvalonGame:
 
     def get_player_chat_meta(self, player_name: str) -> Dict[str, Any]:
         """根据玩家名解析战报展示用元数据（序号、身份等）"""
-        for index, player in enumerate(self.players):
-            if player.name == player_name:
-                role_info = ROLES.get(player.role or '', {})
-                return {
-                    'seat': index + 1,
-                    'role': player.role,
-                    'role_name': role_info.get('name'),
-                    'is_ai': player.is_ai,
-                }
-        return {}
+        index = self.seat_by_name.get(player_name)
+        if index is None:
+            return {}
+        player = self.players[index]
+        role_info = ROLES.get(player.role or '', {})
+        return {
+            'seat': index + 1,
+            'role': player.role,
+            'role_name': role_info.get('name'),
+            'is_ai': player.is_ai,
+        }
+
+    def get_player(self, player_name: str) -> Optional[Player]:
+        """按玩家名取玩家，不存在时返回 None。"""
+        index = self.seat_by_name.get(player_name)
+        return self.players[index] if index is not None else None
+
+    def get_role_beliefs(self, viewer: Optional[str] = None) -> Dict[str, float]:
+        """各座位是坏人的后验概率；viewer 给定时叠加该座位的视野。未开局或未安装 numpy 时为空。"""
+        if self.role_beliefs is None:
+            return {}
+        return self.role_beliefs.evil_probabilities(viewer)
 
     def get_chat_log(self) -> List[Dict[str, Any]]:
         """返回完整战报历史"""
@@ -363,13 +481,7 @@ class AvalonGame:
         if self.phase != GAME_PHASES['assassination']:
             return {'error': '当前不是刺杀阶段'}
 
-        # 找到目标玩家
-        target_player = None
-        for player in self.players:
-            if player.name == target_name:
-                target_player = player
-                break
-
+        target_player = self.get_player(target_name)
         if not target_player:
             return {'error': '目标玩家不存在'}
 
@@ -401,12 +513,14 @@ class AvalonGame:
         self.mission_votes = []
         self.failed_team_votes = 0
         self.phase = GAME_PHASES['team_selection']
+        self._bump_version()
 
     def end_game(self, winner: str):
         """结束游戏"""
         self.state = GAME_STATES['finished']
         self.phase = GAME_PHASES['game_end']
         self.winner = winner
+        self._bump_version()
 
     def get_game_state(self) -> Dict[str, Any]:
         """返回当前游戏状态信息"""
@@ -430,6 +544,48 @@ class AvalonGame:
             'max_assassination_discussion_rounds': MAX_ASSASSINATION_DISCUSSION_ROUNDS,
         }
 
+    def snapshot(self) -> GameSnapshot:
+        """当前状态版本的只读快照；版本不变时返回同一对象，供同一阶段的并行决策共享。"""
+        if self._snapshot is not None and self._snapshot.version == self.version:
+            return self._snapshot
+
+        if self._frozen_players is None:
+            self._frozen_players = freeze(
+                [{'name': p.name, 'role': p.role, 'is_ai': p.is_ai} for p in self.players]
+            )
+
+        fields = FrozenDict({
+            'phase': self.phase,
+            'current_round': self.current_round,
+            'current_mission': self.current_mission,
+            'mission_results': self._frozen_mission_results.view(self.mission_results),
+            'current_leader': self.players[self.current_leader_index].name if self.players else None,
+            'current_team': FrozenList(self.current_team),
+            'team_votes': freeze(self.team_votes),
+            'team_vote_history': self._frozen_team_vote_history.view(self.team_vote_history),
+            'failed_team_votes': self.failed_team_votes,
+            'players': self._frozen_players,
+            'round_discussion_summaries': FrozenDict(self.round_discussion_summaries),
+            'condensed_rounds': freeze(self.condensed_rounds),
+            'rolling_summary': self.rolling_summary,
+            'rolling_summary_through': self.rolling_summary_through,
+            'assassination_discussion_round': self.assassination_discussion_round,
+            'max_assassination_discussion_rounds': MAX_ASSASSINATION_DISCUSSION_ROUNDS,
+        })
+        self._snapshot = GameSnapshot(
+            self.version,
+            fields,
+            FrozenMessageIndex(self.message_index),
+            self.prompt_cache,
+            self._frozen_player_memories(),
+            self.quote_index.view(),
+        )
+        return self._snapshot
+
+    def get_prompt_context(self, **extra: Any) -> Dict[str, Any]:
+        """供 AI prompt 使用的精简上下文：当前版本快照的投影 + 仅进程内使用的运行时字段（以下划线开头，不写入日志）。"""
+        return self.snapshot().project(**extra)
+
     def get_mission_config(self) -> Dict[str, Any]:
         """获取当前任务配置"""
         if self.current_mission <= len(self.mission_config['missions']):
@@ -0,0 +1,243 @@
+"""
+发言意图识别：编译好的多模式匹配器（Aho-Corasick 自动机），一次扫描找出全部关键词，
+再按子句做否定、疑问、条件与转折处理，判断发言者对当前队伍的明确投票意图。
+
+- 重叠匹配取最长者（“不赞成”覆盖“赞成”）；
+- 立场词前两字以内出现否定词则翻转（“不太赞成”→反对，“不会反对”→赞成）；
+- 子句级否定（“不认为/不应该/不能让/没有理由”）翻转其后同一子句内的全部立场词（“我没有理由反对”→赞成）；
+- 普通否定词与其后的立场词相隔超过两字时无法判断作用范围，整段发言判为模糊；
+- 疑问句（“赞成吗？”“要不要否决”）与条件句（“如果…就反对”）不计入；
+- 表态对象是他人观点时（“不同意2号的说法”）不计入；
+- 转折词（但是/不过/可是）之后的表态与最后一句权重更高；
+- 两个方向都有明显得分时判为模糊，交给 LLM。
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+APPROVE = 'approve'
+REJECT = 'reject'
+NEGATION = 'negation'
+CLAUSE_NEGATION = 'clause_negation'
+QUESTION = 'question'
+CONDITION = 'condition'
+CONTRAST = 'contrast'
+OPINION = 'opinion'
+
+
+class AhoCorasick:
+    """字符级 Aho-Corasick 自动机：一次扫描返回全部 (起点, 终点, 模式值)。"""
+
+    def __init__(self, patterns: Iterable[Tuple[str, object]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, object]]] = [[]]
+        for pattern, value in patterns:
+            self._add(pattern, value)
+        self._build()
+
+    def _add(self, pattern: str, value: object) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = nxt
+        self._output[state].append((len(pattern), value))
+
+    def _build(self) -> None:
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def find_all(self, text: str) -> List[Tuple[int, int, object]]:
+        matches = []
+        state = 0
+        goto, fail, output = self._goto, self._fail, self._output
+        for end, ch in enumerate(text, start=1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, value in output[state]:
+                matches.append((end - length, end, value))
+        return matches
+
+
+def _longest_non_overlapping(matches: List[Tuple[int, int, object]]) -> List[Tuple[int, int, object]]:
+    """重叠的匹配只保留最长（同长取先出现）的一个。"""
+    ordered = sorted(matches, key=lambda m: (m[0], -(m[1] - m[0])))
+    kept: List[Tuple[int, int, object]] = []
+    for match in ordered:
+        if kept and match[0] < kept[-1][1]:
+            if match[1] - match[0] > kept[-1][1] - kept[-1][0]:
+                kept[-1] = match
+            continue
+        kept.append(match)
+    return kept
+
+
+# 模式 -> (类别, 权重)。明确的投票表态权重更高
+_TEAM_VOTE_PATTERNS: Dict[str, Tuple[str, float]] = {
+    # 赞成
+    '赞成': (APPROVE, 1.0), '赞同': (APPROVE, 1.0), '支持': (APPROVE, 0.8), '同意': (APPROVE, 1.0),
+    '通过': (APPROVE, 0.6), '没问题': (APPROVE, 0.6), '可以发车': (APPROVE, 1.5), '同意发车': (APPROVE, 2.0),
+    '发车': (APPROVE, 0.8), '投赞成': (APPROVE, 2.0), '投同意': (APPROVE, 2.0), '投支持': (APPROVE, 2.0),
+    '放行': (APPROVE, 1.0), '让这车过': (APPROVE, 1.5), 'approve': (APPROVE, 2.0),
+    # 反对（含常见否定组合，整体匹配优先于其中的赞成词）
+    '不能让这车过': (REJECT, 1.5), '别让这车过': (REJECT, 1.5),
+    '反对': (REJECT, 1.0), '否决': (REJECT, 1.0), '否掉': (REJECT, 1.5), '打回': (REJECT, 1.0),
+    '投反对': (REJECT, 2.0), '不赞成': (REJECT, 1.5), '不赞同': (REJECT, 1.5), '不支持': (REJECT, 1.2),
+    '不同意': (REJECT, 1.5), '不通过': (REJECT, 1.0), '不能发车': (REJECT, 1.5), '不发车': (REJECT, 1.5),
+    '别发车': (REJECT, 1.5), '拒绝': (REJECT, 1.0), '有问题': (REJECT, 0.4), 'reject': (REJECT, 2.0),
+    # 对否决的否定（双重否定，整体匹配优先于其中的反对词）
+    '不支持否决': (APPROVE, 1.5), '不同意否决': (APPROVE, 1.5), '不赞成否决': (APPROVE, 1.5),
+    '不赞同否决': (APPROVE, 1.5),
+    # 否定词（作用于其后两字以内的立场词）
+    '不': (NEGATION, 0.0), '没': (NEGATION, 0.0), '别': (NEGATION, 0.0), '不会': (NEGATION, 0.0),
+    '不能': (NEGATION, 0.0), '不想': (NEGATION, 0.0), '不打算': (NEGATION, 0.0), '不太': (NEGATION, 0.0),
+    '不要': (NEGATION, 0.0), '并不': (NEGATION, 0.0), '无法': (NEGATION, 0.0), 'not': (NEGATION, 0.0),
+    "don't": (NEGATION, 0.0),
+    # 子句级否定（作用于其后同一子句内的全部立场词，不限距离）
+    '不认为': (CLAUSE_NEGATION, 0.0), '不觉得': (CLAUSE_NEGATION, 0.0), '并不认为': (CLAUSE_NEGATION, 0.0),
+    '不应该': (CLAUSE_NEGATION, 0.0), '不应': (CLAUSE_NEGATION, 0.0), '不该': (CLAUSE_NEGATION, 0.0),
+    '不能让': (CLAUSE_NEGATION, 0.0), '不会让': (CLAUSE_NEGATION, 0.0), '别让': (CLAUSE_NEGATION, 0.0),
+    '不要让': (CLAUSE_NEGATION, 0.0), '没必要': (CLAUSE_NEGATION, 0.0), '不需要': (CLAUSE_NEGATION, 0.0),
+    '没有理由': (CLAUSE_NEGATION, 0.0), '没理由': (CLAUSE_NEGATION, 0.0), '没什么好': (CLAUSE_NEGATION, 0.0),
+    '没什么可': (CLAUSE_NEGATION, 0.0), '没看出': (CLAUSE_NEGATION, 0.0), '看不出': (CLAUSE_NEGATION, 0.0),
+    "don't think": (CLAUSE_NEGATION, 0.0), 'should not': (CLAUSE_NEGATION, 0.0),
+    "shouldn't": (CLAUSE_NEGATION, 0.0),
+    # 疑问、条件、转折
+    '吗': (QUESTION, 0.0), '要不要': (QUESTION, 0.0), '是否': (QUESTION, 0.0), '会不会': (QUESTION, 0.0),
+    '？': (QUESTION, 0.0), '?': (QUESTION, 0.0),
+    '如果': (CONDITION, 0.0), '假如': (CONDITION, 0.0), '要是': (CONDITION, 0.0), '万一': (CONDITION, 0.0),
+    '除非': (CONDITION, 0.0),
+    '但是': (CONTRAST, 0.0), '不过': (CONTRAST, 0.0), '可是': (CONTRAST, 0.0), '然而': (CONTRAST, 0.0),
+    '但': (CONTRAST, 0.0),
+    # 表态对象是他人的观点而非队伍（“同意3号的看法”）
+    '看法': (OPINION, 0.0), '说法': (OPINION, 0.0), '观点': (OPINION, 0.0), '意见': (OPINION, 0.0),
+    '分析': (OPINION, 0.0), '判断': (OPINION, 0.0), '推理': (OPINION, 0.0),
+}
+
+_CLAUSE_SPLIT = re.compile(r'[。！!；;，,、\n]+')
+# 否定词与立场词之间允许的最大间隔（字）
+_NEGATION_WINDOW = 2
+# 判为明确意图所需的最低得分与占比
+_MIN_SCORE = 0.8
+_MIN_MARGIN = 0.75
+
+
+@dataclass(frozen=True)
+class IntentResult:
+    intent: Optional[str]
+    approve_score: float
+    reject_score: float
+
+    @property
+    def confidence(self) -> float:
+        total = self.approve_score + self.reject_score
+        return abs(self.approve_score - self.reject_score) / total if total else 0.0
+
+
+class IntentMatcher:
+    """按子句累计立场得分，判断明确的赞成/反对意图。"""
+
+    def __init__(self, patterns: Dict[str, Tuple[str, float]]):
+        self._automaton = AhoCorasick((p.lower(), v) for p, v in patterns.items())
+
+    def _clauses(self, text: str) -> List[str]:
+        # 问号保留在子句内以识别疑问
+        parts = re.split(r'(?<=[？?])', text)
+        clauses: List[str] = []
+        for part in parts:
+            clauses.extend(c for c in _CLAUSE_SPLIT.split(part) if c.strip())
+        return clauses
+
+    def _score_clause(self, clause: str) -> Tuple[float, float, bool, bool]:
+        """返回 (赞成分, 反对分, 是否含转折, 是否模糊)；疑问/条件子句不计分。
+
+        否定词之后隔了两字以上才出现立场词时，无法判断否定的作用范围，子句判为模糊。
+        """
+        matches = _longest_non_overlapping(self._automaton.find_all(clause.lower()))
+        kinds = {value[0] for _, _, value in matches}
+        contrast = CONTRAST in kinds
+        if QUESTION in kinds or CONDITION in kinds:
+            return 0.0, 0.0, contrast, False
+
+        if OPINION in kinds:
+            # 只保留观点词之后的立场词（之前的是在评价他人观点）
+            opinion_end = max(end for _, end, value in matches if value[0] == OPINION)
+            matches = [m for m in matches if m[0] >= opinion_end or m[2][0] not in (APPROVE, REJECT)]
+
+        approve = reject = 0.0
+        negation_end = -1
+        clause_negated = False
+        for start, end, (kind, weight) in matches:
+            if kind == NEGATION:
+                negation_end = end
+                continue
+            if kind == CLAUSE_NEGATION:
+                clause_negated = not clause_negated
+                continue
+            if kind not in (APPROVE, REJECT):
+                continue
+            flip = clause_negated
+            if negation_end >= 0:
+                if start - negation_end > _NEGATION_WINDOW:
+                    return 0.0, 0.0, contrast, True
+                flip = not flip
+                negation_end = -1
+            if flip:
+                kind = REJECT if kind == APPROVE else APPROVE
+            if kind == APPROVE:
+                approve += weight
+            else:
+                reject += weight
+        return approve, reject, contrast, False
+
+    def classify(self, text: str) -> IntentResult:
+        clauses = self._clauses(text or '')
+        approve = reject = 0.0
+        boost = 1.0
+        for i, clause in enumerate(clauses):
+            a, r, contrast, ambiguous = self._score_clause(clause)
+            if ambiguous:
+                return IntentResult(None, approve, reject)
+            if contrast and (a or r):
+                # 转折后的表态覆盖此前的说法
+                approve *= 0.5
+                reject *= 0.5
+                boost = 1.5
+            weight = boost * (1.5 if i == len(clauses) - 1 else 1.0)
+            approve += a * weight
+            reject += r * weight
+
+        intent = None
+        total = approve + reject
+        if total >= _MIN_SCORE:
+            if approve / total >= _MIN_MARGIN:
+                intent = APPROVE
+            elif reject / total >= _MIN_MARGIN:
+                intent = REJECT
+        return IntentResult(intent, approve, reject)
+
+
+TEAM_VOTE_MATCHER = IntentMatcher(_TEAM_VOTE_PATTERNS)
+
+
+def detect_vote_intent(text: str) -> Optional[str]:
+    """发言中对当前队伍的明确投票意图：approve / reject；模糊或未表态时返回 None。"""
+    return TEAM_VOTE_MATCHER.classify(text).intent
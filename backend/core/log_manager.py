@@ -1,13 +1,21 @@
 import os
 import json
 import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+# 日志模式：file = 逐条写入文件；buffered = 序列化后暂存内存，flush 时批量写入；off = 丢弃
+LOG_MODES = ('file', 'buffered', 'off')
 
 
 class LogManager:
-    def __init__(self, game_id: str = None, model: str = None):
+    def __init__(self, game_id: str = None, model: str = None, mode: str = 'file'):
+        if mode not in LOG_MODES:
+            raise ValueError(f"未知的日志模式: {mode}")
         self.root_log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
         self.model = model
+        self.mode = mode
+        # buffered 模式下按文件路径暂存的日志行
+        self._buffer: Dict[str, List[str]] = {}
 
         # 如果没有提供game_id，则创建一个包含时间戳的新game_id
         if game_id is None:
@@ -16,9 +24,10 @@ class LogManager:
         else:
             self.game_id = game_id
 
-        # 创建游戏日志目录
+        # 创建游戏日志目录（buffered 模式在 flush 时才创建，off 模式不创建）
         self.game_log_dir = os.path.join(self.root_log_dir, self.game_id)
-        os.makedirs(self.game_log_dir, exist_ok=True)
+        if self.mode == 'file':
+            os.makedirs(self.game_log_dir, exist_ok=True)
 
         # 全局日志文件路径
         self.global_log_path = os.path.join(self.game_log_dir, 'global.log')
@@ -30,6 +39,29 @@ class LogManager:
         """设置当前使用的模型名称"""
         self.model = model
 
+    def _write(self, path: str, log_entry: Dict[str, Any]) -> None:
+        if self.mode == 'off':
+            return
+        line = json.dumps(log_entry, ensure_ascii=False) + '\n'
+        if self.mode == 'buffered':
+            self._buffer.setdefault(path, []).append(line)
+            return
+        with open(path, 'a') as f:
+            f.write(line)
+
+    def flush(self) -> int:
+        """把 buffered 模式暂存的日志批量写入游戏日志目录，返回写入的行数。"""
+        if not self._buffer:
+            return 0
+        os.makedirs(self.game_log_dir, exist_ok=True)
+        written = 0
+        for path, lines in self._buffer.items():
+            with open(path, 'a') as f:
+                f.writelines(lines)
+            written += len(lines)
+        self._buffer.clear()
+        return written
+
     def _base_entry(self) -> Dict[str, Any]:
         """构建日志条目基础字段"""
         entry = {
@@ -47,8 +79,7 @@ class LogManager:
             'data': data
         })
 
-        with open(self.global_log_path, 'a') as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+        self._write(self.global_log_path, log_entry)
 
     def log_player_speech(self, player_name: str, message: str, is_ai: bool = False, role: str = None):
         """记录玩家发言到全局日志"""
@@ -63,8 +94,7 @@ class LogManager:
             }
         })
 
-        with open(self.global_log_path, 'a') as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+        self._write(self.global_log_path, log_entry)
 
     def log_game_start_with_roles(self, role_assignments: Dict[str, str]):
         """记录游戏开始和角色分配到全局日志"""
@@ -76,8 +106,7 @@ class LogManager:
             }
         })
 
-        with open(self.global_log_path, 'a') as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+        self._write(self.global_log_path, log_entry)
 
     def log_player_interaction(
         self,
@@ -110,8 +139,7 @@ class LogManager:
         if self.model:
             log_entry['model'] = self.model
 
-        with open(player_log_path, 'a') as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+        self._write(player_log_path, log_entry)
 
     def log_system_interaction(
         self,
@@ -137,8 +165,7 @@ class LogManager:
         if self.model:
             log_entry['model'] = self.model
 
-        with open(system_log_path, 'a') as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+        self._write(system_log_path, log_entry)
 
     def get_game_log_dir(self) -> str:
         """获取游戏日志目录路径"""
@@ -0,0 +1,76 @@
+"""
+对话消息的增量索引：按任务轮次、按阶段归档，刺杀阶段讨论单独存放。
+
+由 AvalonGame 在记录消息时同步维护，组装对话历史时按轮次直接取用，
+无需每次对整段 messages_history 做正则回溯。
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+from .constants import GAME_PHASES
+
+ASSASSINATION_PHASES = frozenset({
+    GAME_PHASES.get('assassination', '刺杀阶段'),
+    'assassination',
+    '刺杀阶段',
+})
+
+_MISSION_RESULT_PATTERN = re.compile(r'第(\d+)轮任务')
+_EMPTY: List[Dict[str, Any]] = []
+
+
+class MessageIndex:
+    """messages_history 的追加式索引（只增不改，与原列表共享消息对象）。"""
+
+    def __init__(self):
+        self._by_mission: Dict[int, List[Dict[str, Any]]] = {}
+        self._by_phase: Dict[str, List[Dict[str, Any]]] = {}
+        self._assassination: List[Dict[str, Any]] = []
+        # 无 mission 字段的消息按最近一条 system 任务结果推断所属轮次
+        self._inferred_mission = 1
+        self.count = 0
+
+    @classmethod
+    def from_messages(cls, messages: Iterable[Dict[str, Any]]) -> 'MessageIndex':
+        index = cls()
+        for msg in messages:
+            index.add(msg)
+        return index
+
+    def add(self, msg: Dict[str, Any]) -> Optional[int]:
+        """登记一条消息，返回其所属任务轮次（刺杀阶段消息返回 None）。"""
+        self.count += 1
+        phase = msg.get('phase')
+        self._by_phase.setdefault(phase, []).append(msg)
+
+        if phase in ASSASSINATION_PHASES:
+            self._assassination.append(msg)
+            return None
+
+        if msg.get('mission') is not None:
+            mission = int(msg['mission'])
+        else:
+            mission = self._inferred_mission
+        self._by_mission.setdefault(mission, []).append(msg)
+
+        if msg.get('player') == 'system':
+            match = _MISSION_RESULT_PATTERN.search(msg.get('content', ''))
+            if match:
+                self._inferred_mission = int(match.group(1)) + 1
+        return mission
+
+    def mission_messages(self, mission: int) -> List[Dict[str, Any]]:
+        """指定轮次的全部消息（不含刺杀阶段），按记录顺序；调用方不应修改返回的列表。"""
+        return self._by_mission.get(mission, _EMPTY)
+
+    def has_mission(self, mission: int) -> bool:
+        return bool(self._by_mission.get(mission))
+
+    def phase_messages(self, phase: str) -> List[Dict[str, Any]]:
+        return self._by_phase.get(phase, _EMPTY)
+
+    def assassination_messages(self) -> List[Dict[str, Any]]:
+        return self._assassination
@@ -0,0 +1,225 @@
+"""
+批量蒙特卡洛规则引擎：用 NumPy 数组同步推进大量对局，评估 MISSION_CONFIGS 与 ROLE_ASSIGNMENT
+在 5~10 人下对基线策略的胜率。
+
+每局的角色排列、队伍、投票与任务票都是 (对局数, 座位数) 的数组；每一步只推进尚未结束的对局。
+规则与 AvalonGame 一致：队伍投票过半通过，连续否决 5 次坏人胜；3 次任务成功进入刺杀，
+3 次任务失败坏人胜；刺中梅林坏人胜。
+
+需要 numpy（见 requirements.txt）；在线对局不依赖本模块。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .constants import EVIL_ROLES, GAME_RULES, MISSION_CONFIGS, ROLE_ASSIGNMENT
+
+# 结束原因
+END_MISSIONS_GOOD = 0   # 任务 3 次成功且刺杀失败
+END_MISSIONS_EVIL = 1   # 任务 3 次失败
+END_VOTE_LIMIT = 2      # 队伍连续否决 5 次
+END_ASSASSINATION = 3   # 刺杀梅林成功
+
+_END_LABELS = {
+    END_MISSIONS_GOOD: 'good_after_assassination',
+    END_MISSIONS_EVIL: 'evil_missions',
+    END_VOTE_LIMIT: 'evil_vote_limit',
+    END_ASSASSINATION: 'evil_assassination',
+}
+
+
+@dataclass(frozen=True)
+class SimulationPolicy:
+    """基线策略参数（各概率按座位、按决策独立抽样）。
+
+    默认值对应 AIPlayer 的规则策略：随机选队、好人总赞成、坏人随机投票、坏人总出失败票、
+    刺客在好人中随机刺杀。
+    """
+
+    name: str = 'baseline'
+    good_approve: float = 1.0
+    evil_approve: float = 0.5
+    evil_fail: float = 1.0
+    # 刺客是否知道梅林的概率（0 即在好人中随机刺杀）
+    assassin_knows_merlin: float = 0.0
+
+
+BASELINE_POLICIES: Dict[str, SimulationPolicy] = {
+    'baseline': SimulationPolicy(),
+    'evil_half_fail': SimulationPolicy(name='evil_half_fail', evil_fail=0.5),
+    'skeptical_good': SimulationPolicy(name='skeptical_good', good_approve=0.7),
+    'sharp_assassin': SimulationPolicy(name='sharp_assassin', assassin_knows_merlin=0.5),
+}
+
+
+@dataclass
+class SimulationReport:
+    player_count: int
+    policy: str
+    games: int
+    good_wins: int
+    end_counts: Dict[str, int]
+    avg_team_votes: float
+
+    @property
+    def good_win_rate(self) -> float:
+        return self.good_wins / self.games if self.games else 0.0
+
+    @property
+    def evil_win_rate(self) -> float:
+        return 1.0 - self.good_win_rate if self.games else 0.0
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'player_count': self.player_count,
+            'policy': self.policy,
+            'games': self.games,
+            'good_win_rate': round(self.good_win_rate, 4),
+            'evil_win_rate': round(self.evil_win_rate, 4),
+            'end_counts': dict(self.end_counts),
+            'avg_team_votes': round(self.avg_team_votes, 3),
+        }
+
+
+def _random_roles(rng: np.random.Generator, games: int, player_count: int) -> np.ndarray:
+    """每局一个角色排列：返回 (games, n) 的 ROLE_ASSIGNMENT 下标。"""
+    return rng.permuted(np.tile(np.arange(player_count, dtype=np.int8), (games, 1)), axis=1)
+
+
+def _random_teams(rng: np.random.Generator, sizes: np.ndarray, player_count: int) -> np.ndarray:
+    """各局随机选 sizes[i] 人：随机键最小的 k 个座位。返回 (games, n) 的布尔队伍。"""
+    keys = rng.random((len(sizes), player_count), dtype=np.float32)
+    threshold = np.take_along_axis(np.sort(keys, axis=1), sizes[:, None].astype(np.intp) - 1, axis=1)
+    return keys <= threshold
+
+
+def simulate(
+    player_count: int,
+    games: int,
+    policy: Optional[SimulationPolicy] = None,
+    seed: Optional[int] = None,
+    batch_size: int = 200_000,
+) -> SimulationReport:
+    """模拟 games 局，按 batch_size 分批以控制内存。"""
+    if player_count not in MISSION_CONFIGS:
+        raise ValueError(f"不支持的玩家数量: {player_count}")
+    policy = policy or BASELINE_POLICIES['baseline']
+    rng = np.random.default_rng(seed)
+
+    good_wins = 0
+    team_votes = 0
+    end_counts = np.zeros(len(_END_LABELS), dtype=np.int64)
+    remaining = games
+    while remaining > 0:
+        batch = min(batch_size, remaining)
+        wins, ends, votes = _simulate_batch(rng, player_count, batch, policy)
+        good_wins += wins
+        end_counts += ends
+        team_votes += votes
+        remaining -= batch
+
+    return SimulationReport(
+        player_count=player_count,
+        policy=policy.name,
+        games=games,
+        good_wins=good_wins,
+        end_counts={_END_LABELS[i]: int(c) for i, c in enumerate(end_counts)},
+        avg_team_votes=team_votes / games if games else 0.0,
+    )
+
+
+def _simulate_batch(
+    rng: np.random.Generator,
+    n: int,
+    games: int,
+    policy: SimulationPolicy,
+) -> tuple:
+    config = MISSION_CONFIGS[n]
+    mission_sizes = np.asarray(config['missions'], dtype=np.int8)
+    fails_needed = np.asarray(config['fails_needed'], dtype=np.int8)
+    role_table = ROLE_ASSIGNMENT[n]
+    evil_ids = np.array([role in EVIL_ROLES for role in role_table])
+    merlin_id = role_table.index('merlin')
+
+    roles = _random_roles(rng, games, n)
+    evil = evil_ids[roles]
+    is_merlin = roles == merlin_id
+
+    mission = np.zeros(games, dtype=np.int8)
+    good_missions = np.zeros(games, dtype=np.int8)
+    evil_missions = np.zeros(games, dtype=np.int8)
+    failed_votes = np.zeros(games, dtype=np.int8)
+    end = np.full(games, -1, dtype=np.int8)
+    vote_limit = GAME_RULES['team_vote_limit']
+    total_votes = 0
+
+    active = np.arange(games)
+    while active.size:
+        m = mission[active]
+        team = _random_teams(rng, mission_sizes[m], n)
+        a_evil = evil[active]
+
+        approve_prob = np.where(a_evil, policy.evil_approve, policy.good_approve)
+        approvals = (rng.random((active.size, n), dtype=np.float32) < approve_prob).sum(axis=1)
+        approved = approvals > n / 2
+        total_votes += active.size
+
+        # 否决：累计否决次数，到上限坏人胜
+        rejected = active[~approved]
+        failed_votes[rejected] += 1
+        end[rejected[failed_votes[rejected] >= vote_limit]] = END_VOTE_LIMIT
+
+        # 通过：执行任务
+        go = active[approved]
+        go_team = team[approved]
+        sabotage = rng.random(go_team.shape, dtype=np.float32) < policy.evil_fail
+        fails = (go_team & a_evil[approved] & sabotage).sum(axis=1)
+        success = fails < fails_needed[mission[go]]
+        good_missions[go[success]] += 1
+        evil_missions[go[~success]] += 1
+        mission[go] += 1
+        failed_votes[go] = 0
+        end[go[evil_missions[go] >= GAME_RULES['fail_threshold']]] = END_MISSIONS_EVIL
+
+        # 好人 3 次成功：刺杀
+        assassinate = go[good_missions[go] >= GAME_RULES['success_threshold']]
+        if assassinate.size:
+            end[assassinate] = _assassinate(rng, evil[assassinate], is_merlin[assassinate], policy)
+
+        active = active[end[active] < 0]
+
+    good_wins = int((end == END_MISSIONS_GOOD).sum())
+    end_counts = np.bincount(end, minlength=len(_END_LABELS))
+    return good_wins, end_counts, total_votes
+
+
+def _assassinate(
+    rng: np.random.Generator,
+    evil: np.ndarray,
+    is_merlin: np.ndarray,
+    policy: SimulationPolicy,
+) -> np.ndarray:
+    """刺客在好人中随机选目标（以 assassin_knows_merlin 的概率直接刺中梅林）。"""
+    keys = np.where(evil, -1.0, rng.random(evil.shape))
+    target = keys.argmax(axis=1)
+    rows = np.arange(len(target))
+    hit = is_merlin[rows, target] | (rng.random(len(target)) < policy.assassin_knows_merlin)
+    return np.where(hit, END_ASSASSINATION, END_MISSIONS_GOOD).astype(np.int8)
+
+
+def balance_report(
+    games: int,
+    player_counts: Iterable[int] = tuple(sorted(MISSION_CONFIGS)),
+    policies: Iterable[SimulationPolicy] = tuple(BASELINE_POLICIES.values()),
+    seed: Optional[int] = 0,
+) -> List[SimulationReport]:
+    """各人数配置 × 各策略的胜率表。"""
+    reports = []
+    for i, policy in enumerate(policies):
+        for n in player_counts:
+            reports.append(simulate(n, games, policy, seed=None if seed is None else seed + i * 100 + n))
+    return reports
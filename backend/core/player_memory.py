@@ -0,0 +1,91 @@
+"""
+AI 座位的私有记忆：每轮任务结束后为每个座位生成一条简短记录（本轮结果、看到的车票、
+自己的表态与怀疑、他人的怀疑焦点），写入 AIPlayer.knowledge_base。
+
+组装 prompt 时，已写入记忆的更早轮次以该座位的记忆代替共享的轮次摘要，条数有上限。
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .round_summarizer import extract_player_stances
+
+_STANCE_LABELS = {'approve': '赞成', 'reject': '反对'}
+
+
+def _player_sort_key(name: str):
+    return int(name) if str(name).isdigit() else name
+
+
+def _join_names(names: List[str]) -> str:
+    return ','.join(sorted(names, key=_player_sort_key)) or '无'
+
+
+def _format_team(team: List[str]) -> str:
+    return '[' + ','.join(team) + ']'
+
+
+def build_round_memory_notes(
+    player_names: List[str],
+    mission_number: int,
+    round_messages: List[Dict[str, Any]],
+    mission_result: Optional[Dict[str, Any]] = None,
+    team_vote_records: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, str]:
+    """为每个座位生成本轮的一条记忆；纯本地计算，可在线程中执行。"""
+    speeches = [m for m in round_messages if m.get('player') and m.get('player') != 'system']
+    stances = extract_player_stances(speeches)
+
+    shared: List[str] = [f"第{mission_number}轮"]
+    if mission_result:
+        status = '成功' if mission_result.get('success') else '失败'
+        shared.append(
+            f"队伍{_format_team(mission_result.get('team', []))}{status}"
+            f"({mission_result.get('fail_count', 0)}败)"
+        )
+
+    records = team_vote_records or []
+    rejected = sum(1 for r in records if not r.get('approved'))
+    approved = next((r for r in records if r.get('approved')), None)
+    if approved:
+        if approved.get('reject'):
+            vote_line = f"车票 反对{_join_names(approved['reject'])}，其余赞成"
+        else:
+            vote_line = "车票 全票赞成"
+        if rejected:
+            vote_line += f"（此前否决{rejected}次）"
+        shared.append(vote_line)
+    elif rejected:
+        shared.append(f"否决{rejected}次")
+
+    suspect_counts: Dict[str, int] = {}
+    for entry in stances.values():
+        for suspect in entry['suspects']:
+            suspect_counts[suspect] = suspect_counts.get(suspect, 0) + 1
+
+    notes: Dict[str, str] = {}
+    for name in player_names:
+        parts = list(shared)
+        own = stances.get(name)
+        if own and (own['stance'] or own['suspects']):
+            claim = _STANCE_LABELS.get(own['stance'], '未表态')
+            if own['suspects']:
+                claim += f"，怀疑{'、'.join(own['suspects'])}"
+            parts.append(f"我：{claim}")
+
+        others = {
+            suspect: count - (1 if own and suspect in own['suspects'] else 0)
+            for suspect, count in suspect_counts.items()
+        }
+        ranked = sorted(
+            ((s, c) for s, c in others.items() if c > 0 and s != name),
+            key=lambda kv: (-kv[1], _player_sort_key(kv[0])),
+        )
+        if ranked:
+            parts.append('他人怀疑 ' + '、'.join(f"{s}号({c})" for s, c in ranked[:3]))
+        if name in suspect_counts:
+            parts.append(f"我被{suspect_counts[name]}人怀疑")
+
+        notes[name] = '｜'.join(parts)
+    return notes
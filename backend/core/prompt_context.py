@@ -1,25 +1,90 @@
 """
-Prompt 上下文构建：结构化局势摘要、分层对话历史。
+Prompt 上下文构建：结构化局势摘要、分层对话历史、按 token 预算裁剪。
 """
 
 from __future__ import annotations
 
 import re
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
 
 from .constants import GAME_PHASES
+from .message_index import ASSASSINATION_PHASES as _ASSASSINATION_PHASES, MessageIndex
+from .quote_index import build_quote_query
 
-_ASSASSINATION_PHASES = frozenset({
-    GAME_PHASES.get('assassination', '刺杀阶段'),
-    'assassination',
-    '刺杀阶段',
-})
+
+# 对话历史条目的保留优先级（数值越小越优先保留）
+TIER_CURRENT = 0     # 当前轮发言、刺杀阶段讨论
+TIER_PREVIOUS = 1    # 上一轮完整发言
+TIER_OLDER = 2       # 更早轮次的摘要
+
+_CJK_PATTERN = re.compile(r'[\u3000-\u303f\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff00-\uffef]')
+_WORD_PATTERN = re.compile(r'[A-Za-z0-9_]+')
+
+
+def estimate_tokens(text: str) -> int:
+    """离线估算文本 token 数：中文字符及全角标点按 1 个计，英文/数字按约 4 字符 1 个计，其余符号各 1 个。
+
+    中文模型分词器通常 1 个汉字约 0.6~1 个 token，这里取偏保守的上界，保证裁剪后不超预算。
+    """
+    if not text:
+        return 0
+    cjk = len(_CJK_PATTERN.findall(text))
+    rest = _CJK_PATTERN.sub(' ', text)
+    words = 0
+    for word in _WORD_PATTERN.findall(rest):
+        words += (len(word) + 3) // 4
+    symbols = len(_WORD_PATTERN.sub('', rest).replace(' ', '').replace('\n', ''))
+    return cjk + words + symbols
 
 
 def _player_sort_key(name: str):
     return int(name) if str(name).isdigit() else name
 
 
+class PromptContextCache:
+    """按游戏状态版本缓存各座位共享的 prompt 片段（局势摘要主体、对话历史）。
+
+    同一阶段内所有座位看到相同的共享部分，只需计算一次；游戏状态变更（版本号递增）
+    后首次访问即整体失效。
+    """
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        self._entries: Dict[Hashable, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version: int, key: Hashable, compute: Callable[[], Any]) -> Any:
+        if version != self.version:
+            self._entries.clear()
+            self.version = version
+        if key in self._entries:
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        value = compute()
+        self._entries[key] = value
+        return value
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'version': self.version,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+def _cached(game_context: Dict[str, Any], key: Hashable, compute: Callable[[], Any]) -> Any:
+    """上下文带有版本与缓存时按版本取共享片段，否则直接计算。"""
+    cache: Optional[PromptContextCache] = game_context.get('_prompt_cache')
+    version = game_context.get('_version')
+    if cache is None or version is None:
+        return compute()
+    return cache.get(version, key, compute)
+
+
 def resolve_message_missions(messages: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], int]]:
     """为每条消息解析所属任务轮次（无 mission 字段时按 system 任务结果回溯推断）。"""
     resolved: List[Tuple[Dict[str, Any], int]] = []
@@ -83,7 +148,23 @@ def build_situation_summary(
     game_context: Dict[str, Any],
     player_name: Optional[str] = None,
 ) -> str:
-    """生成结构化局势摘要，供插入对话历史之后。"""
+    """生成结构化局势摘要，供插入对话历史之后（共享主体按版本缓存，拼接当前玩家的个人行）。"""
+    shared, board = _cached(
+        game_context, 'situation_summary', lambda: _build_situation_shared(game_context)
+    )
+    if not player_name:
+        return shared
+
+    my_missions = board.get(player_name, [])
+    if my_missions:
+        personal = f"- 你（{player_name}）曾参与第 {', '.join(map(str, my_missions))} 轮任务"
+    else:
+        personal = f"- 你（{player_name}）尚未参与任何任务"
+    return f"{shared}\n{personal}"
+
+
+def _build_situation_shared(game_context: Dict[str, Any]) -> Tuple[str, Dict[str, List[int]]]:
+    """局势摘要中各座位共享的部分，以及各玩家上车记录。"""
     mission_results = game_context.get('mission_results', [])
     players = game_context.get('players', [])
     player_names = sorted([p['name'] for p in players], key=_player_sort_key)
@@ -141,73 +222,261 @@ def build_situation_summary(
             f"赞成 {_format_vote_side(approve)} / 反对 {_format_vote_side(reject)}"
         )
 
-    if player_name:
-        my_missions = board.get(player_name, [])
-        if my_missions:
-            lines.append(f"- 你（{player_name}）曾参与第 {', '.join(map(str, my_missions))} 轮任务")
-        else:
-            lines.append(f"- 你（{player_name}）尚未参与任何任务")
+    return '\n'.join(lines), board
+
 
-    return '\n'.join(lines)
+def get_message_index(game_context: Dict[str, Any]) -> MessageIndex:
+    """取上下文中由游戏增量维护的消息索引；没有时（如外部传入的状态字典）现场构建。"""
+    index = game_context.get('_message_index')
+    if index is None:
+        index = MessageIndex.from_messages(game_context.get('messages_history', []))
+    return index
 
 
 def build_dialogue_history_lines(game_context: Dict[str, Any]) -> List[str]:
     """
-    组装对话历史行：
-    - 更早轮次：使用压缩摘要；
-    - 上一轮 + 当前轮：保留完整发言；
+    组装对话历史行（多级细节）：
+    - 更早轮次：已并入整局滚动摘要的合为一条，其余每轮一条压缩摘要；
+    - 上一轮：已生成各玩家立场压缩时使用压缩，否则保留完整发言；
+    - 当前轮：保留完整发言；
     - 刺杀阶段讨论：始终保留完整发言。
+
+    借助增量消息索引按轮次取用，耗时与输出行数成正比，而非整段历史长度；
+    同一状态版本内各座位共享同一份结果。
     """
-    messages = game_context.get('messages_history', [])
-    if not messages:
+    return [entry[1] for entry in _get_dialogue_history_entries(game_context)]
+
+
+def _get_dialogue_history_entries(game_context: Dict[str, Any]) -> List[Tuple[int, str, int, int]]:
+    """带保留优先级与覆盖轮次范围的对话历史条目 (tier, line, first_mission, last_mission)，按版本缓存。"""
+    return _cached(
+        game_context, 'dialogue_history', lambda: _build_dialogue_history_entries(game_context)
+    )
+
+
+def _get_dialogue_history_tokens(game_context: Dict[str, Any]) -> List[int]:
+    """各历史条目的 token 估算（含换行），仅在需要按预算裁剪时计算，按版本缓存。"""
+    return _cached(
+        game_context,
+        'dialogue_history_tokens',
+        lambda: [estimate_tokens(entry[1]) + 1 for entry in _get_dialogue_history_entries(game_context)],
+    )
+
+
+def _build_dialogue_history_entries(game_context: Dict[str, Any]) -> List[Tuple[int, str, int, int]]:
+    index = get_message_index(game_context)
+    if not index.count:
         return []
 
     current_mission = int(game_context.get('current_mission') or 1)
     prev_mission = max(1, current_mission - 1)
     summaries: Dict[int, str] = game_context.get('round_discussion_summaries', {})
+    condensed: Dict[int, List[str]] = game_context.get('condensed_rounds') or {}
+    rolling_summary = game_context.get('rolling_summary') or ''
+    rolling_through = min(int(game_context.get('rolling_summary_through') or 0), prev_mission - 1)
 
-    resolved = resolve_message_missions(messages)
-    lines: List[str] = []
+    entries: List[Tuple[int, str, int, int]] = []
+
+    first_single = 1
+    if rolling_summary and rolling_through >= 1:
+        label = "第1轮" if rolling_through == 1 else f"第1~{rolling_through}轮"
+        entries.append((TIER_OLDER, f"【{label}汇总】{rolling_summary}", 1, rolling_through))
+        first_single = rolling_through + 1
 
-    for mission_num in range(1, prev_mission):
+    for mission_num in range(first_single, prev_mission):
         if mission_num in summaries:
-            lines.append(f"【第{mission_num}轮讨论摘要】{summaries[mission_num]}")
+            line = f"【第{mission_num}轮讨论摘要】{summaries[mission_num]}"
+        elif index.has_mission(mission_num):
+            line = f"【第{mission_num}轮讨论摘要】（摘要生成中，暂略）"
         else:
-            mission_msgs = [msg for msg, m in resolved if m == mission_num]
-            if mission_msgs:
-                lines.append(f"【第{mission_num}轮讨论摘要】（摘要生成中，暂略）")
+            continue
+        entries.append((TIER_OLDER, line, mission_num, mission_num))
+
+    if prev_mission != current_mission and condensed.get(prev_mission):
+        entries.append((TIER_PREVIOUS, f"【第{prev_mission}轮各玩家立场】", prev_mission, prev_mission))
+        for line in condensed[prev_mission]:
+            entries.append((TIER_PREVIOUS, line, prev_mission, prev_mission))
+        # 任务结果等系统消息保留原文
+        for msg in index.mission_messages(prev_mission):
+            if msg.get('player') == 'system':
+                entries.append((TIER_PREVIOUS, f"{msg['player']}说: {msg['content']}", prev_mission, prev_mission))
+        verbatim_missions = [current_mission]
+    elif prev_mission == current_mission:
+        verbatim_missions = [current_mission]
+    else:
+        verbatim_missions = [prev_mission, current_mission]
 
-    for msg, mission_num in resolved:
-        if mission_num in (prev_mission, current_mission):
-            lines.append(f"{msg['player']}说: {msg['content']}")
+    for mission_num in verbatim_missions:
+        tier = TIER_CURRENT if mission_num == current_mission else TIER_PREVIOUS
+        for msg in index.mission_messages(mission_num):
+            entries.append((tier, f"{msg['player']}说: {msg['content']}", mission_num, mission_num))
 
     phase = game_context.get('phase', '')
     if phase in _ASSASSINATION_PHASES:
-        for msg in messages:
-            if msg.get('phase') in _ASSASSINATION_PHASES:
-                lines.append(f"{msg['player']}说: {msg['content']}")
-
-    return lines
+        for msg in index.assassination_messages():
+            entries.append((TIER_CURRENT, f"{msg['player']}说: {msg['content']}", current_mission, current_mission))
+
+    return entries
+
+
+def get_seat_memory(game_context: Dict[str, Any], player_name: Optional[str]) -> Sequence[Tuple[int, str]]:
+    """当前座位的私有记忆 [(轮次, 记录)]；无记忆时返回空。"""
+    if not player_name:
+        return ()
+    memories = game_context.get('_player_memories') or {}
+    return memories.get(player_name, ())
+
+
+def _apply_seat_memory(
+    entries: List[Tuple[int, str, int, int]],
+    memory: Sequence[Tuple[int, str]],
+) -> List[Tuple[int, str, int, int]]:
+    """更早轮次中已写入座位记忆的，以记忆代替共享摘要（滚动汇总仅在其覆盖的轮次全部有记忆时代替）；
+    上一轮与当前轮不受影响。"""
+    memory_entries = [
+        (TIER_OLDER, f"【我的记忆】{note}", mission, mission) for mission, note in memory
+    ]
+    older_limit = min((e[2] for e in entries if e[0] != TIER_OLDER), default=None)
+    if older_limit is not None:
+        memory_entries = [e for e in memory_entries if e[2] < older_limit]
+    covered = {e[2] for e in memory_entries}
+    rest = [
+        e for e in entries
+        if not (e[0] == TIER_OLDER and all(m in covered for m in range(e[2], e[3] + 1)))
+    ]
+    return memory_entries + rest
+
+
+def fit_history_to_budget(
+    entries: List[Tuple[int, str, int, int]],
+    token_counts: List[int],
+    max_tokens: int,
+) -> Tuple[List[str], int]:
+    """按优先级在预算内挑选历史条目：当前轮 > 上一轮 > 更早摘要，同级优先保留较新的内容。
+
+    放不下的条目跳过（计入省略），不影响同级更早的条目与低优先级层级，
+    因此低优先级内容只会使用高优先级条目用剩的预算。
+    返回按原顺序排列的保留行，以及被省略的条目数。
+    """
+    remaining = max_tokens
+    kept = set()
+    for tier in (TIER_CURRENT, TIER_PREVIOUS, TIER_OLDER):
+        for pos in range(len(entries) - 1, -1, -1):
+            if entries[pos][0] != tier:
+                continue
+            tokens = token_counts[pos]
+            if tokens > remaining:
+                # 单条过长时跳过，不能因此让出预算给更低优先级的层级
+                continue
+            kept.add(pos)
+            remaining -= tokens
+    lines = [entry[1] for pos, entry in enumerate(entries) if pos in kept]
+    return lines, len(entries) - len(kept)
 
 
 def format_dialogue_history_block(
     game_context: Dict[str, Any],
     label: str = "对话历史",
     player_name: Optional[str] = None,
+    max_tokens: Optional[int] = None,
 ) -> str:
-    """对话历史块 + 局势摘要（摘要紧跟在历史之后）。"""
-    history_lines = build_dialogue_history_lines(game_context)
-    history_part = ""
-    if history_lines:
-        history_part = f"\n\n{label}:\n" + '\n'.join(history_lines)
+    """对话历史块 + 局势摘要（摘要紧跟在历史之后）。
 
-    return history_part + build_situation_summary(game_context, player_name)
+    座位有私有记忆时，已记忆的更早轮次以记忆代替共享摘要。
+    max_tokens 为整块的 token 预算：局势摘要始终完整保留，余下预算按
+    当前轮发言 > 上一轮发言 > 更早摘要 的顺序分配，超出部分省略并注明条数。
+    """
+    situation = build_situation_summary(game_context, player_name)
+    memory = get_seat_memory(game_context, player_name)
+
+    def build_history_part(budget: Optional[int]) -> str:
+        entries = _get_dialogue_history_entries(game_context)
+        if not entries and not memory:
+            return ""
+        if memory:
+            entries = _apply_seat_memory(entries, memory)
+        header = f"\n\n{label}:\n"
+        if budget is None:
+            history_lines = [entry[1] for entry in entries]
+        else:
+            if memory:
+                token_counts = [estimate_tokens(entry[1]) + 1 for entry in entries]
+            else:
+                token_counts = _get_dialogue_history_tokens(game_context)
+            history_lines, omitted = fit_history_to_budget(entries, token_counts, budget)
+            if omitted:
+                history_lines.insert(0, f"（篇幅所限，省略较早的 {omitted} 条记录）")
+        if not history_lines:
+            return ""
+        return header + '\n'.join(history_lines)
+
+    # 有记忆时历史部分因座位而异，缓存键带上座位
+    seat_key = player_name if memory else None
+    if not max_tokens or max_tokens <= 0:
+        history_part = _cached(
+            game_context, ('history_part', label, None, seat_key), lambda: build_history_part(None)
+        )
+        return history_part + situation
+
+    # 预留标题与省略提示的开销；摘要各座位只差一行，按座位计算后取整到 50 便于共享缓存
+    overhead = estimate_tokens(label) + 40
+    budget = max(0, max_tokens - estimate_tokens(situation) - overhead)
+    budget -= budget % 50
+    history_part = _cached(
+        game_context, ('history_part', label, budget, seat_key), lambda: build_history_part(budget)
+    )
+    return history_part + situation
+
+
+def format_evidence_quotes(
+    game_context: Dict[str, Any],
+    player_name: Optional[str] = None,
+    top_k: int = 3,
+    topic_messages: int = 3,
+) -> str:
+    """从更早轮次（只以摘要/记忆出现在历史里的轮次）检索与当前队伍、发言座位及当前话题最相关的原话。
+
+    当前轮最近几条发言作为话题；上一轮与当前轮已完整出现在对话历史中，不再检索。
+    """
+    index = game_context.get('_quote_index')
+    if index is None or top_k <= 0 or not len(index):
+        return ""
+    current_mission = int(game_context.get('current_mission') or 1)
+    prev_mission = max(1, current_mission - 1)
+    if prev_mission <= 1:
+        return ""
+
+    def build_quotes() -> str:
+        recent = get_message_index(game_context).mission_messages(current_mission)
+        topic = ' '.join(
+            msg.get('content', '') for msg in list(recent)[-topic_messages:]
+            if msg.get('player') != 'system'
+        )
+        query = build_quote_query(game_context.get('current_team') or [], player_name, topic)
+        lines: List[str] = []
+        seen = set()
+        # 多取一些以便去掉重复的原句
+        for _, speaker, mission, sentence in index.search(query, top_k * 2, before_mission=prev_mission):
+            if sentence in seen:
+                continue
+            seen.add(sentence)
+            lines.append(f"- 第{mission}轮 {speaker}号：「{sentence}」")
+            if len(lines) >= top_k:
+                break
+        if not lines:
+            return ""
+        return "\n\n更早轮次的相关原话（可引用）:\n" + '\n'.join(lines)
+
+    return _cached(game_context, ('evidence_quotes', player_name, top_k), build_quotes)
 
 
 def collect_round_messages(
     messages: List[Dict[str, Any]],
     mission_number: int,
+    index: Optional[MessageIndex] = None,
 ) -> List[Dict[str, Any]]:
-    """收集指定任务轮次的全部发言（不含刺杀阶段）。"""
+    """收集指定任务轮次的全部发言（不含刺杀阶段）；传入增量索引时直接按轮次取用。"""
+    if index is not None:
+        return list(index.mission_messages(mission_number))
     resolved = resolve_message_missions(messages)
     return [msg for msg, m in resolved if m == mission_number]
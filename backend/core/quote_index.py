@@ -0,0 +1,159 @@
+"""
+历史发言检索：对 messages_history 中的发言按句建立倒排索引（BM25），随消息记录增量更新。
+
+中文不做分词，使用字二元组；另把“N号”形式的座位提及与发言人作为独立词项，
+以便按当前队伍成员与发言座位检索可引用的历史原话。
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .round_summarizer import split_sentences
+
+_NON_TEXT = re.compile(r'[^\w一-鿿]+')
+_SEAT_MENTION = re.compile(r'(\d{1,2})\s*号')
+
+
+def mention_term(seat: str) -> str:
+    """“N号”座位提及的词项。"""
+    return f"#{seat}"
+
+
+def speaker_term(seat: str) -> str:
+    """发言人的词项。"""
+    return f"@{seat}"
+
+
+def tokenize(sentence: str, speaker: Optional[str] = None) -> List[str]:
+    """字二元组 + 座位提及 + 发言人。"""
+    compact = _NON_TEXT.sub('', sentence.lower())
+    terms = [compact[i:i + 2] for i in range(len(compact) - 1)]
+    terms.extend(mention_term(m) for m in _SEAT_MENTION.findall(sentence))
+    if speaker:
+        terms.append(speaker_term(speaker))
+    return terms
+
+
+class QuoteIndex:
+    """按句的 BM25 倒排索引（只增，句子编号即加入顺序）。"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        # 每句：(发言人, 所属轮次, 原句)
+        self.docs: List[Tuple[str, int, str]] = []
+        self._lengths: List[int] = []
+        # 前缀长度和，用于按任意前缀（快照时刻）计算平均句长
+        self._length_prefix: List[int] = [0]
+        # 词项 -> [(句子编号, 词频)]，句子编号递增
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def add(self, msg: Dict[str, Any], mission: Optional[int]) -> None:
+        """登记一条消息的各句；system 消息与刺杀阶段消息（mission 为 None）不参与检索。"""
+        player = msg.get('player')
+        if not player or player == 'system' or mission is None:
+            return
+        for sentence in split_sentences(msg.get('content', '')):
+            doc_id = len(self.docs)
+            terms = tokenize(sentence, player)
+            counts: Dict[str, int] = {}
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            for term, tf in counts.items():
+                self._postings.setdefault(term, []).append((doc_id, tf))
+            self.docs.append((player, mission, sentence))
+            self._lengths.append(len(terms))
+            self._length_prefix.append(self._length_prefix[-1] + len(terms))
+
+    def search(
+        self,
+        query: Dict[str, float],
+        top_k: int = 3,
+        limit: Optional[int] = None,
+        before_mission: Optional[int] = None,
+    ) -> List[Tuple[float, str, int, str]]:
+        """按加权词项检索，返回 [(得分, 发言人, 轮次, 原句)]。
+
+        limit 只检索前 limit 句（快照时刻的索引）；before_mission 只检索更早轮次的发言。
+        """
+        n = len(self.docs) if limit is None else min(limit, len(self.docs))
+        if n == 0 or top_k <= 0:
+            return []
+        avgdl = self._length_prefix[n] / n or 1.0
+
+        scores: Dict[int, float] = {}
+        for term, weight in query.items():
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            end = bisect_left(postings, (n, 0))
+            df = end
+            if df == 0:
+                continue
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for doc_id, tf in postings[:end]:
+                if before_mission is not None and self.docs[doc_id][1] >= before_mission:
+                    continue
+                norm = tf + self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / avgdl)
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * idf * tf * (self.k1 + 1) / norm
+
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[:top_k]
+        return [(score, *self.docs[doc_id]) for doc_id, score in ranked]
+
+    def view(self) -> 'QuoteIndexView':
+        return QuoteIndexView(self, len(self.docs))
+
+
+class QuoteIndexView:
+    """QuoteIndex 在某一时刻的只读视图（只检索当时已有的句子）。"""
+
+    __slots__ = ('_index', '_limit')
+
+    def __init__(self, index: QuoteIndex, limit: int):
+        self._index = index
+        self._limit = limit
+
+    def __len__(self) -> int:
+        return self._limit
+
+    def search(
+        self,
+        query: Dict[str, float],
+        top_k: int = 3,
+        before_mission: Optional[int] = None,
+    ) -> List[Tuple[float, str, int, str]]:
+        return self._index.search(query, top_k, limit=self._limit, before_mission=before_mission)
+
+
+def build_quote_query(
+    team: Iterable[str],
+    player_name: Optional[str],
+    topic_text: str = '',
+    topic_weight: float = 0.3,
+) -> Dict[str, float]:
+    """检索当前队伍成员相关（被提及、本人说过）、提及发言座位本人，以及与当前讨论话题相近的历史原话。"""
+    query: Dict[str, float] = {}
+
+    def bump(term: str, weight: float) -> None:
+        query[term] = query.get(term, 0.0) + weight
+
+    for seat in team:
+        bump(mention_term(seat), 1.0)
+        bump(speaker_term(seat), 0.5)
+    if player_name:
+        bump(mention_term(player_name), 1.0)
+
+    topic_terms = [t for t in tokenize(topic_text) if not t.startswith('#')]
+    if topic_terms:
+        # 话题词项总权重固定，避免长文本淹没座位相关词项
+        per_term = topic_weight / len(topic_terms)
+        for term in topic_terms:
+            bump(term, per_term)
+    return query
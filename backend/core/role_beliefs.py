@@ -0,0 +1,240 @@
+"""
+角色后验：在 ROLE_ASSIGNMENT[n] 的全部不同角色排列上计算后验，随公开证据增量更新。
+
+- 候选表为 (K, n) 的角色下标数组（10 人局 K = 151200），按人数缓存、只读共享；
+- 公开证据只与“哪些座位是坏人”有关，因此权重维护在坏人座位集合上（10 人局 210 个），
+  每次更新只是一次长度为 S 的向量乘法；
+- 任务结果：队伍中坏人数 e、失败票 f，似然为二项分布 C(e,f)·p^f·(1-p)^(e-f)，f > e 的集合权重归零；
+- 队伍投票：好人以固定概率赞成，坏人对含坏人的队伍更倾向赞成（软证据）；
+- 各座位的视野（自己的角色 + 开局可见角色集合）是候选表上的掩码，首次查询该座位视角时
+  折算为“每个坏人集合下与视野一致的排列数”，之后的查询同样只在集合上计算。
+
+查询结果按证据版本缓存，同一阶段内各座位重复查询只需一次字典查找。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .constants import EVIL_ROLES, ROLE_ASSIGNMENT
+from .roles import get_visible_roles
+
+
+@dataclass(frozen=True)
+class BeliefModel:
+    """证据的似然参数。"""
+
+    # 坏人在任务中出失败票的概率
+    evil_fail: float = 0.7
+    # 好人赞成任意队伍的概率
+    good_approve: float = 0.7
+    # 坏人赞成含坏人队伍 / 不含坏人队伍的概率
+    evil_approve_evil_team: float = 0.9
+    evil_approve_clean_team: float = 0.45
+
+
+@lru_cache(maxsize=None)
+def candidate_assignments(player_count: int) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """ROLE_ASSIGNMENT[n] 的全部不同排列：返回 (角色种类, (K, n) 的 int8 角色种类下标)。"""
+    role_list = ROLE_ASSIGNMENT[player_count]
+    kinds = tuple(dict.fromkeys(role_list))
+    counts = [role_list.count(kind) for kind in kinds]
+
+    # 按角色种类依次放置：每步把每个部分排列与空座位上的各组合展开（占用座位用位掩码判断）
+    table = np.full((1, player_count), -1, dtype=np.int8)
+    occupied = np.zeros(1, dtype=np.int32)
+    for kind_index, count in enumerate(counts):
+        combos = np.zeros((comb(player_count, count), player_count), dtype=bool)
+        for i, seats in enumerate(combinations(range(player_count), count)):
+            combos[i, list(seats)] = True
+        combo_bits = combos.astype(np.int32) @ (1 << np.arange(player_count, dtype=np.int32))
+        rows, combo_ids = np.nonzero((occupied[:, None] & combo_bits[None, :]) == 0)
+        table = table[rows]
+        table[combos[combo_ids]] = kind_index
+        occupied = occupied[rows] | combo_bits[combo_ids]
+    table.setflags(write=False)
+    return kinds, table
+
+
+@lru_cache(maxsize=None)
+def evil_seat_sets(player_count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """候选排列按坏人座位集合分组：返回 (各排列所属集合下标 (K,), 集合的坏人矩阵 (S, n), 各集合排列数 (S,))。"""
+    kinds, table = candidate_assignments(player_count)
+    evil_kind = np.array([kind in EVIL_ROLES for kind in kinds])
+    bits = evil_kind[table].astype(np.int32) @ (1 << np.arange(player_count, dtype=np.int32))
+    codes, set_index, multiplicity = np.unique(bits, return_inverse=True, return_counts=True)
+    set_evil = (codes[:, None] >> np.arange(player_count)) & 1 == 1
+    for array in (set_index, set_evil, multiplicity):
+        array.setflags(write=False)
+    return set_index, set_evil, multiplicity
+
+
+@lru_cache(maxsize=None)
+def visible_seat_codes(player_count: int, visible: frozenset) -> np.ndarray:
+    """各候选排列中持有 visible 内角色的座位位掩码 (K,)，用于按视野筛选排列。"""
+    kinds, table = candidate_assignments(player_count)
+    visible_kind = np.array([kind in visible for kind in kinds])
+    codes = visible_kind[table].astype(np.int32) @ (1 << np.arange(player_count, dtype=np.int32))
+    codes.setflags(write=False)
+    return codes
+
+
+class RoleBeliefEngine:
+    """一局的角色后验（公开证据共享，座位视野在查询时施加）。"""
+
+    def __init__(
+        self,
+        player_names: Sequence[str],
+        roles: Optional[Sequence[Optional[str]]] = None,
+        model: Optional[BeliefModel] = None,
+    ):
+        self.player_names = list(player_names)
+        self.seat_by_name = {name: seat for seat, name in enumerate(self.player_names)}
+        self.model = model or BeliefModel()
+        n = len(self.player_names)
+        self.kinds, self.assignments = candidate_assignments(n)
+        self.set_index, self.set_evil, self.multiplicity = evil_seat_sets(n)
+        # 坏人集合上的后验；先验按排列数（即在全部排列上均匀）
+        self.set_weights = self.multiplicity / self.multiplicity.sum()
+        self.version = 0
+        self._roles = list(roles) if roles and all(roles) else None
+        # 座位 -> (各集合下与其视野一致的排列数 (S,), 一致排列的 (S, n, 角色种类) 计数或 None)
+        self._viewer_tables: Dict[Optional[int], list] = {}
+        self._cache: Dict[Tuple[str, Optional[str]], object] = {}
+
+    @classmethod
+    def from_players(cls, players: Sequence, model: Optional[BeliefModel] = None) -> 'RoleBeliefEngine':
+        return cls([p.name for p in players], [p.role for p in players], model)
+
+    # ---- 视野 ----
+
+    def _viewer_mask(self, seat: int) -> np.ndarray:
+        """该座位视角下与其所知信息一致的候选排列。"""
+        roles = self._roles
+        kind_index = {kind: i for i, kind in enumerate(self.kinds)}
+        role = roles[seat]
+        mask = self.assignments[:, seat] == kind_index[role]
+        visible = get_visible_roles(role)
+        if visible:
+            truth = sum(1 << i for i, r in enumerate(roles) if r in visible)
+            mask &= visible_seat_codes(len(roles), visible) == truth
+        return mask
+
+    def _viewer_table(self, seat: Optional[int]) -> list:
+        table = self._viewer_tables.get(seat)
+        if table is None:
+            if seat is None:
+                mask = None
+                counts = self.multiplicity.astype(np.float64)
+            else:
+                mask = self._viewer_mask(seat)
+                counts = np.bincount(self.set_index[mask], minlength=len(self.multiplicity)).astype(np.float64)
+            table = [mask, counts, None]
+            self._viewer_tables[seat] = table
+        return table
+
+    def _viewer_seat(self, viewer: Optional[str]) -> Optional[int]:
+        if viewer is None or self._roles is None:
+            return None
+        return self.seat_by_name.get(viewer)
+
+    def _viewer_set_weights(self, seat: Optional[int]) -> np.ndarray:
+        """视角下各坏人集合的后验：公开后验 × 视野一致的排列占比。"""
+        if seat is None:
+            return self.set_weights
+        counts = self._viewer_table(seat)[1]
+        weights = self.set_weights * counts / self.multiplicity
+        total = weights.sum()
+        return weights / total if total > 0 else self.set_weights
+
+    # ---- 证据 ----
+
+    def _seats(self, names: Sequence[str]) -> np.ndarray:
+        seats = [self.seat_by_name[name] for name in names if name in self.seat_by_name]
+        return np.asarray(seats, dtype=np.intp)
+
+    def _apply(self, likelihood: np.ndarray) -> None:
+        weights = self.set_weights * likelihood
+        total = weights.sum()
+        if total <= 0:
+            # 证据与模型矛盾（如超出规则的失败票），保留原后验
+            return
+        self.set_weights = weights / total
+        self.version += 1
+        self._cache.clear()
+
+    def observe_mission(self, team: Sequence[str], fail_count: int) -> None:
+        """任务结果：队伍与失败票数。"""
+        seats = self._seats(team)
+        evil_on_team = self.set_evil[:, seats].sum(axis=1)
+        p = self.model.evil_fail
+        binom = np.array([
+            comb(e, fail_count) * p ** fail_count * (1 - p) ** (e - fail_count) if fail_count <= e else 0.0
+            for e in range(len(seats) + 1)
+        ])
+        self._apply(binom[evil_on_team])
+
+    def observe_team_vote(self, team: Sequence[str], approve: Sequence[str]) -> None:
+        """已完成的队伍投票：队伍与赞成者名单（其余视为反对）。"""
+        seats = self._seats(team)
+        approved = np.zeros(len(self.player_names), dtype=bool)
+        approved[self._seats(approve)] = True
+        m = self.model
+        team_has_evil = self.set_evil[:, seats].any(axis=1)
+        evil_p = np.where(team_has_evil, m.evil_approve_evil_team, m.evil_approve_clean_team)[:, None]
+        voter_p = np.where(self.set_evil, evil_p, m.good_approve)
+        per_voter = np.where(approved, voter_p, 1.0 - voter_p)
+        self._apply(per_voter.prod(axis=1))
+
+    # ---- 查询 ----
+
+    def evil_probabilities(self, viewer: Optional[str] = None) -> Dict[str, float]:
+        """各座位是坏人的概率（viewer 为 None 时只用公开信息）。"""
+        key = ('evil', viewer)
+        cached = self._cache.get(key)
+        if cached is None:
+            probs = self._viewer_set_weights(self._viewer_seat(viewer)) @ self.set_evil
+            cached = {name: float(p) for name, p in zip(self.player_names, probs)}
+            self._cache[key] = cached
+        return cached
+
+    def team_evil_probabilities(self, teams: np.ndarray, viewer: Optional[str] = None) -> np.ndarray:
+        """各候选队伍含至少一名坏人的概率；teams 为 (T, n) 的布尔矩阵。"""
+        evil_on_team = self.set_evil.astype(np.int8) @ teams.T.astype(np.int8)
+        clean = self._viewer_set_weights(self._viewer_seat(viewer)) @ (evil_on_team == 0)
+        return 1.0 - clean
+
+    def role_marginals(self, viewer: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """各座位各角色的概率。"""
+        key = ('roles', viewer)
+        cached = self._cache.get(key)
+        if cached is None:
+            seat = self._viewer_seat(viewer)
+            table = self._viewer_table(seat)
+            if table[2] is None:
+                # 每个坏人集合下，各座位各角色在一致排列中出现的次数
+                mask, counts = table[0], table[1]
+                rows = self.assignments if mask is None else self.assignments[mask]
+                sets = self.set_index if mask is None else self.set_index[mask]
+                n, k = len(self.player_names), len(self.kinds)
+                flat = (sets[:, None] * n + np.arange(n)) * k + rows
+                role_counts = np.bincount(flat.ravel(), minlength=len(counts) * n * k).reshape(len(counts), n, k)
+                table[2] = role_counts / np.maximum(counts, 1)[:, None, None]
+            marginals = np.tensordot(self._viewer_set_weights(seat), table[2], axes=1)
+            cached = {
+                name: {kind: float(marginals[i, j]) for j, kind in enumerate(self.kinds)}
+                for i, name in enumerate(self.player_names)
+            }
+            self._cache[key] = cached
+        return cached
+
+    def candidate_count(self, viewer: Optional[str] = None) -> int:
+        """与证据（及视角）一致的候选排列数。"""
+        counts = self._viewer_table(self._viewer_seat(viewer))[1]
+        return int(counts[self.set_weights > 0].sum())
@@ -251,6 +251,23 @@ def get_game_description(player_count: int) -> str:
     return description
 
 
+# 视野：各角色开局能看到（但不一定能区分）的角色集合
+ROLE_VISION = {
+    'merlin': frozenset(['morgana', 'assassin', 'oberon', 'minion']),
+    'percival': frozenset(['merlin', 'morgana']),
+}
+EVIL_VISION = frozenset(['morgana', 'assassin', 'mordred', 'minion'])
+
+
+def get_visible_roles(role: str) -> frozenset:
+    """返回该角色开局能看到的角色集合（无视野时为空集）。"""
+    if role in ROLE_VISION:
+        return ROLE_VISION[role]
+    if ROLES.get(role, {}).get('team') == 'evil':
+        return EVIL_VISION
+    return frozenset()
+
+
 def get_role_description(role: str, player_name: str, players: List[Dict[str, Any]]) -> str:
     """根据角色和玩家列表生成角色信息（不含策略和阵营说明）"""
     role_info = ROLES.get(role, {})
@@ -267,14 +284,14 @@ def get_role_description(role: str, player_name: str, players: List[Dict[str, An
     # 获取角色视野信息
     vision_info = ""
     if role == 'merlin':
-        evil_players = [p['name'] for p in players if p['role'] in ['morgana', 'assassin', 'oberon', 'minion']]
+        evil_players = [p['name'] for p in players if p['role'] in ROLE_VISION['merlin']]
         vision_info = f"\n视野信息：你能看到这些坏人: {', '.join(evil_players)}"
     elif role == 'percival':
         merlin_players = [p['name'] for p in players if p['role'] == 'merlin']
         morgana_players = [p['name'] for p in players if p['role'] == 'morgana']
         vision_info = f"\n视野信息：你能看到梅林和莫甘娜: {', '.join(set(merlin_players + morgana_players))}，但无法区分谁是梅林，谁是莫甘娜。"
     elif team == 'evil':
-        evil_players = [p['name'] for p in players if p['role'] in ['morgana', 'assassin', 'mordred', 'minion']]
+        evil_players = [p['name'] for p in players if p['role'] in EVIL_VISION]
         vision_info = f"\n视野信息：你能看到这些坏人同伴: {', '.join(evil_players)}"
 
     return f"""你现在正在扮演阿瓦隆游戏中的角色：{role_name}。
@@ -0,0 +1,243 @@
+"""
+本地抽取式轮次摘要：TextRank 句子排序 + 各玩家投票立场提取，纯 CPU、毫秒级完成。
+
+任务轮次一结束即可生成可用摘要，LLM 摘要（若开启）随后在后台替换。
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from typing import Any, Dict, List, Optional, Set
+
+from .intent_matcher import detect_vote_intent
+
+# 中文分句：句末标点、分号与换行
+_SENTENCE_SPLIT = re.compile(r'(?<=[。！？!?；;…])|\n+')
+_NON_TEXT = re.compile(r'[^\w一-鿿]+')
+_SUSPECT_PATTERN = re.compile(
+    r'(?:怀疑|踩|盯|坏人是|可能是坏人的?是?)\s*(\d{1,2})\s*号?'
+    r'|(\d{1,2})\s*号?\s*(?:是坏人|可疑|很可疑|有问题|是莫甘娜|是刺客|是爪牙|是奥伯伦|是莫德雷德)'
+)
+
+_MIN_SENTENCE_CHARS = 6
+
+
+def split_sentences(text: str) -> List[str]:
+    """按中文标点切分句子，去除过短的碎片。"""
+    sentences = []
+    for part in _SENTENCE_SPLIT.split(text or ''):
+        part = (part or '').strip()
+        if len(_NON_TEXT.sub('', part)) >= _MIN_SENTENCE_CHARS:
+            sentences.append(part)
+    return sentences
+
+
+def _char_bigrams(sentence: str) -> Set[str]:
+    compact = _NON_TEXT.sub('', sentence.lower())
+    return {compact[i:i + 2] for i in range(len(compact) - 1)}
+
+
+def _similarity(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    overlap = len(a & b)
+    if overlap == 0:
+        return 0.0
+    return overlap / (math.log(len(a) + 1) + math.log(len(b) + 1))
+
+
+def rank_sentences(sentences: List[str], damping: float = 0.85, iterations: int = 30) -> List[float]:
+    """TextRank：以字二元组重叠度为边权做 PageRank 迭代，返回每句得分。"""
+    n = len(sentences)
+    if n == 0:
+        return []
+    if n == 1:
+        return [1.0]
+
+    grams = [_char_bigrams(s) for s in sentences]
+    weights = [[0.0] * n for _ in range(n)]
+    out_sums = [0.0] * n
+    for i in range(n):
+        for j in range(i + 1, n):
+            w = _similarity(grams[i], grams[j])
+            if w:
+                weights[i][j] = weights[j][i] = w
+                out_sums[i] += w
+                out_sums[j] += w
+
+    scores = [1.0] * n
+    for _ in range(iterations):
+        new_scores = []
+        for i in range(n):
+            rank = 0.0
+            for j in range(n):
+                if weights[j][i] and out_sums[j]:
+                    rank += weights[j][i] / out_sums[j] * scores[j]
+            new_scores.append((1 - damping) + damping * rank)
+        delta = sum(abs(x - y) for x, y in zip(new_scores, scores))
+        scores = new_scores
+        if delta < 1e-4:
+            break
+    return scores
+
+
+def detect_team_stance(text: str) -> Optional[str]:
+    """识别发言对当前队伍的立场：approve / reject，无法判断时返回 None。"""
+    return detect_vote_intent(text)
+
+
+def extract_player_stances(messages: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """按玩家汇总本轮立场（以最后一次明确表态为准）与其怀疑对象。"""
+    stances: Dict[str, Dict[str, Any]] = {}
+    for msg in messages:
+        player = msg.get('player')
+        if not player or player == 'system':
+            continue
+        content = msg.get('content', '')
+        entry = stances.setdefault(player, {'stance': None, 'suspects': []})
+        stance = detect_team_stance(content)
+        if stance:
+            entry['stance'] = stance
+        for match in _SUSPECT_PATTERN.finditer(content):
+            suspect = match.group(1) or match.group(2)
+            if suspect and suspect != player and suspect not in entry['suspects']:
+                entry['suspects'].append(suspect)
+    return stances
+
+
+def _player_sort_key(name: str):
+    return int(name) if str(name).isdigit() else name
+
+
+def summarize_round_extractive(
+    messages: List[Dict[str, Any]],
+    mission_number: int,
+    mission_result: Optional[Dict[str, Any]] = None,
+    max_chars: int = 150,
+    top_sentences: int = 3,
+) -> str:
+    """生成本轮讨论的抽取式摘要（结果 + 各玩家立场 + TextRank 要点句）。"""
+    speeches = [m for m in messages if m.get('player') and m.get('player') != 'system']
+
+    parts: List[str] = []
+    if mission_result:
+        status = '成功' if mission_result.get('success') else '失败'
+        parts.append(
+            f"第{mission_number}轮队伍{mission_result.get('team')}任务{status}"
+            f"（{mission_result.get('fail_count', 0)}张失败票）。"
+        )
+
+    stances = extract_player_stances(speeches)
+    approve = sorted([p for p, s in stances.items() if s['stance'] == 'approve'], key=_player_sort_key)
+    reject = sorted([p for p, s in stances.items() if s['stance'] == 'reject'], key=_player_sort_key)
+    if approve or reject:
+        parts.append(
+            f"赞成：{'、'.join(approve) or '无'}；反对：{'、'.join(reject) or '无'}。"
+        )
+
+    suspect_counts: Dict[str, int] = {}
+    for entry in stances.values():
+        for suspect in entry['suspects']:
+            suspect_counts[suspect] = suspect_counts.get(suspect, 0) + 1
+    if suspect_counts:
+        ranked = sorted(suspect_counts.items(), key=lambda kv: (-kv[1], _player_sort_key(kv[0])))
+        parts.append('被怀疑：' + '、'.join(f"{name}号({count})" for name, count in ranked[:4]) + '。')
+
+    header = ''.join(parts)
+    budget = max_chars - len(header)
+
+    sentences: List[tuple] = []
+    for msg in speeches:
+        for sentence in split_sentences(msg.get('content', '')):
+            sentences.append((msg['player'], sentence))
+
+    if sentences and budget > 10:
+        scores = rank_sentences([s for _, s in sentences])
+        order = sorted(range(len(sentences)), key=lambda i: -scores[i])
+        chosen: List[int] = []
+        used = len('要点：')
+        for index in order:
+            player, sentence = sentences[index]
+            piece_len = len(player) + 1 + len(sentence)
+            if used + piece_len > budget:
+                continue
+            chosen.append(index)
+            used += piece_len
+            if len(chosen) >= top_sentences:
+                break
+        if chosen:
+            points = ''.join(f"{sentences[i][0]}：{sentences[i][1]}" for i in sorted(chosen))
+            header += '要点：' + points
+
+    return header[:max_chars] if header else '（本轮无有效发言）'
+
+
+def condense_speaker_stances(
+    messages: List[Dict[str, Any]],
+    max_quote_chars: int = 40,
+) -> List[str]:
+    """把一轮发言压缩为每位发言者一行：立场、怀疑对象与其本轮得分最高的一句原话。"""
+    speeches = [m for m in messages if m.get('player') and m.get('player') != 'system']
+    if not speeches:
+        return []
+
+    stances = extract_player_stances(speeches)
+    sentences: List[tuple] = []
+    for msg in speeches:
+        for sentence in split_sentences(msg.get('content', '')):
+            sentences.append((msg['player'], sentence))
+    scores = rank_sentences([s for _, s in sentences])
+    best: Dict[str, tuple] = {}
+    for (player, sentence), score in zip(sentences, scores):
+        if player not in best or score > best[player][0]:
+            best[player] = (score, sentence)
+
+    lines: List[str] = []
+    for player in sorted(stances, key=_player_sort_key):
+        entry = stances[player]
+        parts = [{'approve': '赞成', 'reject': '反对'}.get(entry['stance'], '未明确表态')]
+        if entry['suspects']:
+            parts.append(f"怀疑{'、'.join(entry['suspects'])}")
+        if player in best:
+            quote = best[player][1]
+            if len(quote) > max_quote_chars:
+                quote = quote[:max_quote_chars] + '…'
+            parts.append(f"「{quote}」")
+        lines.append(f"{player}号：{'；'.join(parts)}")
+    return lines
+
+
+def merge_rolling_summary(
+    previous: str,
+    mission_number: int,
+    round_summary: str,
+    max_chars: int = 300,
+) -> str:
+    """把一轮摘要并入整局滚动摘要；超出长度时按 TextRank 保留得分最高的句子（保持原顺序）。"""
+    addition = round_summary.strip()
+    if not addition.startswith(f"第{mission_number}轮"):
+        addition = f"第{mission_number}轮：{addition}"
+    combined = f"{previous}\n{addition}" if previous else addition
+    if len(combined) <= max_chars:
+        return combined
+
+    sentences = split_sentences(combined)
+    if not sentences:
+        return combined[-max_chars:]
+    scores = rank_sentences(sentences)
+    # 新并入轮次的句子加权，保证滚动摘要偏向最近的进展
+    carried = len(split_sentences(previous)) if previous else 0
+    scores = [score * 1.5 if i >= carried else score for i, score in enumerate(scores)]
+    order = sorted(range(len(sentences)), key=lambda i: -scores[i])
+    chosen: List[int] = []
+    seen: Set[str] = set()
+    used = 0
+    for index in order:
+        sentence = sentences[index]
+        if sentence in seen or used + len(sentence) > max_chars:
+            continue
+        chosen.append(index)
+        seen.add(sentence)
+        used += len(sentence)
+    return ''.join(sentences[i] for i in sorted(chosen))
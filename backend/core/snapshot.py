@@ -0,0 +1,185 @@
+"""
+游戏状态的只读快照：按状态版本生成，同一版本内所有并行决策共享同一份快照。
+
+快照与游戏状态结构共享：任务记录、队伍投票记录与消息索引都是只增不改的，
+快照只记录当时的长度（AppendOnlyView），不复制整段历史；少量会原地变化的字段
+（当前队伍、进行中的投票、轮次摘要）在生成快照时复制为不可变对象。
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from .message_index import MessageIndex
+
+
+class FrozenList(tuple):
+    """不可变列表；repr 及与 list 的相等比较与 list 一致，保证写入 prompt 的文本与原先相同，JSON 序列化为数组。"""
+
+    __slots__ = ()
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, list):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return tuple.__eq__(self, other)
+
+    def __ne__(self, other: Any) -> bool:
+        return not self == other
+
+    __hash__ = tuple.__hash__
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    __str__ = __repr__
+
+
+class FrozenDict(dict):
+    """不可变字典；仍是 dict 子类，可直接 JSON 序列化。"""
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("快照为只读，不能修改")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+
+def freeze(value: Any) -> Any:
+    """递归转换为不可变结构：dict → FrozenDict，list/tuple → FrozenList。"""
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(v) for v in value)
+    return value
+
+
+class AppendOnlyView(Sequence):
+    """只增列表的前缀视图：与源列表共享元素，长度固定在生成视图时的长度。"""
+
+    __slots__ = ('_items', '_length')
+
+    def __init__(self, items: List[Any], length: Optional[int] = None):
+        self._items = items
+        self._length = len(items) if length is None else length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FrozenList(self._items[i] for i in range(*index.indices(self._length)))
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('AppendOnlyView index out of range')
+        return self._items[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        items = self._items
+        for i in range(self._length):
+            yield items[i]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, tuple, AppendOnlyView)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class FrozenLog:
+    """只增列表的冻结副本：每条记录只冻结一次，之后各版本快照共享。"""
+
+    def __init__(self, freeze_item: Callable[[Any], Any] = freeze):
+        self._freeze_item = freeze_item
+        self._frozen: List[Any] = []
+
+    def view(self, source: List[Any]) -> AppendOnlyView:
+        for item in source[len(self._frozen):]:
+            self._frozen.append(self._freeze_item(item))
+        return AppendOnlyView(self._frozen)
+
+
+class FrozenMessageIndex:
+    """MessageIndex 在某一时刻的只读视图（接口与 MessageIndex 一致）。"""
+
+    __slots__ = ('_index', '_mission_lengths', '_phase_lengths', '_assassination_length', 'count')
+
+    def __init__(self, index: MessageIndex):
+        self._index = index
+        self._mission_lengths = {m: len(msgs) for m, msgs in index._by_mission.items()}
+        self._phase_lengths = {p: len(msgs) for p, msgs in index._by_phase.items()}
+        self._assassination_length = len(index._assassination)
+        self.count = index.count
+
+    def mission_messages(self, mission: int) -> AppendOnlyView:
+        return AppendOnlyView(
+            self._index.mission_messages(mission), self._mission_lengths.get(mission, 0)
+        )
+
+    def has_mission(self, mission: int) -> bool:
+        return bool(self._mission_lengths.get(mission))
+
+    def phase_messages(self, phase: str) -> AppendOnlyView:
+        return AppendOnlyView(self._index.phase_messages(phase), self._phase_lengths.get(phase, 0))
+
+    def assassination_messages(self) -> AppendOnlyView:
+        return AppendOnlyView(self._index.assassination_messages(), self._assassination_length)
+
+
+class GameSnapshot:
+    """某一状态版本的只读游戏快照。
+
+    fields 只包含 prompt 需要的字段（不含完整消息列表与秘密任务票），
+    project() 为每次决策生成精简的上下文字典，字段值与快照共享。
+    """
+
+    __slots__ = ('version', 'fields', 'message_index', 'prompt_cache', 'player_memories', 'quote_index')
+
+    def __init__(
+        self,
+        version: int,
+        fields: FrozenDict,
+        message_index: FrozenMessageIndex,
+        prompt_cache: Any = None,
+        player_memories: Optional[FrozenDict] = None,
+        quote_index: Any = None,
+    ):
+        self.version = version
+        self.fields = fields
+        self.message_index = message_index
+        self.prompt_cache = prompt_cache
+        # 各 AI 座位的私有记忆 {座位: [(轮次, 记录)]}，仅供对应座位的 prompt 使用
+        self.player_memories = player_memories or FrozenDict()
+        # 历史发言检索索引在快照时刻的视图
+        self.quote_index = quote_index
+
+    def __getitem__(self, key: str) -> Any:
+        return self.fields[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.fields.get(key, default)
+
+    def project(self, **extra: Any) -> Dict[str, Any]:
+        """生成一次决策用的上下文：快照字段 + 仅进程内使用的运行时字段 + 调用方附加字段（如 vote_context）。"""
+        context = dict(self.fields)
+        context['_message_index'] = self.message_index
+        context['_version'] = self.version
+        context['_prompt_cache'] = self.prompt_cache
+        context['_player_memories'] = self.player_memories
+        context['_quote_index'] = self.quote_index
+        context.update(extra)
+        return context
+
+
+def to_jsonable(value: Any) -> Any:
+    """把快照中的视图转换为可 JSON 序列化的结构（用于写日志）。"""
+    if isinstance(value, AppendOnlyView):
+        return list(value)
+    return value
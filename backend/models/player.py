@@ -49,11 +49,19 @@ class Player:
 
 
 class AIPlayer(Player):
-    def __init__(self, name: str, ai_engine: str = 'gpt-3.5', role: Optional[str] = None):
+    def __init__(
+        self,
+        name: str,
+        ai_engine: str = 'gpt-3.5',
+        role: Optional[str] = None,
+        knowledge_limit: int = 8,
+    ):
         super().__init__(name, role)
         self.is_ai = True
         self.ai_engine = ai_engine
         self.knowledge_base = []
+        # 私有记忆条数上限，超出时丢弃最早的条目
+        self.knowledge_limit = knowledge_limit
 
     def decide(self, game_state: Dict[str, Any]) -> Dict[str, Any]:
         """AI 玩家决策逻辑"""
@@ -114,5 +122,7 @@ class AIPlayer(Player):
         return {'action': 'pass', 'reason': '不是刺客'}
 
     def add_knowledge(self, knowledge: str):
-        """添加知识到AI的知识库"""
+        """添加知识到AI的知识库（超出上限时丢弃最早的条目）"""
         self.knowledge_base.append(knowledge)
+        if self.knowledge_limit and len(self.knowledge_base) > self.knowledge_limit:
+            del self.knowledge_base[:-self.knowledge_limit]
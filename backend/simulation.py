@@ -0,0 +1,233 @@
+"""
+无头对局模拟：不接 WebSocket、不做节奏等待、不逐事件打印，端到端跑完 AvalonGame + AIController，
+返回精简的对局记录（胜方、任务结果、组队投票历史、LLM 调用次数与耗时）。
+
+多局在同一个事件循环中并发运行，共享同一个模型客户端；供基准与评估脚本调用，也可直接运行：
+
+    python -m backend.simulation --games 20 --players 7 --concurrency 5
+    python -m backend.simulation --games 3 --no-llm --json results.jsonl
+
+角色发放与本地决策使用全局 random：--seed 仅在 concurrency=1 且模型输出确定时可复现。
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import random
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from .ai.ai_controller import AIController
+from .ai.ai_service import AIService
+from .ai.model_client import BaseModelClient
+from .ai.pacing import PacingClock
+from .core.constants import GAME_STATES
+from .core.game import AvalonGame
+from .core.log_manager import LOG_MODES, LogManager
+from .models.player import AIPlayer
+
+
+@dataclass
+class SimulationResult:
+    """一局模拟的精简记录。"""
+
+    game_id: str
+    player_count: int
+    finished: bool
+    winner: Optional[str]
+    roles: Dict[str, str]
+    missions: List[Dict[str, Any]]
+    team_votes: List[Dict[str, Any]]
+    llm_calls: Dict[str, int]
+    wall_seconds: float
+    pacing_seconds: float
+    team_vote_timing: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def llm_calls_total(self) -> int:
+        return sum(self.llm_calls.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), 'llm_calls_total': self.llm_calls_total}
+
+
+async def simulate_game(
+    player_count: int = 7,
+    model_client: Optional[BaseModelClient] = None,
+    game_id: Optional[str] = None,
+    logs: str = 'off',
+    time_scale: float = 0.0,
+    quiet: bool = True,
+    configure: Optional[Callable[[AIController], None]] = None,
+) -> SimulationResult:
+    """跑完一局全 AI 对局。
+
+    model_client 为 None 时不调用模型（所有决策走本地策略与兜底逻辑）；
+    logs 为 LogManager 的模式，buffered 在对局结束后一次性写入 backend/logs/<game_id>；
+    quiet 时控制器与 AI 服务不打印逐事件信息；
+    configure(controller) 在开局前调用，可覆盖控制器参数（如关闭开局库）。
+    """
+    game_id = game_id or f"sim_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+    game = AvalonGame([AIPlayer(str(i)) for i in range(1, player_count + 1)])
+    log_manager = LogManager(game_id=game_id, mode=logs)
+    ai_service = AIService(model_client=model_client, verbose=not quiet)
+    if model_client is None:
+        ai_service.model_client = None
+    controller = AIController(
+        game,
+        ai_service=ai_service,
+        clock=PacingClock(time_scale),
+        log_manager=log_manager,
+        verbose=not quiet,
+    )
+    if configure:
+        configure(controller)
+
+    error = None
+    start = time.perf_counter()
+    try:
+        await controller.start_auto_play()
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    wall_seconds = time.perf_counter() - start
+    log_manager.flush()
+
+    return SimulationResult(
+        game_id=game_id,
+        player_count=player_count,
+        finished=game.state == GAME_STATES['finished'],
+        winner=getattr(game, 'winner', None),
+        roles={p.name: p.role for p in game.players},
+        missions=[
+            {
+                'mission': r['mission'],
+                'team': list(r['team']),
+                'success': r['success'],
+                'fail_count': r['fail_count'],
+            }
+            for r in game.mission_results
+        ],
+        team_votes=[dict(v) for v in game.team_vote_history],
+        llm_calls=(
+            {action: stats['calls'] for action, stats in ai_service.get_prompt_token_stats().items()}
+            if model_client is not None else {}
+        ),
+        wall_seconds=round(wall_seconds, 3),
+        pacing_seconds=round(controller.clock.virtual_seconds, 3),
+        team_vote_timing=dict(controller.team_vote_timing),
+        error=error,
+    )
+
+
+async def simulate_games(
+    games: int,
+    player_count: int = 7,
+    concurrency: int = 4,
+    model_client: Optional[BaseModelClient] = None,
+    use_llm: bool = True,
+    logs: str = 'off',
+    time_scale: float = 0.0,
+    quiet: bool = True,
+    configure: Optional[Callable[[AIController], None]] = None,
+) -> List[SimulationResult]:
+    """在当前事件循环中并发跑 games 局（同时最多 concurrency 局），按开局顺序返回结果。
+
+    use_llm 为真且未传入 model_client 时，按环境配置创建一个客户端供各局共享；
+    quiet 时屏蔽控制器与 AI 服务的逐事件打印。
+    """
+    if use_llm and model_client is None:
+        model_client = await AIService().ensure_model_client()
+        if model_client is None:
+            print("模型客户端创建失败，所有决策将走本地兜底逻辑", file=sys.stderr)
+    if not use_llm:
+        model_client = None
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    batch = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+
+    async def run(index: int) -> SimulationResult:
+        async with semaphore:
+            return await simulate_game(
+                player_count=player_count,
+                model_client=model_client,
+                game_id=f"sim_{batch}_{index:03d}",
+                logs=logs,
+                time_scale=time_scale,
+                quiet=quiet,
+                configure=configure,
+            )
+
+    return list(await asyncio.gather(*(run(i) for i in range(games))))
+
+
+def summarize(results: List[SimulationResult]) -> Dict[str, Any]:
+    """汇总多局结果：胜率、平均任务数与组队次数、平均 LLM 调用与耗时。"""
+    finished = [r for r in results if r.finished]
+    wins: Dict[str, int] = {}
+    for r in finished:
+        wins[r.winner] = wins.get(r.winner, 0) + 1
+
+    def mean(values: List[float]) -> float:
+        return round(statistics.mean(values), 3) if values else 0.0
+
+    return {
+        'games': len(results),
+        'finished': len(finished),
+        'errors': sum(1 for r in results if r.error),
+        'wins': wins,
+        'avg_missions': mean([len(r.missions) for r in finished]),
+        'avg_team_votes': mean([len(r.team_votes) for r in finished]),
+        'avg_llm_calls': mean([r.llm_calls_total for r in results]),
+        'avg_wall_seconds': mean([r.wall_seconds for r in results]),
+        'avg_pacing_seconds': mean([r.pacing_seconds for r in results]),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="无头跑多局全 AI 阿瓦隆对局")
+    parser.add_argument('--games', type=int, default=10, help="对局数")
+    parser.add_argument('--players', type=int, default=7, choices=range(5, 11), metavar='5-10', help="每局人数")
+    parser.add_argument('--concurrency', type=int, default=4, help="同时进行的最大局数")
+    parser.add_argument('--no-llm', action='store_true', help="不调用模型，全部走本地策略与兜底逻辑")
+    parser.add_argument('--logs', choices=LOG_MODES, default='off', help="对局日志模式（buffered 在每局结束时批量写入）")
+    parser.add_argument('--time-scale', type=float, default=0.0, help="节奏等待缩放系数，0 = 不等待")
+    parser.add_argument('--seed', type=int, default=None, help="全局随机种子（仅 concurrency=1 时可复现）")
+    parser.add_argument('--json', dest='json_path', default=None, help="把每局结果按行写入该 JSONL 文件")
+    parser.add_argument('--verbose', action='store_true', help="保留控制器与 AI 服务的逐事件打印")
+    args = parser.parse_args(argv)
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    results = asyncio.run(simulate_games(
+        games=args.games,
+        player_count=args.players,
+        concurrency=args.concurrency,
+        use_llm=not args.no_llm,
+        logs=args.logs,
+        time_scale=args.time_scale,
+        quiet=not args.verbose,
+    ))
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            for result in results:
+                f.write(json.dumps(result.to_dict(), ensure_ascii=False) + '\n')
+
+    for result in results:
+        status = result.winner if result.finished else f"未结束 {result.error or ''}".strip()
+        print(
+            f"{result.game_id}  胜方 {status:<6} 任务 {''.join('✓' if m['success'] else '✗' for m in result.missions):<5} "
+            f"组队 {len(result.team_votes):>2} 次  LLM {result.llm_calls_total:>3} 次  {result.wall_seconds:.2f}s"
+        )
+    print(json.dumps(summarize(results), ensure_ascii=False, indent=2))
+    return 0 if all(r.finished for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+紧凑规则内核基准：用同一随机策略完整跑对局，对比 AvalonGame 与 CompactGame——
+每局耗时、单局常驻内存；并核对两者按玩家名接口的返回值与最终状态一致。
+
+运行：python -m benchmarks.bench_compact_game
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from backend.core.compact_game import CompactGame
+from backend.core.constants import EVIL_ROLES, GAME_PHASES
+from backend.core.game import AvalonGame
+from backend.models.player import AIPlayer
+
+PLAYER_COUNT = 10
+GAMES = 2000
+# get_game_state 中 CompactGame 不维护的字段
+_SKIPPED_STATE_KEYS = ('messages_history', 'round_discussion_summaries')
+
+
+def new_avalon(seed: int) -> AvalonGame:
+    random.seed(seed)
+    game = AvalonGame([AIPlayer(str(i)) for i in range(1, PLAYER_COUNT + 1)])
+    game.start_game()
+    return game
+
+
+def new_compact(seed: int) -> CompactGame:
+    random.seed(seed)
+    game = CompactGame([str(i) for i in range(1, PLAYER_COUNT + 1)])
+    game.start_game()
+    return game
+
+
+def play(game: Any, rng: random.Random, trace: List[Dict[str, Any]] = None) -> None:
+    """随机策略走完一局：随机选队、随机投票、坏人随机出失败票、随机刺杀。"""
+    names = game.get_available_players()
+    roles = {p['name']: p['role'] for p in game.get_game_state()['players']}
+    evil = {name for name, role in roles.items() if role in EVIL_ROLES}
+
+    def step(result: Dict[str, Any]) -> None:
+        if trace is not None:
+            trace.append(result)
+
+    while game.phase != GAME_PHASES['game_end']:
+        if game.phase == GAME_PHASES['team_selection']:
+            size = game.get_mission_config()['team_size']
+            step(game.select_team(rng.sample(names, size)))
+        elif game.phase == GAME_PHASES['team_vote']:
+            for name in names:
+                step(game.vote_team(name, 'approve' if rng.random() < 0.6 else 'reject'))
+        elif game.phase == GAME_PHASES['mission_vote']:
+            for name in list(game.get_mission_players()):
+                step(game.vote_mission(name, 'fail' if name in evil and rng.random() < 0.7 else 'success'))
+        elif game.phase == GAME_PHASES['assassination']:
+            step(game.assassinate(rng.choice(names)))
+
+
+def comparable_state(game: Any) -> Dict[str, Any]:
+    state = dict(game.get_game_state())
+    for key in _SKIPPED_STATE_KEYS:
+        state.pop(key, None)
+    return state
+
+
+def check_equivalence(games: int) -> int:
+    mismatches = 0
+    for seed in range(games):
+        legacy_trace, compact_trace = [], []
+        legacy, compact = new_avalon(seed), new_compact(seed)
+        play(legacy, random.Random(seed), legacy_trace)
+        play(compact, random.Random(seed), compact_trace)
+        if legacy_trace != compact_trace or comparable_state(legacy) != comparable_state(compact):
+            mismatches += 1
+    return mismatches
+
+
+def time_games(factory: Callable[[int], Any], games: int) -> float:
+    """每局平均耗时（微秒），含建局与开局。"""
+    start = time.perf_counter()
+    for seed in range(games):
+        play(factory(seed), random.Random(seed))
+    return (time.perf_counter() - start) / games * 1e6
+
+
+def resident_bytes(factory: Callable[[int], Any], games: int) -> float:
+    """打完的对局同时保留时，每局平均占用字节数。"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = []
+    for seed in range(games):
+        game = factory(seed)
+        play(game, random.Random(seed))
+        kept.append(game)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del kept
+    return total / games
+
+
+def main() -> int:
+    mismatches = check_equivalence(500)
+    print(f"一致性核对（500 局）: {'通过' if mismatches == 0 else f'{mismatches} 局不一致'}")
+
+    legacy_us = time_games(new_avalon, GAMES)
+    compact_us = time_games(new_compact, GAMES)
+    legacy_bytes = resident_bytes(new_avalon, 300)
+    compact_bytes = resident_bytes(new_compact, 300)
+    print(f"{'':>12} | {'每局耗时(μs)':>12} | {'每局内存(B)':>11}")
+    print(f"{'AvalonGame':>12} | {legacy_us:>12.1f} | {legacy_bytes:>11.0f}")
+    print(f"{'CompactGame':>12} | {compact_us:>12.1f} | {compact_bytes:>11.0f}")
+
+    start = time.perf_counter()
+    rng = random.Random(0)
+    for _ in range(GAMES):
+        game = CompactGame([str(i) for i in range(1, PLAYER_COUNT + 1)])
+        game.start(rng)
+        seats = list(range(PLAYER_COUNT))
+        while game.phase != GAME_PHASES['game_end']:
+            if game.phase == GAME_PHASES['team_selection']:
+                game.select_team_seats(rng.sample(seats, game.team_size()))
+            elif game.phase == GAME_PHASES['team_vote']:
+                for seat in seats:
+                    game.vote_team_seat(seat, rng.random() < 0.6)
+            elif game.phase == GAME_PHASES['mission_vote']:
+                for seat in game.team_order:
+                    game.vote_mission_seat(seat, bool(game.evil_mask >> seat & 1) and rng.random() < 0.7)
+            else:
+                game.assassinate_seat(rng.randrange(PLAYER_COUNT))
+    seat_us = (time.perf_counter() - start) / GAMES * 1e6
+    print(f"{'座位接口':>12} | {seat_us:>12.1f} |")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+对话历史组装基准：对比使用增量消息索引与每次全量回溯（无索引）的耗时随对局规模的变化，
+以及按状态版本缓存共享片段后（一个阶段内 10 个座位各组装一次）的耗时与缓存命中率；
+最后两列为历史块的 token 估算（不限预算 / 按 TOKEN_BUDGET 裁剪后）。
+
+更早轮次的消息数逐级放大，上一轮与当前轮保持固定（输出行数不变）。
+使用增量索引时耗时应保持平稳，无索引时随历史长度线性增长。
+
+运行：python -m benchmarks.bench_dialogue_history
+"""
+
+import sys
+import time
+from typing import Any, Dict
+
+from backend.core.constants import GAME_PHASES
+from backend.core.game import AvalonGame
+from backend.core.prompt_context import estimate_tokens, format_dialogue_history_block
+from backend.models.player import AIPlayer
+
+PLAYER_COUNT = 10
+RECENT_MESSAGES_PER_MISSION = 20
+SEATS = 10
+# 基准中的发言较短，取较小预算以体现裁剪效果
+TOKEN_BUDGET = 800
+
+
+def build_game(older_messages_per_mission: int) -> AvalonGame:
+    """构造处于第 5 轮队伍投票阶段的对局，第 1~3 轮各有指定数量的历史发言。"""
+    game = AvalonGame([AIPlayer(str(i)) for i in range(1, PLAYER_COUNT + 1)])
+    game.start_game()
+    for mission in range(1, 6):
+        game.current_mission = mission
+        game.phase = GAME_PHASES['team_vote']
+        count = older_messages_per_mission if mission <= 3 else RECENT_MESSAGES_PER_MISSION
+        for i in range(count):
+            speaker = str(i % PLAYER_COUNT + 1)
+            game.record_message(speaker, f"第{mission}轮第{i}条发言：我怀疑{(i + 3) % PLAYER_COUNT + 1}号，这车我反对。")
+        if mission < 5:
+            game._append_message({
+                'player': 'system',
+                'content': f"第{mission}轮任务成功（3票成功，0票失败）",
+                'phase': GAME_PHASES['mission_vote'],
+                'mission': mission,
+            })
+            game.set_round_discussion_summary(mission, f"第{mission}轮摘要", source='extractive')
+    return game
+
+
+def time_history(context: Dict[str, Any], repeat: int) -> float:
+    """一个阶段内所有座位各组装一次历史块，返回单次平均耗时（微秒）。"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for seat in range(1, SEATS + 1):
+            format_dialogue_history_block(context, player_name=str(seat))
+    return (time.perf_counter() - start) / (repeat * SEATS) * 1e6
+
+
+def time_history_per_version(game: AvalonGame, repeat: int) -> float:
+    """模拟每个状态版本下 10 个座位依次组装（版本递增使缓存失效），返回单次平均耗时（微秒）。"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        game._bump_version()
+        context = game.get_prompt_context()
+        for seat in range(1, SEATS + 1):
+            format_dialogue_history_block(context, player_name=str(seat))
+    return (time.perf_counter() - start) / (repeat * SEATS) * 1e6
+
+
+def main() -> int:
+    print(
+        f"{'历史消息数':>10} | {'全量回溯(μs)':>12} | {'增量索引(μs)':>12} | "
+        f"{'索引+版本缓存(μs)':>16} | {'缓存命中率':>8} | {'token(不限)':>10} | {'token(预算)':>10}"
+    )
+    for older in (50, 200, 800, 3200):
+        game = build_game(older)
+        legacy = game.get_game_state()
+        indexed = game.get_prompt_context()
+        indexed.pop('_prompt_cache')
+        repeat = 20
+        legacy_us = time_history(legacy, repeat)
+        indexed_us = time_history(indexed, repeat)
+        cached_us = time_history_per_version(game, repeat)
+        stats = game.prompt_cache.get_stats()
+        context = game.get_prompt_context()
+        full_tokens = estimate_tokens(format_dialogue_history_block(context, player_name='1'))
+        budget_tokens = estimate_tokens(
+            format_dialogue_history_block(context, player_name='1', max_tokens=TOKEN_BUDGET)
+        )
+        print(
+            f"{len(game.messages_history):>10} | {legacy_us:>12.1f} | {indexed_us:>12.1f} | "
+            f"{cached_us:>16.1f} | {stats['hit_rate']:>8.1%} | {full_tokens:>10} | {budget_tokens:>10}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+草稿-修订讨论模式基准：用假模型跑队伍投票的讨论阶段，对比逐位预取（自适应深度）与草稿-修订模式的
+讨论耗时、停顿与模型调用次数。
+
+假模型：完整发言延迟 FULL_LATENCY，修订调用（prompt 短、通常只回复“保持”）延迟 REVISION_LATENCY；
+约一半的修订会改写草稿。朗读节奏按缩小后的估算时长真实等待，日志写入临时目录。
+
+运行：python -m benchmarks.bench_draft_refine
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from backend.ai.ai_controller import AIController
+from backend.ai.ai_service import AIService
+from backend.core.game import AvalonGame
+from backend.core.log_manager import LogManager
+from backend.models.player import AIPlayer
+from benchmarks.fake_model import FakeModelClient
+
+ROUNDS = 3
+FULL_LATENCY = 1.0
+REVISION_LATENCY = 0.2
+SPEECHES = ("我先观察一下。", "这个队伍我觉得问题不大，可以考虑。", "目前信息太少，说不好，大家多发言。")
+
+
+async def notify(event, data):
+    pass
+
+
+async def discussion(player_count: int, seed: int, draft_refine: bool, log_dir: str):
+    random.seed(seed)
+    game = AvalonGame([AIPlayer(str(i)) for i in range(1, player_count + 1)])
+    game.start_game()
+    client = FakeModelClient(
+        random.Random(seed), latency=FULL_LATENCY, latencies={'revision': REVISION_LATENCY}, speeches=SPEECHES,
+    )
+    controller = AIController(game, notify, ai_service=AIService(model_client=client))
+    # 控制器构造时已建好 backend/logs 下的空目录：删掉并改写到临时目录
+    try:
+        os.rmdir(controller.log_manager.game_log_dir)
+    except OSError:
+        pass
+    controller.log_manager = LogManager(game_id=log_dir)
+    controller.ai_service.set_log_manager(controller.log_manager)
+    controller.ai_service.start_game(game.players)
+    controller.draft_refine_discussion = draft_refine
+    controller.base_speech_seconds = 0.1
+    controller.per_char_seconds = 0.01
+    controller.min_speech_seconds = 0.2
+
+    start = time.perf_counter()
+    await controller._run_discussion(game.players, controller._get_ai_team_vote_speech)
+    elapsed = time.perf_counter() - start
+    if draft_refine:
+        stall = controller.draft_refine_stats['stall_seconds']
+    else:
+        stall = controller.speech_prefetch.stats['stall_seconds']
+    return elapsed, stall, client.calls, controller.draft_refine_stats
+
+
+async def main() -> int:
+    print(f"{'人数':>4} | {'模式':>6} | {'讨论耗时(s)':>11} | {'总停顿(s)':>9} | {'发言/修订调用':>12} | {'改写/保持':>9}")
+    with tempfile.TemporaryDirectory() as log_dir:
+        for n in (5, 10):
+            for draft_refine in (False, True):
+                elapsed, stalls, calls = [], [], {'speech': 0, 'revision': 0}
+                outcome = {'revised': 0, 'kept': 0}
+                for seed in range(ROUNDS):
+                    seconds, stall, call_counts, stats = await discussion(n, seed, draft_refine, log_dir)
+                    elapsed.append(seconds)
+                    stalls.append(stall)
+                    for key in calls:
+                        calls[key] += call_counts[key]
+                    for key in outcome:
+                        outcome[key] += stats[key]
+                print(
+                    f"{n:>4} | {'草稿修订' if draft_refine else '逐位预取':>6} | {statistics.mean(elapsed):>11.2f} | "
+                    f"{statistics.mean(stalls):>9.2f} | "
+                    f"{calls['speech'] / ROUNDS:>5.1f}/{calls['revision'] / ROUNDS:<6.1f} | "
+                    f"{outcome['revised']:>4}/{outcome['kept']:<4}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+打分策略置信度门控基准：完整对局（AvalonGame）中每个 AI 决策点先询问 HeuristicPolicy，
+统计各阶段置信度达到阈值（即可跳过 LLM）的比例，以及被跳过的决策按真实身份判断的正确率。
+
+未跳过的决策用与 BeliefModel 一致的随机行为代替 LLM；刺杀阶段仅统计一次刺杀目标决策。
+
+运行：python -m benchmarks.bench_heuristic_policy
+"""
+
+import random
+import sys
+import time
+from collections import defaultdict
+
+from backend.ai.heuristic_policy import PHASES, HeuristicPolicy
+from backend.core.constants import EVIL_ROLES, GAME_PHASES
+from backend.core.game import AvalonGame
+from backend.core.role_beliefs import BeliefModel
+from backend.models.player import AIPlayer
+
+GAMES = 300
+MODEL = BeliefModel()
+
+
+def is_correct(phase: str, value, game: AvalonGame, evil: set, player) -> bool:
+    """按真实身份判断被跳过的决策是否正确（坏人的决策只检查是否符合其阵营利益）。"""
+    if phase == 'team_vote':
+        team_has_evil = any(name in evil for name in game.current_team)
+        if player.name in evil:
+            return (value == 'approve') == team_has_evil or game.failed_team_votes >= 4
+        return (value == 'reject') == team_has_evil or game.failed_team_votes >= 4
+    if phase in ('team_selection', 'team_revision'):
+        return player.name in evil or not any(name in evil for name in value)
+    if phase == 'assassination':
+        return next(p for p in game.players if p.name == value).role == 'merlin'
+    return True
+
+
+def run(player_count: int, seed: int, threshold: float, totals: dict, timing: list) -> None:
+    rng = random.Random(seed)
+    random.seed(seed)
+    game = AvalonGame([AIPlayer(str(i)) for i in range(1, player_count + 1)])
+    game.start_game()
+    policy = HeuristicPolicy(game, confidence_threshold=threshold)
+    names = [p.name for p in game.players]
+    evil = {p.name for p in game.players if p.role in EVIL_ROLES}
+
+    def ask(phase, decide, player, *args):
+        start = time.perf_counter()
+        decision = decide(player, *args)
+        timing.append((time.perf_counter() - start) * 1e6)
+        if policy.should_skip_llm(phase, decision):
+            totals[phase]['correct'] += is_correct(phase, decision.value, game, evil, player)
+            return decision.value
+        return None
+
+    while game.phase != GAME_PHASES['game_end']:
+        if game.phase == GAME_PHASES['team_selection']:
+            leader = game.players[game.current_leader_index]
+            size = game.get_mission_config()['team_size']
+            team = ask('team_selection', policy.select_team, leader, names, size) or rng.sample(names, size)
+            # 讨论后的二次确认与初次选队分开统计
+            team = ask('team_revision', policy.keep_team, leader, team, size) or team
+            game.select_team(team)
+        elif game.phase == GAME_PHASES['team_vote']:
+            team_has_evil = any(name in evil for name in game.current_team)
+            votes = []
+            for player in game.players:
+                vote = ask('team_vote', policy.team_vote, player)
+                if vote is None:
+                    if player.name in evil:
+                        p = MODEL.evil_approve_evil_team if team_has_evil else MODEL.evil_approve_clean_team
+                    else:
+                        p = MODEL.good_approve
+                    vote = 'approve' if rng.random() < p else 'reject'
+                votes.append((player.name, vote))
+            for name, vote in votes:
+                game.vote_team(name, vote)
+        elif game.phase == GAME_PHASES['mission_vote']:
+            votes = []
+            for player in game.players:
+                if player.name not in game.current_team:
+                    continue
+                if player.name not in evil:
+                    votes.append((player.name, 'success'))
+                    continue
+                vote = ask('mission_vote', policy.mission_vote, player)
+                votes.append((player.name, vote or ('fail' if rng.random() < MODEL.evil_fail else 'success')))
+            for name, vote in votes:
+                game.vote_mission(name, vote)
+        elif game.phase == GAME_PHASES['assassination']:
+            assassin = game.get_assassin()
+            good = [n for n in names if n not in evil]
+            target = ask('assassination', policy.assassination_target, assassin, good)
+            game.assassinate(target or rng.choice(good))
+
+    for phase, counts in policy.stats.items():
+        totals[phase]['decisions'] += counts['decisions']
+        totals[phase]['skipped'] += counts['skipped']
+
+
+def main() -> int:
+    for threshold in (0.8, 0.9, 0.95):
+        print(f"\n阈值 {threshold}")
+        print(f"{'人数':>4} | " + ' | '.join(f"{phase:>22}" for phase in PHASES) + f" | {'决策耗时(μs)':>11}")
+        for n in (5, 7, 10):
+            totals = defaultdict(lambda: {'decisions': 0, 'skipped': 0, 'correct': 0})
+            timing = []
+            for seed in range(GAMES):
+                run(n, seed, threshold, totals, timing)
+            cells = []
+            for phase in PHASES:
+                t = totals[phase]
+                rate = t['skipped'] / t['decisions'] if t['decisions'] else 0.0
+                accuracy = t['correct'] / t['skipped'] if t['skipped'] else 0.0
+                cells.append(f"跳过 {rate:>5.1%} 正确 {accuracy:>5.1%}")
+            timing.sort()
+            print(f"{n:>4} | " + ' | '.join(f"{c:>22}" for c in cells) + f" | {timing[len(timing) // 2]:>11.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+多级细节历史基准：随对局推进，每轮讨论进行到一半时对话历史块的 token 数——
+原做法（上一轮 + 当前轮完整发言，更早轮次每轮一条摘要）与多级细节（上一轮压缩为各玩家立场，
+更早轮次合并为滚动摘要）对比。
+
+运行：python -m benchmarks.bench_history_lod
+"""
+
+import sys
+
+from backend.core.constants import GAME_PHASES
+from backend.core.game import AvalonGame
+from backend.core.prompt_context import (
+    collect_round_messages,
+    estimate_tokens,
+    format_dialogue_history_block,
+)
+from backend.core.round_summarizer import (
+    condense_speaker_stances,
+    merge_rolling_summary,
+    summarize_round_extractive,
+)
+from backend.models.player import AIPlayer
+from benchmarks.bench_player_memory import PLAYER_COUNT, SPEECH, play_round
+
+
+def finish_round(game: AvalonGame, lod: bool) -> None:
+    """模拟控制器在任务结束后的后台作业：轮次摘要，以及（开启时）立场压缩与滚动摘要。"""
+    result = game.mission_results[-1]
+    mission = result['mission']
+    messages = collect_round_messages(game.messages_history, mission, index=game.message_index)
+    game.set_round_discussion_summary(
+        mission, summarize_round_extractive(messages, mission, result), source='extractive'
+    )
+    if not lod:
+        return
+    game.set_condensed_round(mission, condense_speaker_stances(messages))
+    if mission >= 2:
+        summary = merge_rolling_summary(
+            game.rolling_summary, mission - 1, game.round_discussion_summaries[mission - 1]
+        )
+        game.set_rolling_summary(summary, mission - 1)
+
+
+def half_round_tokens(game: AvalonGame) -> int:
+    size = game.get_mission_config()['team_size']
+    game.select_team([str(i) for i in range(1, size + 1)])
+    for seat in range(1, PLAYER_COUNT // 2 + 1):
+        game.record_message(str(seat), SPEECH.format(me=seat, stance='我赞成', suspect=3, other=7))
+    return estimate_tokens(format_dialogue_history_block(game.get_prompt_context(), player_name='1'))
+
+
+def run(lod: bool) -> list:
+    game = AvalonGame([AIPlayer(str(i)) for i in range(1, PLAYER_COUNT + 1)])
+    game.start_game()
+    tokens = []
+    for fail in (True, False, True, False, False):
+        tokens.append(half_round_tokens(game))
+        # 补齐本轮剩余发言、投票与任务
+        for seat in range(PLAYER_COUNT // 2 + 1, PLAYER_COUNT + 1):
+            game.record_message(str(seat), SPEECH.format(me=seat, stance='我反对', suspect=2, other=6))
+        for player in game.players:
+            game.vote_team(player.name, 'approve')
+        for i, name in enumerate(list(game.current_team)):
+            game.vote_mission(name, 'fail' if fail and i == 0 else 'success')
+        finish_round(game, lod)
+        if game.phase != GAME_PHASES['team_selection']:
+            break
+    return tokens
+
+
+def main() -> int:
+    baseline = run(lod=False)
+    lod = run(lod=True)
+    print(f"{'轮次':>4} | {'原做法 token':>12} | {'多级细节 token':>14}")
+    for mission, (before, after) in enumerate(zip(baseline, lod), start=1):
+        print(f"{mission:>4} | {before:>12} | {after:>14}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
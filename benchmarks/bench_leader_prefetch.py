@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+下一任队长选队预取基准：用固定延迟的假模型跑完整对局，对比开启/关闭预取时
+选队阶段（开场白 + 选队决策 + 公布队伍）的耗时与整局耗时，并统计预取的采用/作废次数。
+
+朗读节奏与结果停顿按缩小后的时长真实等待，日志写入临时目录。
+
+运行：python -m benchmarks.bench_leader_prefetch
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from backend.ai.ai_controller import AIController
+from backend.ai.ai_service import AIService
+from backend.core.game import AvalonGame
+from backend.core.log_manager import LogManager
+from backend.models.player import AIPlayer
+from benchmarks.fake_model import FakeModelClient
+
+GAMES = 2
+LATENCY = 0.4
+
+
+async def notify(event, data):
+    pass
+
+
+async def play(player_count: int, seed: int, prefetch: bool, log_dir: str):
+    random.seed(seed)
+    game = AvalonGame([AIPlayer(str(i)) for i in range(1, player_count + 1)])
+    controller = AIController(game, notify, ai_service=AIService(model_client=FakeModelClient(random.Random(seed), latency=LATENCY)))
+    # 控制器构造时已建好 backend/logs 下的空目录：删掉并改写到临时目录
+    try:
+        os.rmdir(controller.log_manager.game_log_dir)
+    except OSError:
+        pass
+    controller.log_manager = LogManager(game_id=log_dir)
+    controller.ai_service.set_log_manager(controller.log_manager)
+    controller.opening_book_enabled = False
+    controller.leader_prefetch = prefetch
+    controller.heuristic_policy.confidence_threshold = 1.1
+    controller.base_speech_seconds = 0.1
+    controller.per_char_seconds = 0.01
+    controller.min_speech_seconds = 0.2
+    controller.team_vote_result_pause = 0.5
+    controller.auto_delay = 0.0
+
+    selection_times = []
+    handle_team_selection = controller.handle_team_selection
+
+    async def timed_team_selection():
+        start = time.perf_counter()
+        await handle_team_selection()
+        # 第一次选队没有可预取的时机，不计入
+        if game.current_mission > 1 or game.failed_team_votes > 0:
+            selection_times.append(time.perf_counter() - start)
+
+    controller.handle_team_selection = timed_team_selection
+    start = time.perf_counter()
+    await controller.start_auto_play()
+    return time.perf_counter() - start, selection_times, controller.leader_prefetch_stats
+
+
+async def main() -> int:
+    print(f"{'人数':>4} | {'预取':>4} | {'选队耗时(s)':>11} | {'整局耗时(s)':>11} | {'预取 发起/采用/作废':>18}")
+    with tempfile.TemporaryDirectory() as log_dir:
+        for n in (5, 7):
+            for prefetch in (False, True):
+                totals, selections = [], []
+                counts = {'started': 0, 'used': 0, 'discarded': 0}
+                for seed in range(GAMES):
+                    total, selection_times, stats = await play(n, seed, prefetch, log_dir)
+                    totals.append(total)
+                    selections.extend(selection_times)
+                    for key in counts:
+                        counts[key] += stats[key]
+                print(
+                    f"{n:>4} | {'开' if prefetch else '关':>4} | {statistics.mean(selections):>11.2f} | "
+                    f"{statistics.mean(totals):>11.2f} | "
+                    f"{counts['started']:>6}/{counts['used']}/{counts['discarded']}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
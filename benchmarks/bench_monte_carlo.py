@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+批量蒙特卡洛引擎基准：各人数配置 × 基线策略的胜率表与吞吐；
+并用逐局的 CompactGame 跑同一基线策略核对胜率（两者应在抽样误差内一致）。
+
+运行：python -m benchmarks.bench_monte_carlo [每格对局数，默认 1000000]
+"""
+
+import random
+import sys
+import time
+
+from backend.core.compact_game import CompactGame
+from backend.core.constants import GAME_PHASES
+from backend.core.monte_carlo import BASELINE_POLICIES, balance_report, simulate
+
+CHECK_GAMES = 20000
+
+
+def compact_baseline_good_rate(player_count: int, games: int, seed: int = 0) -> float:
+    """逐局跑 AIPlayer 基线策略（随机选队、好人赞成、坏人随机投票并总出失败票、随机刺杀好人）。"""
+    rng = random.Random(seed)
+    seats = list(range(player_count))
+    good = 0
+    for _ in range(games):
+        game = CompactGame([str(i) for i in range(1, player_count + 1)])
+        game.start(rng)
+        while game.phase != GAME_PHASES['game_end']:
+            if game.phase == GAME_PHASES['team_selection']:
+                game.select_team_seats(rng.sample(seats, game.team_size()))
+            elif game.phase == GAME_PHASES['team_vote']:
+                for seat in seats:
+                    evil = game.evil_mask >> seat & 1
+                    game.vote_team_seat(seat, rng.random() < 0.5 if evil else True)
+            elif game.phase == GAME_PHASES['mission_vote']:
+                for seat in game.team_order:
+                    game.vote_mission_seat(seat, bool(game.evil_mask >> seat & 1))
+            else:
+                game.assassinate_seat(rng.choice([s for s in seats if not game.evil_mask >> s & 1]))
+        good += game.winner == 'good'
+    return good / games
+
+
+def main() -> int:
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    start = time.perf_counter()
+    reports = balance_report(games)
+    elapsed = time.perf_counter() - start
+    total = sum(r.games for r in reports)
+    print(f"{'策略':>16} | {'人数':>4} | {'好人胜率':>8} | {'任务3败':>7} | {'否决5次':>7} | {'刺中梅林':>8} | {'平均组队次数':>10}")
+    for r in reports:
+        ends = r.end_counts
+        print(
+            f"{r.policy:>16} | {r.player_count:>4} | {r.good_win_rate:>8.2%} | "
+            f"{ends['evil_missions'] / r.games:>7.2%} | {ends['evil_vote_limit'] / r.games:>7.2%} | "
+            f"{ends['evil_assassination'] / r.games:>8.2%} | {r.avg_team_votes:>10.2f}"
+        )
+    print(f"共 {total} 局，耗时 {elapsed:.1f}s（{total / elapsed / 1e6:.2f} 百万局/秒）")
+
+    print(f"\n与逐局 CompactGame 核对（各 {CHECK_GAMES} 局，基线策略）")
+    ok = True
+    for n in (5, 7, 10):
+        start = time.perf_counter()
+        expected = compact_baseline_good_rate(n, CHECK_GAMES)
+        per_game = time.perf_counter() - start
+        batched = simulate(n, 200_000, BASELINE_POLICIES['baseline'], seed=n).good_win_rate
+        # 逐局结果的抽样标准误约 0.35%，容差取 4 倍
+        close = abs(expected - batched) < 0.015
+        ok &= close
+        print(
+            f"  {n} 人: 逐局 {expected:.2%}（{per_game / CHECK_GAMES * 1e6:.0f}μs/局），"
+            f"批量 {batched:.2%} {'一致' if close else '不一致'}"
+        )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
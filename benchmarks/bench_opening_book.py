@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+开局库基准：连续开多局全 AI 对局，只跑第一轮（队长选队 + 第一次组队的讨论与投票），
+各局共享同一个 OpeningBook，统计随对局累积的选队/发言命中率与第一轮模型调用次数。
+
+假模型客户端固定延迟返回：选队返回含队长的随机队伍，发言返回带座位提及的模板句，投票返回赞成。
+日志写入临时目录，不污染 backend/logs。
+
+运行：python -m benchmarks.bench_opening_book
+"""
+
+import asyncio
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+from backend.ai.ai_controller import AIController
+from backend.ai.ai_service import AIService
+from backend.ai.opening_book import OpeningBook
+from backend.core.game import AvalonGame
+from backend.core.log_manager import LogManager
+from backend.models.player import AIPlayer
+from benchmarks.fake_model import FakeModelClient, format_team
+
+GAMES = 60
+LATENCY = 0.02
+SPEECHES = (
+    "我觉得{a}号和{b}号目前看起来比较可信，这个队伍我赞成。",
+    "{a}号的发言有点奇怪，我先观察一下，倾向支持。",
+    "第1轮信息不多，我同意这个队伍，大家注意{a}号。",
+    "我对{b}号有些怀疑，不过第一轮我还是赞成发车。",
+)
+
+
+class OpeningBookFakeClient(FakeModelClient):
+    """选队返回含队长的随机队伍，发言返回带座位提及的模板句，投票返回赞成。"""
+
+    def team(self, user: str) -> str:
+        available = re.search(r"可选玩家：\[(.*?)\]", user).group(1).replace("'", '').split(', ')
+        size = int(re.search(r"需要选择 (\d+) 名", user).group(1))
+        leader = re.search(r"座位号：(\d+)", user)
+        team = [leader.group(1)] if leader else []
+        team += self.rng.sample([p for p in available if p not in team], size - len(team))
+        return format_team(team)
+
+    def vote(self, system: str) -> str:
+        return "approve"
+
+    def speech(self) -> str:
+        a, b = self.rng.sample(range(1, 6), 2)
+        return self.rng.choice(SPEECHES).format(a=a, b=b)
+
+
+async def first_round(player_count: int, book: OpeningBook, client: OpeningBookFakeClient, log_dir: str) -> float:
+    game = AvalonGame([AIPlayer(str(i)) for i in range(1, player_count + 1)])
+    game.start_game()
+    controller = AIController(game, ai_service=AIService(model_client=client), opening_book=book)
+    # 控制器构造时已建好 backend/logs 下的空目录：删掉并改写到临时目录
+    try:
+        os.rmdir(controller.log_manager.game_log_dir)
+    except OSError:
+        pass
+    controller.log_manager = LogManager(game_id=log_dir)
+    controller.ai_service.set_log_manager(controller.log_manager)
+    controller.ai_service.start_game(game.players)
+    controller.team_vote_result_pause = 0.0
+
+    start = time.perf_counter()
+    await controller.handle_team_selection()
+    await controller.handle_team_vote()
+    return time.perf_counter() - start
+
+
+async def main() -> int:
+    print(f"{'人数':>4} | {'局段':>7} | {'选队命中':>8} | {'发言命中':>8} | {'首轮选队/发言调用':>16} | {'首轮耗时(ms)':>12}")
+    with tempfile.TemporaryDirectory() as log_dir:
+        for n in (5, 7, 10):
+            random.seed(n)
+            book = OpeningBook(rng=random.Random(n))
+            client = OpeningBookFakeClient(random.Random(n), latency=LATENCY, model="opening-book-fake")
+            window = GAMES // 3
+            for segment in range(3):
+                before = {kind: dict(counts) for kind, counts in book.stats.items()}
+                calls_before = dict(client.calls)
+                elapsed = [await first_round(n, book, client, log_dir) for _ in range(window)]
+                rate = {
+                    kind: (book.stats[kind]['hits'] - before[kind]['hits'])
+                    / max(1, book.stats[kind]['lookups'] - before[kind]['lookups'])
+                    for kind in ('team', 'speech')
+                }
+                calls = f"{(client.calls['team_selection'] - calls_before['team_selection']) / window:.2f}/" \
+                        f"{(client.calls['speech'] - calls_before['speech']) / window:.2f}"
+                label = f"{segment * window + 1}-{(segment + 1) * window}"
+                print(f"{n:>4} | {label:>7} | {rate['team']:>8.1%} | {rate['speech']:>8.1%} | {calls:>16} | "
+                      f"{sum(elapsed) / window * 1000:>12.0f}")
+            print(f"     库内条目: {book.get_stats()['entries']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+节奏时钟基准：用零延迟假模型跑完整对局（带前端通知，朗读等待与结果停顿均生效），
+对比不同 time_scale 下的整局耗时与实际等待时间；virtual_seconds 为按实时节奏应等待的总时长。
+
+运行：python -m benchmarks.bench_pacing_clock
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+from backend.ai.ai_controller import AIController
+from backend.ai.ai_service import AIService
+from backend.ai.pacing import PacingClock
+from backend.core.game import AvalonGame
+from backend.core.log_manager import LogManager
+from backend.models.player import AIPlayer
+from benchmarks.fake_model import FakeModelClient
+
+TIME_SCALES = (0.0, 0.001, 0.01)
+
+
+async def notify(event, data):
+    pass
+
+
+async def play(time_scale: float, seed: int, log_dir: str):
+    random.seed(seed)
+    game = AvalonGame([AIPlayer(str(i)) for i in range(1, 8)])
+    clock = PacingClock(time_scale)
+    controller = AIController(
+        game, notify, ai_service=AIService(model_client=FakeModelClient(random.Random(seed))), clock=clock,
+    )
+    # 控制器构造时已建好 backend/logs 下的空目录：删掉并改写到临时目录
+    try:
+        os.rmdir(controller.log_manager.game_log_dir)
+    except OSError:
+        pass
+    controller.log_manager = LogManager(game_id=log_dir)
+    controller.ai_service.set_log_manager(controller.log_manager)
+    controller.opening_book_enabled = False
+
+    start = time.perf_counter()
+    await controller.start_auto_play()
+    return time.perf_counter() - start, clock.get_stats()
+
+
+async def main() -> int:
+    print(f"{'time_scale':>10} | {'整局耗时(s)':>11} | {'实际等待(s)':>11} | {'实时节奏应等待(s)':>17}")
+    with tempfile.TemporaryDirectory() as log_dir:
+        for time_scale in TIME_SCALES:
+            elapsed, stats = await play(time_scale, 0, log_dir)
+            print(f"{time_scale:>10} | {elapsed:>11.2f} | {stats['waited_seconds']:>11.2f} | "
+                  f"{stats['virtual_seconds']:>17.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
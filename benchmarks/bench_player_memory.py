@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+座位私有记忆基准：对比第 5 轮时各座位对话历史块的 token 数——
+更早轮次使用共享轮次摘要（原做法）与使用座位私有记忆（每轮一条）。
+
+对局按真实流程推进（选队、发言、队伍投票、任务投票），第 1~4 轮结束后写入
+约 150 字的轮次摘要并批量生成座位记忆。
+
+运行：python -m benchmarks.bench_player_memory
+"""
+
+import statistics
+import sys
+import time
+
+from backend.core.game import AvalonGame
+from backend.core.player_memory import build_round_memory_notes
+from backend.core.prompt_context import (
+    collect_round_messages,
+    estimate_tokens,
+    format_dialogue_history_block,
+)
+from backend.models.player import AIPlayer
+
+PLAYER_COUNT = 10
+SPEECH = (
+    "我是{me}号。这车{stance}，我怀疑{suspect}号，他上一轮发言前后矛盾，"
+    "而且投票和表态对不上，我会盯着他的任务票。大家也可以多看看{other}号的反应。"
+)
+SUMMARY = (
+    "队伍{team}任务{status}。多数玩家赞成发车，{suspect}号被集中怀疑，理由是发言与投票矛盾；"
+    "{other}号替{suspect}号辩护引起注意。队长解释了选人逻辑，认为上轮任务成员相对可信，"
+    "但仍有人质疑队伍中有人隐藏身份，建议下一轮换人观察任务票走向。"
+)
+
+
+def play_round(game: AvalonGame, fail: bool) -> None:
+    size = game.get_mission_config()['team_size']
+    leader = int(game.players[game.current_leader_index].name)
+    team = [str((leader - 1 + i) % PLAYER_COUNT + 1) for i in range(size)]
+    game.select_team(team)
+    for seat in range(1, PLAYER_COUNT + 1):
+        game.record_message(str(seat), SPEECH.format(
+            me=seat,
+            stance='我赞成' if seat % 3 else '我反对',
+            suspect=(seat + 3) % PLAYER_COUNT + 1,
+            other=(seat + 5) % PLAYER_COUNT + 1,
+        ))
+    for player in game.players:
+        game.vote_team(player.name, 'approve')
+    for i, name in enumerate(list(game.current_team)):
+        game.vote_mission(name, 'fail' if fail and i == 0 else 'success')
+
+
+def build_game(with_memory: bool) -> AvalonGame:
+    game = AvalonGame([AIPlayer(str(i)) for i in range(1, PLAYER_COUNT + 1)])
+    game.start_game()
+    for mission, fail in zip(range(1, 5), (True, False, True, False)):
+        play_round(game, fail)
+        result = game.mission_results[-1]
+        game.set_round_discussion_summary(mission, SUMMARY.format(
+            team=result['team'],
+            status='成功' if result['success'] else '失败',
+            suspect=mission + 2,
+            other=mission + 4,
+        ), source='llm')
+        if with_memory:
+            notes = build_round_memory_notes(
+                [p.name for p in game.players],
+                mission,
+                collect_round_messages(game.messages_history, mission, index=game.message_index),
+                result,
+                [r for r in game.team_vote_history if r.get('mission') == mission],
+            )
+            game.record_player_memories(mission, notes)
+    # 第 5 轮讨论进行到一半
+    game.select_team([str(i) for i in range(1, game.get_mission_config()['team_size'] + 1)])
+    for seat in range(1, PLAYER_COUNT // 2 + 1):
+        game.record_message(str(seat), SPEECH.format(me=seat, stance='我赞成', suspect=3, other=7))
+    return game
+
+
+def seat_tokens(game: AvalonGame) -> tuple:
+    """各座位整块 token 数，以及其中更早轮次部分（共享摘要或私有记忆行）的 token 数。"""
+    context = game.get_prompt_context()
+    totals, older = [], []
+    for seat in range(1, PLAYER_COUNT + 1):
+        block = format_dialogue_history_block(context, player_name=str(seat))
+        totals.append(estimate_tokens(block))
+        older.append(sum(
+            estimate_tokens(line) for line in block.splitlines()
+            if line.startswith(('【第', '【我的记忆】'))
+        ))
+    return totals, older
+
+
+def main() -> int:
+    baseline = build_game(with_memory=False)
+    with_memory = build_game(with_memory=True)
+
+    before, older_before = seat_tokens(baseline)
+    after, older_after = seat_tokens(with_memory)
+    print(f"第 {baseline.current_mission} 轮对话历史块 token（{PLAYER_COUNT} 个座位平均，括号内为更早轮次部分）")
+    print(f"  共享摘要: {statistics.mean(before):.0f}（{statistics.mean(older_before):.0f}）")
+    print(f"  私有记忆: {statistics.mean(after):.0f}（{statistics.mean(older_after):.0f}）")
+    print(
+        f"  节省: 整块 {1 - statistics.mean(after) / statistics.mean(before):.1%}，"
+        f"更早轮次部分 {1 - statistics.mean(older_after) / statistics.mean(older_before):.1%}"
+    )
+
+    round_messages = collect_round_messages(with_memory.messages_history, 4, index=with_memory.message_index)
+    start = time.perf_counter()
+    for _ in range(100):
+        build_round_memory_notes(
+            [p.name for p in with_memory.players], 4, round_messages, with_memory.mission_results[-1], []
+        )
+    print(f"一轮记忆批量生成耗时: {(time.perf_counter() - start) * 10:.2f}ms")
+
+    sample = with_memory.players[0]
+    print(f"座位 {sample.name} 的记忆示例: {sample.knowledge_base[0]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
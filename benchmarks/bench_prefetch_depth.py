@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+自适应发言预取深度基准：用假模型在不同延迟分布下跑讨论发言队列，对比固定深度 1、固定深度 3 与自适应深度的
+- 每位发言的平均停顿（等待发言就绪的时间）；
+- 发言 prompt 的上下文滞后：生成时尚未听到、但在其朗读前已经说出的前面发言条数（越大越“过时”）。
+
+朗读节奏按缩小后的估算时长真实等待，日志写入临时目录。
+
+运行：python -m benchmarks.bench_prefetch_depth
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+
+from backend.ai.ai_controller import AIController
+from backend.ai.ai_service import AIService
+from backend.core.game import AvalonGame
+from backend.core.log_manager import LogManager
+from backend.models.player import AIPlayer
+from benchmarks.fake_model import FakeModelClient
+
+PLAYERS = 10
+ROUNDS = 3
+# (名称, 延迟均值, 抖动)；朗读时长约 0.2~0.3s
+REGIMES = (('低延迟', 0.05, 0.02), ('中延迟', 0.3, 0.1), ('高延迟', 0.8, 0.3))
+SPEECHES = ("我先观察一下。", "这个队伍我觉得问题不大，可以考虑。", "目前信息太少，说不好，大家多发言。")
+
+
+async def notify(event, data):
+    pass
+
+
+async def discussion(controller: AIController, game: AvalonGame):
+    """跑一轮全员讨论，返回每位发言的上下文滞后条数。"""
+    seen = {}
+    lags = []
+
+    async def fetch(player):
+        seen[player.name] = len(lags)
+        return await controller._get_ai_team_vote_speech(player)
+
+    def on_spoken(index, player):
+        # 轮到该玩家时前面已说出的发言数，减去生成其发言时已听到的
+        lags.append(index - seen[player.name])
+
+    await controller._run_prefetched_speeches(game.players, fetch, on_spoken=on_spoken)
+    return lags
+
+
+async def run(mode: str, latency: float, jitter: float, seed: int, log_dir: str):
+    random.seed(seed)
+    game = AvalonGame([AIPlayer(str(i)) for i in range(1, PLAYERS + 1)])
+    game.start_game()
+    client = FakeModelClient(random.Random(seed), latency=latency, jitter=jitter, speeches=SPEECHES)
+    controller = AIController(game, notify, ai_service=AIService(model_client=client))
+    # 控制器构造时已建好 backend/logs 下的空目录：删掉并改写到临时目录
+    try:
+        os.rmdir(controller.log_manager.game_log_dir)
+    except OSError:
+        pass
+    controller.log_manager = LogManager(game_id=log_dir)
+    controller.ai_service.set_log_manager(controller.log_manager)
+    controller.ai_service.start_game(game.players)
+    controller.base_speech_seconds = 0.1
+    controller.per_char_seconds = 0.01
+    controller.min_speech_seconds = 0.2
+    policy = controller.speech_prefetch
+    policy.enabled = mode == 'adaptive'
+    if mode != 'adaptive':
+        policy.initial_depth = int(mode)
+
+    lags = []
+    for _ in range(ROUNDS):
+        lags.extend(await discussion(controller, game))
+    return policy.get_stats(), lags
+
+
+async def main() -> int:
+    print(f"{'延迟':>6} | {'深度':>6} | {'平均停顿(s)':>11} | {'停顿次数':>8} | {'上下文滞后':>10} | {'深度分布'}")
+    with tempfile.TemporaryDirectory() as log_dir:
+        for label, latency, jitter in REGIMES:
+            for mode in ('1', '3', 'adaptive'):
+                stats, lags = await run(mode, latency, jitter, 0, log_dir)
+                print(
+                    f"{label:>6} | {'自适应' if mode == 'adaptive' else '固定' + mode:>6} | "
+                    f"{stats['mean_stall_seconds']:>11.3f} | {stats['stalls']:>8} | "
+                    f"{statistics.mean(lags):>10.2f} | {stats['depths']}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+角色后验基准：按与 BeliefModel 一致的行为（好人按概率赞成、坏人偏向赞成含坏人的队伍、
+坏人按概率出失败票）跑完整对局（AvalonGame），统计
+- 开局建表、每次证据更新（队伍投票 / 任务结果）、首次与缓存命中查询的耗时；
+- 后验质量：对局结束时真坏人与真好人的平均坏人概率（公开视角与忠臣视角）。
+
+运行：python -m benchmarks.bench_role_beliefs
+"""
+
+import random
+import statistics
+import sys
+import time
+
+from backend.core.constants import EVIL_ROLES, GAME_PHASES
+from backend.core.game import AvalonGame
+from backend.core.role_beliefs import BeliefModel, RoleBeliefEngine
+from backend.models.player import AIPlayer
+
+GAMES = 200
+MODEL = BeliefModel()
+
+
+def timed(samples: list, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    samples.append((time.perf_counter() - start) * 1e6)
+    return result
+
+
+def run(player_count: int, seed: int, timings: dict, quality: dict) -> None:
+    rng = random.Random(seed)
+    random.seed(seed)
+    game = AvalonGame([AIPlayer(str(i)) for i in range(1, player_count + 1)])
+    start = time.perf_counter()
+    game.start_game()
+    timings['start_game'].append((time.perf_counter() - start) * 1e6)
+    beliefs = game.role_beliefs
+    names = [p.name for p in game.players]
+    evil = {p.name for p in game.players if p.role in EVIL_ROLES}
+
+    # 证据更新在 AvalonGame 内部触发；此处包装计时
+    observe_vote, observe_mission = beliefs.observe_team_vote, beliefs.observe_mission
+    beliefs.observe_team_vote = lambda *a: timed(timings['team_vote'], observe_vote, *a)
+    beliefs.observe_mission = lambda *a: timed(timings['mission'], observe_mission, *a)
+
+    while game.phase not in (GAME_PHASES['game_end'], GAME_PHASES['assassination']):
+        if game.phase == GAME_PHASES['team_selection']:
+            game.select_team(rng.sample(names, game.get_mission_config()['team_size']))
+        elif game.phase == GAME_PHASES['team_vote']:
+            team_has_evil = any(name in evil for name in game.current_team)
+            for name in names:
+                if name in evil:
+                    p = MODEL.evil_approve_evil_team if team_has_evil else MODEL.evil_approve_clean_team
+                else:
+                    p = MODEL.good_approve
+                game.vote_team(name, 'approve' if rng.random() < p else 'reject')
+        elif game.phase == GAME_PHASES['mission_vote']:
+            for name in list(game.current_team):
+                fail = name in evil and rng.random() < MODEL.evil_fail
+                game.vote_mission(name, 'fail' if fail else 'success')
+        timed(timings['query'], beliefs.evil_probabilities, None)
+        timed(timings['query_cached'], beliefs.evil_probabilities, None)
+
+    loyal = next(p.name for p in game.players if p.role == 'loyal_servant')
+    for label, viewer in (('public', None), ('loyal', loyal)):
+        probs = game.get_role_beliefs(viewer)
+        quality[label]['evil'].extend(probs[n] for n in names if n in evil and n != viewer)
+        quality[label]['good'].extend(probs[n] for n in names if n not in evil and n != viewer)
+
+
+def main() -> int:
+    print(f"{'人数':>4} | {'开局(μs)':>9} | {'投票更新(μs)':>11} | {'任务更新(μs)':>11} | {'查询(μs)':>9} | "
+          f"{'缓存查询(μs)':>11} | {'公开: 坏/好':>11} | {'忠臣: 坏/好':>11}")
+    for n in range(5, 11):
+        timings = {k: [] for k in ('start_game', 'team_vote', 'mission', 'query', 'query_cached')}
+        quality = {label: {'evil': [], 'good': []} for label in ('public', 'loyal')}
+        for seed in range(GAMES):
+            run(n, seed, timings, quality)
+        med = {k: statistics.median(v) for k, v in timings.items()}
+        q = {
+            label: f"{statistics.mean(v['evil']):.2f}/{statistics.mean(v['good']):.2f}"
+            for label, v in quality.items()
+        }
+        print(
+            f"{n:>4} | {med['start_game']:>9.0f} | {med['team_vote']:>11.0f} | {med['mission']:>11.0f} | "
+            f"{med['query']:>9.0f} | {med['query_cached']:>11.2f} | {q['public']:>11} | {q['loyal']:>11}"
+        )
+    engine = RoleBeliefEngine([str(i) for i in range(1, 11)])
+    print(f"10 人局候选排列数: {engine.candidate_count()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
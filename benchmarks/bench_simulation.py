@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+无头模拟基准：用固定延迟的假模型通过 backend.simulation 跑多局完整对局，
+对比不同并发度下的总耗时与单局平均耗时（同一事件循环内并发），并输出汇总统计。
+
+运行：python -m benchmarks.bench_simulation
+"""
+
+import asyncio
+import random
+import sys
+import time
+
+from backend.simulation import simulate_games, summarize
+from benchmarks.fake_model import FakeModelClient
+
+GAMES = 8
+LATENCY = 0.05
+
+
+async def main() -> int:
+    print(f"{'并发':>4} | {'总耗时(s)':>9} | {'单局耗时(s)':>11} | {'完成':>4} | {'平均 LLM 调用':>12} | {'胜方'}")
+    for concurrency in (1, 4, GAMES):
+        random.seed(0)
+        start = time.perf_counter()
+        results = await simulate_games(
+            GAMES,
+            player_count=7,
+            concurrency=concurrency,
+            model_client=FakeModelClient(random.Random(0), latency=LATENCY),
+        )
+        elapsed = time.perf_counter() - start
+        summary = summarize(results)
+        print(f"{concurrency:>4} | {elapsed:>9.2f} | {summary['avg_wall_seconds']:>11.2f} | "
+              f"{summary['finished']:>4} | {summary['avg_llm_calls']:>12.1f} | {summary['wins']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+决策上下文基准：对比每次决策调用 get_game_state()（原做法）与按版本共享快照后取精简投影
+的耗时与内存分配，模拟一个投票阶段内 10 个座位并行决策。
+
+运行：python -m benchmarks.bench_snapshot
+"""
+
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+from benchmarks.bench_dialogue_history import SEATS, build_game
+
+
+def measure(build: Callable[[], object], repeat: int) -> tuple:
+    """返回单次平均耗时（微秒）与单次平均分配字节数。"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        build()
+    elapsed_us = (time.perf_counter() - start) / repeat * 1e6
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [build() for _ in range(repeat)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del kept
+    return elapsed_us, allocated / repeat
+
+
+def main() -> int:
+    print(f"{'历史消息数':>10} | {'get_game_state(μs)':>18} | {'快照投影(μs)':>12} | {'原分配(B)':>10} | {'快照分配(B)':>10}")
+    for older in (50, 800, 3200):
+        game = build_game(older)
+        repeat = 200
+
+        def per_phase_legacy():
+            return [game.get_game_state() for _ in range(SEATS)]
+
+        def per_phase_snapshot():
+            # 每个阶段状态版本变化一次，之后各座位共享同一快照
+            game._bump_version()
+            snapshot = game.snapshot()
+            return [snapshot.project() for _ in range(SEATS)]
+
+        legacy_us, legacy_bytes = measure(per_phase_legacy, repeat)
+        snapshot_us, snapshot_bytes = measure(per_phase_snapshot, repeat)
+        print(
+            f"{len(game.messages_history):>10} | {legacy_us:>18.1f} | {snapshot_us:>12.1f} | "
+            f"{legacy_bytes:>10.0f} | {snapshot_bytes:>10.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
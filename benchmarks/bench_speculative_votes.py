@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+投机投票基准：用固定延迟的假模型跑队伍投票阶段（讨论 → 队长改队 → 全员投票），
+对比开启/关闭投机计算时的阶段总耗时、讨论结束到投票完成的耗时，以及投机结果的采用率。
+
+假模型：讨论发言约一半带明确表态、一半模糊（需 LLM 投票）；队长约 20% 的情况改队（此时投机投票失效）。
+朗读节奏按缩小后的估算时长真实等待，日志写入临时目录。
+
+运行：python -m benchmarks.bench_speculative_votes
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from backend.ai.ai_controller import AIController
+from backend.ai.ai_service import AIService
+from backend.core.constants import GAME_PHASES
+from backend.core.game import AvalonGame
+from backend.core.log_manager import LogManager
+from backend.models.player import AIPlayer
+from benchmarks.fake_model import FakeModelClient
+
+ROUNDS = 6
+LATENCY = 0.25
+SPEECHES = (
+    "这个队伍我赞成，没看到明显问题。",
+    "我会投反对，队伍里有人发言不太对劲。",
+    "先听听大家的意见，我再想想。",
+    "目前信息太少，说不好。",
+)
+
+
+async def notify(event, data):
+    pass
+
+
+async def team_vote_phase(player_count: int, seed: int, speculative: bool, log_dir: str):
+    random.seed(seed)
+    game = AvalonGame([AIPlayer(str(i)) for i in range(1, player_count + 1)])
+    game.start_game()
+    client = FakeModelClient(
+        random.Random(seed), latency=LATENCY, speeches=SPEECHES, team_change_rate=0.2, model="speculation-fake",
+    )
+    controller = AIController(game, notify, ai_service=AIService(model_client=client))
+    # 控制器构造时已建好 backend/logs 下的空目录：删掉并改写到临时目录
+    try:
+        os.rmdir(controller.log_manager.game_log_dir)
+    except OSError:
+        pass
+    controller.log_manager = LogManager(game_id=log_dir)
+    controller.ai_service.set_log_manager(controller.log_manager)
+    controller.ai_service.start_game(game.players)
+    controller.opening_book_enabled = False
+    controller.speculative_votes = speculative
+    controller.heuristic_policy.confidence_threshold = 1.1
+    controller.base_speech_seconds = 0.05
+    controller.per_char_seconds = 0.005
+    controller.min_speech_seconds = 0.1
+    controller.team_vote_result_pause = 0.0
+
+    leader = game.players[game.current_leader_index]
+    size = game.get_mission_config()['team_size']
+    others = [p.name for p in game.players if p is not leader]
+    game.select_team([leader.name] + random.Random(seed).sample(others, size - 1))
+    assert game.phase == GAME_PHASES['team_vote']
+
+    await controller.handle_team_vote()
+    return controller.team_vote_timing, controller.speculation_stats, client.total_calls
+
+
+async def main() -> int:
+    print(f"{'人数':>4} | {'投机':>4} | {'阶段耗时(s)':>11} | {'讨论后耗时(s)':>13} | {'模型调用':>8} | "
+          f"{'投票采用/失效':>12} | {'改队采用/失效':>12}")
+    with tempfile.TemporaryDirectory() as log_dir:
+        for n in (5, 7, 10):
+            for speculative in (False, True):
+                phase, after, calls = [], [], []
+                votes = {'committed': 0, 'stale': 0}
+                revisions = {'committed': 0, 'stale': 0}
+                for seed in range(ROUNDS):
+                    timing, stats, call_count = await team_vote_phase(n, seed, speculative, log_dir)
+                    phase.append(timing['total_seconds'])
+                    after.append(timing['after_discussion_seconds'])
+                    calls.append(call_count)
+                    for key in votes:
+                        votes[key] += stats['team_vote'][key]
+                        revisions[key] += stats['team_revision'][key]
+                print(
+                    f"{n:>4} | {'开' if speculative else '关':>4} | {statistics.mean(phase):>11.2f} | "
+                    f"{statistics.mean(after):>13.2f} | {statistics.mean(calls):>8.1f} | "
+                    f"{votes['committed']:>5}/{votes['stale']:<6} | {revisions['committed']:>5}/{revisions['stale']:<6}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    code = asyncio.run(main())
+    print(f"总耗时 {time.perf_counter() - start:.1f}s")
+    sys.exit(code)
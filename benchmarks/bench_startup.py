@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+启动耗时基准：导入 API 模块的耗时与首个 /health 响应耗时，并防止回归。
+
+每次测量在全新的子进程中进行（避免模块缓存），取中位数；同时检查导入路径上
+没有导入提供商 SDK（openai / zhipuai），也没有创建模型客户端。超出阈值时返回非零退出码。
+
+运行：python -m benchmarks.bench_startup [--runs 5] [--max-import-ms 1500] [--max-health-ms 200]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+_PROBE = r"""
+import asyncio, json, sys, time
+
+t0 = time.perf_counter()
+import importlib
+app_module = importlib.import_module("backend.api.app")
+import_ms = (time.perf_counter() - t0) * 1000
+
+sdk_loaded = [name for name in ("openai", "zhipuai") if name in sys.modules]
+client_created = app_module.ai_service._model_client_initialized
+
+import httpx
+
+async def first_health():
+    async with httpx.AsyncClient(app=app_module.app, base_url="http://bench") as client:
+        t1 = time.perf_counter()
+        response = await client.get("/health")
+        return (time.perf_counter() - t1) * 1000, response.status_code
+
+health_ms, status = asyncio.run(first_health())
+print(json.dumps({
+    "import_ms": import_ms,
+    "health_ms": health_ms,
+    "status": status,
+    "sdk_loaded": sdk_loaded,
+    "client_created": client_created,
+}))
+"""
+
+
+def _run_probe(root: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=root)
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=root,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="启动耗时基准")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=1500.0)
+    parser.add_argument("--max-health-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    samples = [_run_probe(root) for _ in range(args.runs)]
+
+    import_ms = statistics.median(s["import_ms"] for s in samples)
+    health_ms = statistics.median(s["health_ms"] for s in samples)
+    sdk_loaded = sorted({name for s in samples for name in s["sdk_loaded"]})
+    client_created = any(s["client_created"] for s in samples)
+
+    print(f"导入 backend.api.app 中位耗时: {import_ms:.1f}ms（阈值 {args.max_import_ms:.0f}ms）")
+    print(f"首个 /health 响应中位耗时: {health_ms:.1f}ms（阈值 {args.max_health_ms:.0f}ms）")
+    print(f"导入路径上的提供商 SDK: {sdk_loaded or '无'}")
+    print(f"导入时创建模型客户端: {'是' if client_created else '否'}")
+
+    failures = []
+    if import_ms > args.max_import_ms:
+        failures.append("导入耗时超出阈值")
+    if health_ms > args.max_health_ms:
+        failures.append("/health 首次响应超出阈值")
+    if sdk_loaded:
+        failures.append(f"导入时加载了提供商 SDK: {sdk_loaded}")
+    if client_created:
+        failures.append("导入时创建了模型客户端")
+    if any(s["status"] != 200 for s in samples):
+        failures.append("/health 返回非 200")
+
+    if failures:
+        print("❌ 启动基准回归: " + "；".join(failures))
+        return 1
+    print("✅ 启动基准通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+校验 /game/reset 之后不再发生任何模型调用。
+
+用计数的假模型客户端替换真实提供商，启动一局全 AI 游戏，在讨论/投票进行中调用重置接口，
+随后再等待一段时间，断言重置之后没有新的模型请求发出，且进行中的请求均被取消。
+
+运行：python -m benchmarks.check_reset_cancellation
+"""
+
+import asyncio
+import importlib
+import sys
+import time
+
+from backend.ai.model_client import BaseModelClient, ModelCallResult
+
+# backend.api 包导出了同名的 FastAPI 实例 app，这里需要的是模块本身
+app_module = importlib.import_module("backend.api.app")
+
+
+class CountingModelClient(BaseModelClient):
+    """记录每次请求的开始/结束时刻，固定延迟后返回赞成。"""
+
+    model = "counting-fake"
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.started = []
+        self.finished = []
+        self.cancelled = 0
+
+    async def chat_completion(self, messages, **kwargs) -> ModelCallResult:
+        self.started.append(time.perf_counter())
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        self.finished.append(time.perf_counter())
+        return ModelCallResult(success=True, content="approve")
+
+    async def stream_chat_completion(self, messages, **kwargs):
+        yield "approve"
+
+
+async def main(run_seconds: float = 1.5, settle_seconds: float = 2.0) -> int:
+    config = app_module.GameConfig(players=[
+        app_module.PlayerConfig(name=str(i)) for i in range(1, 8)
+    ])
+    await app_module.start_game(config)
+
+    controller = app_module.ai_controller
+    client = CountingModelClient(latency=0.3)
+    controller.ai_service.model_client = client
+    controller.base_speech_seconds = 0.0
+    controller.per_char_seconds = 0.0
+    controller.min_speech_seconds = 0.05
+    controller.team_vote_result_pause = 0.1
+
+    await asyncio.sleep(run_seconds)
+    before_reset = len(client.started)
+    reset_at = time.perf_counter()
+    await app_module.reset_game()
+    reset_done = time.perf_counter()
+
+    await asyncio.sleep(settle_seconds)
+    started_after = [t for t in client.started if t > reset_done]
+    finished_after = [t for t in client.finished if t > reset_done]
+
+    print(f"重置前模型请求数: {before_reset}")
+    print(f"重置耗时: {(reset_done - reset_at) * 1000:.1f}ms")
+    print(f"重置时被取消的进行中请求: {client.cancelled}")
+    print(f"重置后新发出的请求: {len(started_after)}，重置后完成的请求: {len(finished_after)}")
+    print(f"控制器剩余未完成任务: {controller.task_scope.pending_count()}")
+
+    assert before_reset > 0, "重置前应已有模型请求，否则校验无意义"
+    assert not started_after, "重置后不应再发出模型请求"
+    assert not finished_after, "重置后不应再有模型请求完成"
+    assert controller.task_scope.pending_count() == 0, "重置后不应残留 AI 任务"
+    print("✅ 重置后无模型调用")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+校验 SingleFlight 的取消语义：
+- 同 key 并发请求共享一次调用；
+- 部分等待者取消时，其余等待者仍拿到结果；
+- 最后一个等待者取消后立刻以同 key 重新请求，会新建任务并正常返回，而不是拿到将被取消的旧任务。
+
+运行：python -m benchmarks.check_single_flight
+"""
+
+import asyncio
+import sys
+
+from backend.ai.single_flight import SingleFlight
+
+
+async def main() -> int:
+    flight = SingleFlight()
+    started = []
+
+    async def work(value: str) -> str:
+        started.append(value)
+        await asyncio.sleep(0.05)
+        return value
+
+    # 共享：两个并发请求只执行一次
+    results = await asyncio.gather(flight.run('k', lambda: work('a')), flight.run('k', lambda: work('b')))
+    assert results == ['a', 'a'] and started == ['a'], (results, started)
+    print(f"并发共享: {results}，实际执行 {len(started)} 次")
+
+    # 部分取消：A 取消后 B 仍拿到结果
+    started.clear()
+    a = asyncio.ensure_future(flight.run('k', lambda: work('a')))
+    b = asyncio.ensure_future(flight.run('k', lambda: work('b')))
+    await asyncio.sleep(0)
+    a.cancel()
+    assert await b == 'a' and started == ['a'], started
+    print("部分等待者取消: 其余等待者正常返回")
+
+    # 最后一个等待者取消后立刻重新请求同 key
+    started.clear()
+    a = asyncio.ensure_future(flight.run('k', lambda: work('a')))
+    await asyncio.sleep(0)
+    a.cancel()
+    await asyncio.sleep(0)
+    try:
+        result = await flight.run('k', lambda: work('b'))
+    except asyncio.CancelledError:
+        print("❌ 取消后重新请求同 key 拿到了被取消的旧任务")
+        return 1
+    assert result == 'b' and started == ['a', 'b'], (result, started)
+    assert a.cancelled()
+    print(f"取消后重新请求: 新建任务返回 {result!r}")
+
+    await asyncio.sleep(0.01)
+    assert flight.get_stats()['inflight'] == 0, flight.get_stats()
+    print("✅ SingleFlight 取消语义正确")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+校验讨论发言的投票意图识别（backend.core.intent_matcher）：
+- 内置标注语料上的准确率与覆盖率，对比旧的 any(关键词) 解析（“不赞成”包含“赞成”等）；
+- 单条发言识别耗时；
+- 已记录对局（backend/logs/game_*/global.log）中，每条 team_vote 事件与该玩家在本次
+  team_vote_start 之后最后一条发言的识别结果是否一致。source 为 llm 的投票单独统计
+  （即“若采用发言意图，与 LLM 的实际投票是否相同”）；旧日志没有 source 字段，全部计入。
+
+运行：python -m benchmarks.check_vote_intent
+"""
+
+import glob
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+from backend.core.intent_matcher import TEAM_VOTE_MATCHER
+
+LOG_GLOB = os.path.join(os.path.dirname(__file__), '..', 'backend', 'logs', 'game_*', 'global.log')
+
+# (发言, 期望意图)；None 表示应判为模糊/未表态，交给 LLM
+LABELED = [
+    ("我赞成这个队伍。", 'approve'),
+    ("这个队伍没问题，我投赞成。", 'approve'),
+    ("我不赞成这个队伍，3号太可疑了。", 'reject'),
+    ("我不太赞同，队伍里有人行为异常。", 'reject'),
+    ("我会反对这个队伍。", 'reject'),
+    ("我不会反对，可以发车。", 'approve'),
+    ("这车必须否决！", 'reject'),
+    ("我支持1号的队伍，不过4号有点可疑。", 'approve'),
+    ("我同意3号的看法，这车必须否决。", 'reject'),
+    ("我不同意2号的说法，我支持发车。", 'approve'),
+    ("一开始我想赞成，但是听完5号的发言我决定反对。", 'reject'),
+    ("如果2号在队里我就反对。", None),
+    ("大家觉得要不要否决这个队伍？", None),
+    ("我还在观察，先听听大家的意见。", None),
+    ("第一轮信息太少，随便吧。", None),
+    ("赞成吗？我有点犹豫。", None),
+    ("I approve this team.", 'approve'),
+    ("I reject this team, 4 is suspicious.", 'reject'),
+    ("别发车，这队有问题。", 'reject'),
+    ("我不想否决，先让这车过。", 'approve'),
+    ("我不认为应该否决这个队伍。", 'approve'),
+    ("我们不能让坏人通过。", 'reject'),
+    ("我不觉得这个队伍有问题，可以发车。", 'approve'),
+    ("我不应该支持这个队伍。", 'reject'),
+    ("不能让这车过。", 'reject'),
+    ("我并不认为这车能放行。", 'reject'),
+    ("I don't think we should approve this team.", 'reject'),
+    ("我没有理由反对这个队伍。", 'approve'),
+    ("没什么好反对的，发车吧。", 'approve'),
+    ("我没看出要否决的必要。", 'approve'),
+    ("这车我不支持否决。", 'approve'),
+    ("我不是很想在这一轮就反对。", None),
+]
+
+_NAIVE_APPROVE = ["赞同", "approve", "同意", "赞成", "支持"]
+_NAIVE_REJECT = ["不赞成", "不赞同", "不支持", "反对", "reject", "不同意", "否决"]
+
+
+def naive_parse(speech: str):
+    """旧实现：任一关键词命中即判定，两边都命中时放弃。"""
+    lowered = speech.lower()
+    approve_hit = any(kw in lowered for kw in _NAIVE_APPROVE)
+    reject_hit = any(kw in lowered for kw in _NAIVE_REJECT)
+    if approve_hit and not reject_hit:
+        return 'approve'
+    if reject_hit and not approve_hit:
+        return 'reject'
+    return None
+
+
+def score(parse) -> dict:
+    """correct：与标注一致；wrong：给出了与标注不同的明确投票（最有害）；missed：应识别却放弃。"""
+    counts = Counter()
+    for text, expected in LABELED:
+        got = parse(text)
+        if got == expected:
+            counts['correct'] += 1
+        elif got is None:
+            counts['missed'] += 1
+        else:
+            counts['wrong'] += 1
+    return counts
+
+
+def log_agreement() -> dict:
+    """已记录对局中发言意图与实际投票的一致性。"""
+    stats = {'all': Counter(), 'llm': Counter()}
+    for path in sorted(glob.glob(LOG_GLOB)):
+        last_speech = {}
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                kind, data = event.get('event_type'), event.get('data') or {}
+                if kind == 'team_vote_start':
+                    last_speech = {}
+                elif kind == 'player_speech':
+                    last_speech[data.get('player_name')] = data.get('message', '')
+                elif kind == 'team_vote':
+                    source = data.get('source')
+                    if source == 'intent':
+                        continue
+                    intent = TEAM_VOTE_MATCHER.classify(last_speech.get(data.get('player'), '')).intent
+                    buckets = [stats['all']] + ([stats['llm']] if source == 'llm' else [])
+                    for bucket in buckets:
+                        bucket['votes'] += 1
+                        if intent is None:
+                            bucket['ambiguous'] += 1
+                        elif intent == data.get('vote'):
+                            bucket['agree'] += 1
+                        else:
+                            bucket['disagree'] += 1
+    return stats
+
+
+def main() -> int:
+    print(f"标注语料 {len(LABELED)} 条")
+    for label, parse in (('旧关键词解析', naive_parse), ('意图识别', lambda t: TEAM_VOTE_MATCHER.classify(t).intent)):
+        c = score(parse)
+        print(f"  {label:<8} 正确 {c['correct']:>2} | 误判 {c['wrong']:>2} | 漏判 {c['missed']:>2}")
+
+    for text, expected in LABELED:
+        result = TEAM_VOTE_MATCHER.classify(text)
+        if result.intent != expected:
+            print(f"  不一致: 期望 {expected} 得到 {result} ← {text}")
+
+    texts = [t for t, _ in LABELED] * 500
+    start = time.perf_counter()
+    for text in texts:
+        TEAM_VOTE_MATCHER.classify(text)
+    per_call = (time.perf_counter() - start) / len(texts) * 1e6
+    print(f"识别耗时: {per_call:.1f} μs/条")
+
+    stats = log_agreement()
+    for label, c in (('全部投票', stats['all']), ('LLM 投票', stats['llm'])):
+        if not c['votes']:
+            print(f"{label}: 日志中没有可对照的 team_vote 事件")
+            continue
+        decided = c['agree'] + c['disagree']
+        agreement = c['agree'] / decided if decided else 0.0
+        print(f"{label}: {c['votes']} 票，可识别 {decided / c['votes']:.1%}，一致率 {agreement:.1%}")
+
+    return 0 if score(lambda t: TEAM_VOTE_MATCHER.classify(t).intent)['wrong'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
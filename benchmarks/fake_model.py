@@ -0,0 +1,137 @@
+"""
+基准共用的假模型客户端：按 prompt 类型返回格式合法的输出，可配置延迟/抖动与各类输出，并按类型计数。
+
+prompt 类型：
+- team_selection：队长选队（user 含“【选择队伍】”）
+- team_revision：队长讨论后二次确认队伍（system 含“你已提议一支队伍”）
+- revision：草稿-修订模式的修订发言（user 含“【修订发言】”）
+- vote：队伍/任务投票（system 含“只返回”）
+- speech：其余均按讨论发言处理
+
+需要特殊输出的基准可继承并覆盖 team / revise_team / vote / revision / speech 方法。
+"""
+
+import asyncio
+import random
+import re
+from typing import Dict, List, Optional, Sequence
+
+from backend.ai.model_client import BaseModelClient, ModelCallResult
+
+KINDS = ('team_selection', 'team_revision', 'revision', 'vote', 'speech')
+DEFAULT_SPEECHES = ("我再观察一下。", "目前说不好。")
+
+
+def classify(messages) -> str:
+    """按 prompt 特征判断调用类型。"""
+    system, user = messages[0]['content'], messages[-1]['content']
+    if '【修订发言】' in user:
+        return 'revision'
+    if '【选择队伍】' in user:
+        return 'team_selection'
+    if '你已提议一支队伍' in system:
+        return 'team_revision'
+    if '只返回' in system:
+        return 'vote'
+    return 'speech'
+
+
+def _player_list(pattern: str, text: str) -> List[str]:
+    return re.search(pattern, text).group(1).replace("'", '').split(', ')
+
+
+def format_team(team: Sequence[str]) -> str:
+    return str(sorted(team, key=int)).replace("'", '"')
+
+
+class FakeModelClient(BaseModelClient):
+    """可配置的假模型客户端。
+
+    latency/jitter：每次调用的延迟均值与高斯抖动（秒）；latencies 按类型覆盖延迟均值。
+    team_change_rate：队长二次确认时改动一名队员的概率；为 None 时重新随机选一支队伍。
+    revision_keep_rate：修订发言回复“保持”的概率，其余改写为 revised_speech。
+    """
+
+    model = "fake"
+
+    def __init__(
+        self,
+        rng: Optional[random.Random] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        latencies: Optional[Dict[str, float]] = None,
+        speeches: Sequence[str] = DEFAULT_SPEECHES,
+        team_change_rate: Optional[float] = None,
+        revision_keep_rate: float = 0.5,
+        revised_speech: str = "听了前面的发言，我改为先观望。",
+        model: Optional[str] = None,
+    ):
+        self.rng = rng or random.Random()
+        self.latency = latency
+        self.jitter = jitter
+        self.latencies = latencies or {}
+        self.speeches = tuple(speeches)
+        self.team_change_rate = team_change_rate
+        self.revision_keep_rate = revision_keep_rate
+        self.revised_speech = revised_speech
+        if model:
+            self.model = model
+        self.calls: Dict[str, int] = {kind: 0 for kind in KINDS}
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def delay(self, kind: str) -> float:
+        mean = self.latencies.get(kind, self.latency)
+        if self.jitter:
+            return max(0.0, self.rng.gauss(mean, self.jitter))
+        return mean
+
+    async def chat_completion(self, messages, **kwargs) -> ModelCallResult:
+        kind = classify(messages)
+        self.calls[kind] += 1
+        delay = self.delay(kind)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        system, user = messages[0]['content'], messages[-1]['content']
+        if kind == 'team_selection':
+            content = self.team(user)
+        elif kind == 'team_revision':
+            content = self.revise_team(user)
+        elif kind == 'vote':
+            content = self.vote(system)
+        elif kind == 'revision':
+            content = self.revision()
+        else:
+            content = self.speech()
+        return ModelCallResult(success=True, content=content)
+
+    async def stream_chat_completion(self, messages, **kwargs):
+        yield "approve"
+
+    # ---- 各类输出 ----
+
+    def team(self, user: str) -> str:
+        available = _player_list(r"可选玩家：\[(.*?)\]", user)
+        size = int(re.search(r"需要 ?选?择? ?(\d+) 名", user).group(1))
+        return format_team(self.rng.sample(available, size))
+
+    def revise_team(self, user: str) -> str:
+        if self.team_change_rate is None:
+            return self.team(user)
+        team = _player_list(r"已提议当前任务队伍：\[(.*?)\]", user)
+        if self.rng.random() < self.team_change_rate:
+            available = _player_list(r"可选玩家：\[(.*?)\]", user)
+            team = team[:-1] + [self.rng.choice([p for p in available if p not in team])]
+        return format_team(team)
+
+    def vote(self, system: str) -> str:
+        options = ("approve", "reject") if "'approve'" in system and '队伍' in system else ("success", "fail")
+        return self.rng.choice(options)
+
+    def revision(self) -> str:
+        return "保持" if self.rng.random() < self.revision_keep_rate else self.revised_speech
+
+    def speech(self) -> str:
+        return self.rng.choice(self.speeches)
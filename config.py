@@ -27,6 +27,51 @@ GAME_CONFIG = {
     'missions_to_win': 3,
     # 讨论发言时提前并行拉取后续玩家 LLM 发言的队列深度，0=关闭预取，1=仅预取下一位
     'speech_prefetch_size': int(os.getenv('AVALON_SPEECH_PREFETCH_SIZE', '1')),
+    # 按近期 LLM 发言延迟与朗读时长自适应调整预取深度（限制在 min~max 之内），关闭时固定为 speech_prefetch_size；
+    # speech_prefetch_size=0 时始终关闭预取
+    'speech_prefetch_adaptive': os.getenv('AVALON_SPEECH_PREFETCH_ADAPTIVE', 'true').lower() == 'true',
+    'speech_prefetch_min': int(os.getenv('AVALON_SPEECH_PREFETCH_MIN', '1')),
+    'speech_prefetch_max': int(os.getenv('AVALON_SPEECH_PREFETCH_MAX', '3')),
+    # AI 节奏等待（朗读时长、投票结果停顿、主循环间隔）的缩放系数：1 = 实时，0 = 不等待；可在 /game/start 或 /game/pacing 按局设置
+    'pacing_time_scale': float(os.getenv('AVALON_PACING_TIME_SCALE', '1.0')),
+    # 草稿-修订讨论模式：阶段开始时并行生成全部座位的发言草稿，每位开口前按刚说过的发言简短修订（替代逐位预取）
+    'draft_refine_discussion': os.getenv('AVALON_DRAFT_REFINE_DISCUSSION', 'false').lower() == 'true',
+    # 轮次讨论压缩等后台作业的最大并发数
+    'background_task_concurrency': int(os.getenv('AVALON_BACKGROUND_TASK_CONCURRENCY', '2')),
+    # 本地抽取式轮次摘要之后，是否再在后台用 LLM 摘要替换
+    'llm_round_summary': os.getenv('AVALON_LLM_ROUND_SUMMARY', 'true').lower() == 'true',
+    # 多级细节历史：上一轮压缩为各玩家立场，更早轮次合并为整局滚动摘要
+    'history_lod': os.getenv('AVALON_HISTORY_LOD', 'true').lower() == 'true',
+    # 每轮结束后为各 AI 座位生成私有记忆，代替更早轮次的共享摘要进入其 prompt
+    'player_memory': os.getenv('AVALON_PLAYER_MEMORY', 'true').lower() == 'true',
+    # 发言 prompt 中附带的更早轮次相关原话条数（本地 BM25 检索），0 = 不附带
+    'evidence_quotes': int(os.getenv('AVALON_EVIDENCE_QUOTES', '3')),
+    # 打分策略（基于角色后验）置信度达到该阈值时直接采用其决策、跳过 LLM 调用；> 1 即关闭
+    'heuristic_confidence_threshold': float(os.getenv('AVALON_HEURISTIC_CONFIDENCE_THRESHOLD', '0.9')),
+    # 队伍投票优先采用该座位本次讨论发言中的明确表态（关键词自动机识别），模糊时才调用 LLM
+    'vote_intent': os.getenv('AVALON_VOTE_INTENT', 'true').lower() == 'true',
+    # 开局库：第一轮选队与讨论发言复用此前对局的输出（按人数、角色、相对队长的座位与视野归类）
+    'opening_book': os.getenv('AVALON_OPENING_BOOK', 'true').lower() == 'true',
+    # 开局库条目的最长保留秒数、最多取用次数、每类条目的最多保留条数
+    'opening_book_max_age': float(os.getenv('AVALON_OPENING_BOOK_MAX_AGE', '86400')),
+    'opening_book_max_uses': int(os.getenv('AVALON_OPENING_BOOK_MAX_USES', '3')),
+    'opening_book_pool_size': int(os.getenv('AVALON_OPENING_BOOK_POOL_SIZE', '8')),
+    # 每局开局后在后台用离线对局补充开局库的局数（占用模型配额），0 = 只从实时对局积累
+    'opening_book_prefill': int(os.getenv('AVALON_OPENING_BOOK_PREFILL', '0')),
+    # 队伍投票阶段的投机计算：发言结束即预判投票，讨论结束即并行发起 LLM 投票与队长改队决策
+    'speculative_votes': os.getenv('AVALON_SPECULATIVE_VOTES', 'true').lower() == 'true',
+    # 投票/任务结果一出即预取下一任队长的选队决策（与结果停顿、开场白重叠），状态变化时作废
+    'leader_prefetch': os.getenv('AVALON_LEADER_PREFETCH', 'true').lower() == 'true',
+    # prompt 需要的轮次摘要仍在生成时的最长等待秒数
+    'summary_wait_timeout': float(os.getenv('AVALON_SUMMARY_WAIT_TIMEOUT', '3.0')),
+    # 各动作对话历史块（含局势摘要）的 token 预算，未列出的动作使用 default；0 = 不限制
+    # 超出时保留局势摘要，其次当前轮发言，再次上一轮发言与更早摘要
+    'prompt_token_budgets': {
+        'default': int(os.getenv('AVALON_PROMPT_TOKEN_BUDGET', '3000')),
+        'vote_decision': int(os.getenv('AVALON_VOTE_PROMPT_TOKEN_BUDGET', '2000')),
+        'assassination': int(os.getenv('AVALON_ASSASSINATION_PROMPT_TOKEN_BUDGET', '4000')),
+        'assassination_decision': int(os.getenv('AVALON_ASSASSINATION_PROMPT_TOKEN_BUDGET', '4000')),
+    },
 }
 
 # AI 配置